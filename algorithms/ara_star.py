@@ -0,0 +1,191 @@
+from array import array
+import heapq
+import time
+from maze_engine import STEP_COST
+from .base import InformedSearchAlgorithm
+
+# Expansions between two reads of the clock when a time budget is set
+CLOCK_INTERVAL = 64
+
+
+class ARAStar(InformedSearchAlgorithm):
+    """
+    Anytime Repairing A* (ARA*): a fast weighted A* path first, then better and better ones.
+        Each iteration is a weighted A* search (priority g + epsilon * h) whose path costs at
+        most epsilon times the optimum. epsilon then drops by epsilon_step until it reaches 1,
+        and the next iteration reuses the previous one: the costs found so far are kept, and only
+        the cells still in the open list or improved after being expanded (the "inconsistent"
+        ones) are searched again. Every iteration publishes its path together with the proven
+        bound min(epsilon, cost / min(g + h over open and inconsistent cells)), which often
+        reaches 1 (optimal) before epsilon does.
+        time_budget (seconds) and max_expansions stop the search early. The best path so far is
+        returned, with its bound in "epsilon"; no path is returned if the budget ran out before
+        the first one was found.
+        Step costs follow the maze terrain (like Dijkstra), so on a weighted maze the result is
+        the cheapest path, reported in "path_cost".
+    """
+
+    def __init__(self, heuristic_type="manhattan", epsilon=3.0, epsilon_step=0.5, time_budget=None,
+                 max_expansions=None, kernel="index", tie_breaking="high_g"):
+        """
+        epsilon: weight of the heuristic in the first iteration (>= 1)
+        epsilon_step: how much epsilon decreases between iterations
+        time_budget: seconds before the search stops (None = no limit)
+        max_expansions: expansions before the search stops (None = no limit)
+        """
+        super().__init__(heuristic_type, kernel, tie_breaking)
+        if epsilon < 1:
+            raise ValueError(f"epsilon must be at least 1, got {epsilon}")
+        if epsilon_step <= 0:
+            raise ValueError(f"epsilon_step must be positive, got {epsilon_step}")
+        self.epsilon = epsilon
+        self.epsilon_step = epsilon_step
+        self.time_budget = time_budget
+        self.max_expansions = max_expansions
+
+    @property
+    def name(self):
+        return f"ARA* ({self.heuristic_type})"
+
+    def solve(self, maze, start, goal):
+        self._require_in_memory(maze)
+        empty = {"epsilon": None, "iterations": 0, "improvements": [], "path_cost": None,
+                 "budget_exhausted": False}
+        unreachable = self._unreachable_metrics(maze, start, goal)
+        if unreachable:
+            unreachable.update(empty)
+            return unreachable
+
+        start_time = time.perf_counter()
+        if not self._in_bounds(maze, start, goal):
+            return self._no_path_metrics(0, start_time, [], **empty)
+
+        deadline = start_time + self.time_budget if self.time_budget is not None else None
+        max_expansions = self.max_expansions
+        expanded_nodes = 0
+        tie_key = self._tie_key
+        start_idx, goal_idx = maze.index(start), maze.index(goal)
+        offsets, mask, cells = maze.neighbor_offsets, maze.neighbor_mask, maze.cells
+        get_h = self._get_index_h(maze, goal)
+        cols = maze.cols
+
+        # Lowest cost found for each cell (-1 = never reached), the parent it came from and the
+        # iteration that last expanded it (0 = never), so the closed list is reset for free
+        g_costs = array('i', [-1]) * maze.size
+        parents = array('i', [-1]) * maze.size
+        closed = array('i', [0]) * maze.size
+        g_costs[start_idx] = 0
+        order = array('i', [start_idx])
+        on_expand, on_push = self._begin_search()
+
+        iteration = 1
+        epsilon = self.epsilon
+        # Priority Queue of (g + epsilon * h, tie key, insertion counter, g, index)
+        counter = 0
+        open_list = [(epsilon * get_h(start_idx), tie_key(0), counter, 0, start_idx)]
+        # Cells whose cost dropped after this iteration expanded them
+        inconsistent = []
+        goal_g = 0 if start_idx == goal_idx else -1
+        best_path, best_g, best_cost, bound = None, None, None, None
+        improvements = []
+        exhausted = False
+
+        while True:
+            while open_list:
+                f, _, _, g, current = open_list[0]
+                # Lazy deletion: outdated entries and cells already expanded in this iteration
+                if g != g_costs[current] or closed[current] == iteration:
+                    heapq.heappop(open_list)
+                    continue
+                if goal_g != -1 and goal_g <= f:
+                    break
+                if ((max_expansions is not None and expanded_nodes >= max_expansions) or
+                        (deadline is not None and not expanded_nodes % CLOCK_INTERVAL
+                         and time.perf_counter() >= deadline)):
+                    exhausted = True
+                    break
+                heapq.heappop(open_list)
+                closed[current] = iteration
+                expanded_nodes += 1
+                if on_expand is not None:
+                    on_expand(divmod(current, cols))
+
+                for offset in offsets[mask[current]]:
+                    neighbor = current + offset
+                    new_g = g + STEP_COST[cells[neighbor]]
+                    old_g = g_costs[neighbor]
+                    if old_g != -1 and new_g >= old_g:
+                        continue
+                    if old_g == -1:
+                        order.append(neighbor)
+                    g_costs[neighbor] = new_g
+                    parents[neighbor] = current
+                    if neighbor == goal_idx:
+                        goal_g = new_g
+                    if closed[neighbor] == iteration:
+                        inconsistent.append(neighbor)
+                    else:
+                        counter += 1
+                        heapq.heappush(open_list, (new_g + epsilon * get_h(neighbor), tie_key(new_g),
+                                                   counter, new_g, neighbor))
+                        if on_push is not None:
+                            on_push(divmod(neighbor, cols), len(open_list), old_g != -1)
+
+            if goal_g == -1:
+                # No path at all, or the budget ran out before the first one was found
+                break
+
+            # The cells the next iteration starts from. One of them lies on an optimal path with
+            # its optimal cost, so the smallest g + h among them is a lower bound on the optimum
+            pending = {index for _, _, _, g, index in open_list
+                       if g == g_costs[index] and closed[index] != iteration}
+            pending.update(inconsistent)
+            lower = min((g_costs[index] + get_h(index) for index in pending), default=goal_g)
+            if goal_g != best_g or not exhausted:
+                # The parents of a cell can get cheaper after it was reached, so the path may
+                # cost less than goal_g
+                best_path, best_g = self._snapshot_path(maze, parents, goal_idx), goal_g
+                best_cost = maze.path_cost(best_path)
+            # An unfinished iteration (budget exhausted) does not guarantee its epsilon
+            bounds = [best_cost / lower if lower > 0 else 1.0]
+            if bound is not None:
+                bounds.append(bound)
+            if not exhausted:
+                bounds.append(epsilon)
+            bound = max(1.0, min(bounds))
+            if not improvements or improvements[-1][:2] != (bound, best_cost):
+                improvements.append((bound, best_cost, time.perf_counter() - start_time))
+            if exhausted or bound <= 1:
+                break
+
+            # Next iteration: lower epsilon and reorder the pending cells by their new priority
+            iteration += 1
+            epsilon = max(1.0, epsilon - self.epsilon_step)
+            open_list = []
+            for index in pending:
+                counter += 1
+                open_list.append((g_costs[index] + epsilon * get_h(index), tie_key(g_costs[index]),
+                                  counter, g_costs[index], index))
+            heapq.heapify(open_list)
+            inconsistent = []
+
+        visited = self._visited_positions(maze, order)
+        extra = {"iterations": iteration, "improvements": improvements,
+                 "budget_exhausted": exhausted}
+        if best_path is None:
+            return self._no_path_metrics(expanded_nodes, start_time, visited, epsilon=None,
+                                         path_cost=None, **extra)
+        return self._path_metrics(best_path, expanded_nodes, start_time, bound <= 1, visited,
+                                  epsilon=bound, path_cost=best_cost, **extra)
+
+    def _snapshot_path(self, maze, parents, goal_idx):
+        """
+        Copy out the current path: later iterations keep rewriting the parent array.
+        """
+        path = []
+        current = goal_idx
+        while current != -1:
+            path.append(maze.position(current))
+            current = parents[current]
+        path.reverse()
+        return path
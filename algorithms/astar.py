@@ -1,3 +1,4 @@
+from array import array
 import heapq
 import time
 import math
@@ -5,59 +6,213 @@ from .base import InformedSearchAlgorithm, Node
 
 
 class AStar(InformedSearchAlgorithm):
+    out_of_core = True
+
+    @property
+    def name(self):
+        return f"A* ({self.heuristic_type})"
+
     def solve(self, maze, start, goal):
+        unreachable = self._unreachable_metrics(maze, start, goal)
+        if unreachable:
+            return unreachable
+
+        if self._use_index_kernel(maze, start, goal):
+            return self._solve_indexed(maze, start, goal)
+
         start_time = time.perf_counter()
         expanded_nodes = 0
+        reexpansions = 0
+        tie_key = self._tie_key
 
-        # Priority Queue
+        # Priority Queue of (f, tie key, insertion counter, node)
+        counter = 0
         open_list = []
         start_node = Node(start, None, g=0,
                           h=self._get_h(start, goal))
-        heapq.heappush(open_list, start_node)
+        heapq.heappush(open_list, (start_node.f, tie_key(0), counter, start_node))
 
         # Dict to track the lowest g cost found for each position
         visited_costs = {start: 0}
+        closed = set()
+        on_expand, on_push = self._begin_search()
 
         while open_list:
-            current_node = heapq.heappop(open_list)
-            expanded_nodes += 1
+            current_node = heapq.heappop(open_list)[3]
+            position = current_node.position
 
-            if current_node.position == goal:
+            # Lazy deletion: a cheaper entry for this position was pushed after this one
+            if current_node.g > visited_costs[position]:
+                continue
+            if position in closed:
+                reexpansions += 1
+            else:
+                closed.add(position)
+                expanded_nodes += 1
+            if on_expand is not None:
+                on_expand(position)
+
+            if position == goal:
                 return self._reconstruct_metrics(
-                    current_node, expanded_nodes, start_time, is_optimal=True,
-                    visited_list=list(visited_costs.keys()))
+                    current_node, expanded_nodes, start_time, is_optimal=not maze.weighted,
+                    visited_list=self._visited_list(visited_costs), reexpansions=reexpansions)
 
-            for neighbor_pos in maze.get_neighbors(current_node.position):
+            for neighbor_pos in maze.get_neighbors(position):
                 # The cost from start to neighbor is parent's cost + 1
                 new_g = current_node.g + 1
 
                 if neighbor_pos not in visited_costs or new_g < visited_costs[neighbor_pos]:
+                    repush = neighbor_pos in visited_costs
                     visited_costs[neighbor_pos] = new_g
                     h = self._get_h(neighbor_pos, goal)
                     neighbor_node = Node(
                         neighbor_pos, current_node, g=new_g, h=h)
-                    heapq.heappush(open_list, neighbor_node)
+                    counter += 1
+                    heapq.heappush(open_list, (neighbor_node.f, tie_key(new_g), counter, neighbor_node))
+                    if on_push is not None:
+                        on_push(neighbor_pos, len(open_list), repush)
 
         # The case when no path is found
-        return {
-            "algorithm": f"A* ({self.heuristic_type})",
-            "path": [],
-            "expanded_nodes": expanded_nodes,
-            "solution_depth": 0,
-            "execution_time": time.perf_counter() - start_time,
-            "is_optimal": False,
-            # Returns the explored nodes until failure
-            "visited_list": list(visited_costs.keys())
-        }
-
-    def _reconstruct_metrics(self, node, expanded, start_time, is_optimal, visited_list):
-        path = self._reconstruct_path(node)
-        return {
-            "algorithm": f"A* ({self.heuristic_type})",
-            "path": path,
-            "expanded_nodes": expanded,
-            "solution_depth": len(path) - 1,
-            "execution_time": time.perf_counter() - start_time,
-            "is_optimal": is_optimal,
-            "visited_list": visited_list
-        }
+        return self._no_path_metrics(expanded_nodes, start_time, self._visited_list(visited_costs),
+                                     reexpansions=reexpansions)
+
+    def solve_multi(self, maze, starts, goals, ownership=False):
+        """
+        Multi-source / multi-target A* in a single traversal.
+            All starts enter the open list with g = 0 and h is the distance to the nearest goal
+            (see _get_multi_index_h), so the first goal expanded is the one closest to any start.
+            The result holds the path between them and names them in "source" and "target".
+            ownership: keep expanding until the open list is empty and add the Voronoi-style
+                "ownership" map (array('i') of start numbers, -1 = wall or unreachable) and the
+                "distances" map (steps from the owning start). The heuristic is consistent, so
+                every expanded cell already has its exact distance. goals may then be empty.
+        """
+        start_time = time.perf_counter()
+        sources, targets, is_target = self._multi_endpoints(maze, starts, goals)
+        expanded_nodes = 0
+        reexpansions = 0
+        tie_key = self._tie_key
+        offsets, mask = maze.neighbor_offsets, maze.neighbor_mask
+        get_h = self._get_multi_index_h(maze, targets)
+
+        g_costs = array('i', [-1]) * maze.size
+        parents = array('i', [-1]) * maze.size
+        owner = array('i', [-1]) * maze.size
+        closed = bytearray(maze.size)
+        order = array('i')
+
+        # Priority Queue of (f, tie key, insertion counter, g, index)
+        counter = 0
+        open_list = []
+        for number, index in enumerate(sources):
+            if owner[index] == -1:
+                owner[index] = number
+                g_costs[index] = 0
+                order.append(index)
+                counter += 1
+                open_list.append((get_h(index), tie_key(0), counter, 0, index))
+        heapq.heapify(open_list)
+
+        found = -1
+        cols = maze.cols
+        on_expand, on_push = self._begin_search()
+
+        while open_list and (targets or ownership):
+            g, current = heapq.heappop(open_list)[3:]
+
+            # Lazy deletion: a cheaper entry for this cell was pushed after this one
+            if g > g_costs[current]:
+                continue
+            if closed[current]:
+                reexpansions += 1
+            else:
+                closed[current] = 1
+                expanded_nodes += 1
+            if on_expand is not None:
+                on_expand(divmod(current, cols))
+
+            if found == -1 and is_target[current]:
+                found = current
+                if not ownership:
+                    break
+
+            new_g = g + 1
+            for offset in offsets[mask[current]]:
+                neighbor = current + offset
+                old_g = g_costs[neighbor]
+
+                if old_g == -1 or new_g < old_g:
+                    if old_g == -1:
+                        order.append(neighbor)
+                    g_costs[neighbor] = new_g
+                    parents[neighbor] = current
+                    owner[neighbor] = owner[current]
+                    counter += 1
+                    heapq.heappush(open_list, (new_g + get_h(neighbor), tie_key(new_g), counter, new_g, neighbor))
+                    if on_push is not None:
+                        on_push(divmod(neighbor, cols), len(open_list), old_g != -1)
+
+        return self._multi_metrics(maze, found, owner, parents, expanded_nodes, start_time, order, starts,
+                                   g_costs if ownership else None, reexpansions=reexpansions)
+
+    def _solve_indexed(self, maze, start, goal):
+        start_time = time.perf_counter()
+        expanded_nodes = 0
+        reexpansions = 0
+        tie_key = self._tie_key
+
+        start_idx, goal_idx = maze.index(start), maze.index(goal)
+        offsets, mask = maze.neighbor_offsets, maze.neighbor_mask
+        get_h = self._get_index_h(maze, goal)
+
+        # Lowest g cost found for each cell (-1 = never reached) and the parent it came from
+        g_costs = array('i', [-1]) * maze.size
+        parents = array('i', [-1]) * maze.size
+        closed = bytearray(maze.size)
+        g_costs[start_idx] = 0
+        order = array('i', [start_idx])
+
+        # Priority Queue of (f, tie key, insertion counter, g, index)
+        counter = 0
+        open_list = [(get_h(start_idx), tie_key(0), counter, 0, start_idx)]
+        cols = maze.cols
+        on_expand, on_push = self._begin_search()
+
+        while open_list:
+            g, current = heapq.heappop(open_list)[3:]
+
+            # Lazy deletion: a cheaper entry for this cell was pushed after this one
+            if g > g_costs[current]:
+                continue
+            if closed[current]:
+                reexpansions += 1
+            else:
+                closed[current] = 1
+                expanded_nodes += 1
+            if on_expand is not None:
+                on_expand(divmod(current, cols))
+
+            if current == goal_idx:
+                return self._reconstruct_metrics(
+                    current, expanded_nodes, start_time, is_optimal=not maze.weighted,
+                    visited_list=self._visited_positions(maze, order), parents=parents, maze=maze,
+                    reexpansions=reexpansions)
+
+            # The cost from start to neighbor is parent's cost + 1
+            new_g = g + 1
+            for offset in offsets[mask[current]]:
+                neighbor = current + offset
+                old_g = g_costs[neighbor]
+
+                if old_g == -1 or new_g < old_g:
+                    if old_g == -1:
+                        order.append(neighbor)
+                    g_costs[neighbor] = new_g
+                    parents[neighbor] = current
+                    counter += 1
+                    heapq.heappush(open_list, (new_g + get_h(neighbor), tie_key(new_g), counter, new_g, neighbor))
+                    if on_push is not None:
+                        on_push(divmod(neighbor, cols), len(open_list), old_g != -1)
+
+        return self._no_path_metrics(expanded_nodes, start_time, self._visited_positions(maze, order),
+                                     reexpansions=reexpansions)
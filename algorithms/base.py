@@ -1,6 +1,20 @@
 from abc import ABC, abstractmethod
 import time
 import math
+import tracemalloc
+from .visited import VisitedCells
+
+# Search kernels every algorithm can run on:
+#   "index" - flat cell indices, preallocated parent/cost arrays and a visited byte map
+#   "node"  - the original linked Node objects and Python sets/dicts of positions
+KERNELS = ("index", "node")
+
+# Tie-breaking policies of the informed searches, applied among equal f (or h) values:
+#   "high_g" - prefer the deeper node (fewer equal-f nodes expanded on open grids)
+#   "low_g"  - prefer the shallower node
+#   "fifo"   - insertion order only
+# An insertion counter always breaks the remaining ties, so the search is deterministic.
+TIE_BREAKING = ("high_g", "low_g", "fifo")
 
 
 class Colors:
@@ -20,6 +34,7 @@ class Node:
     Represents a node in the search space.
         Stores the current state, parent for path reconstruction, and costs.
     """
+    __slots__ = ('position', 'parent', 'g', 'h', 'f')
 
     def __init__(self, position, parent=None, g=0, h=0):
         self.position = position  # (x, y)
@@ -29,7 +44,8 @@ class Node:
         self.f = g + h  # The total cost used in A* and Greedy
 
     def __lt__(self, other):
-        # Used by Priority Queue (heapq) in A* and Greedy
+        # Orders nodes by f. A* and Greedy push (priority, tie key, counter, node) tuples,
+        # so the heap never has to fall back to comparing Node objects.
         return self.f < other.f
 
 
@@ -37,6 +53,29 @@ class SearchAlgorithm(ABC):
     """
     Abstract base class for search algorithms.
     """
+
+    # Instrumentation is off by default (see instrument()). The search loops copy the hooks into
+    # locals once per search, so a disabled hook costs a single `is not None` test per call site.
+    instrumented = False
+    on_expand = None
+    on_push = None
+    _stats = None
+    # True for the algorithms whose node kernel only needs is_valid_move / get_neighbors, so they
+    # also run on out-of-core mazes without flat buffers (utils.tiled_maze)
+    out_of_core = False
+
+    def __init__(self, kernel="index"):
+        if kernel not in KERNELS:
+            raise ValueError(f"Unknown kernel '{kernel}', expected one of {KERNELS}")
+        self.kernel = kernel
+
+    @property
+    def name(self):
+        """
+        The algorithm name reported in the result dictionary.
+        """
+        return type(self).__name__
+
     @abstractmethod
     def solve(self, maze, start, goal):
         """
@@ -45,17 +84,284 @@ class SearchAlgorithm(ABC):
         """
         pass
 
-    def _reconstruct_path(self, node):
+    def solve_many(self, maze, queries):
+        """
+        Solve a batch of (start, goal) queries on the same maze, returning the results in order.
+        Algorithms that can share work between queries override this.
+        """
+        return [self.solve(maze, start, goal) for start, goal in queries]
+
+    def instrument(self, enabled=True, on_expand=None, on_push=None):
+        """
+        Turn the instrumentation on (or off) for the next searches.
+            enabled: results get "phase_times" (setup, search, reconstruction, result building, in
+                seconds), "peak_open_list", "repushes" and "nodes_per_sec"
+            on_expand(position): called for every expanded cell
+            on_push(position, open_size, repush): called for every cell added to the open list
+        The hooks work without enabled. Every solver calls them except WavefrontBFS (whole levels
+        are labeled at once); HPA* reports only its abstract search, JPS only its jump points.
+        Returns self.
+        """
+        self.instrumented = enabled
+        self.on_expand = on_expand
+        self.on_push = on_push
+        return self
+
+    def profile(self, maze, start, goal):
+        """
+        Run an instrumented solve() and, separately, one under tracemalloc (tracing slows the
+        search down, so the timings come from the first run). The result of the first run is
+        returned with "peak_memory" (bytes) added.
+        """
+        previous = self.instrumented
+        self.instrumented = True
+        try:
+            result = self.solve(maze, start, goal)
+        finally:
+            self.instrumented = previous
+
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        self.solve(maze, start, goal)
+        result["peak_memory"] = tracemalloc.get_traced_memory()[1] - baseline
+        if not tracing:
+            tracemalloc.stop()
+        return result
+
+    def _begin_search(self):
+        """
+        Called by the solvers right before their search loop.
+        Returns the (on_expand, on_push) hooks the loop must call, None when there are none.
+        """
+        if not self.instrumented:
+            return self.on_expand, self.on_push
+
+        stats = self._stats = {"search_start": time.perf_counter(), "search_end": None,
+                               "reconstruction": 0.0, "peak_open_list": 0, "repushes": 0}
+        user_push = self.on_push
+
+        def on_push(position, open_size, repush):
+            if open_size > stats["peak_open_list"]:
+                stats["peak_open_list"] = open_size
+            if repush:
+                stats["repushes"] += 1
+            if user_push is not None:
+                user_push(position, open_size, repush)
+
+        return self.on_expand, on_push
+
+    def _end_search(self):
+        """
+        Mark the end of the search loop (the first result helper called after it does this).
+        """
+        if not self.instrumented:
+            return
+        if self._stats is None:
+            # Solver without a _begin_search() call: its setup is counted as search
+            self._stats = {"search_start": None, "search_end": None, "reconstruction": 0.0,
+                           "peak_open_list": None, "repushes": None}
+        if self._stats["search_end"] is None:
+            self._stats["search_end"] = time.perf_counter()
+
+    def _instrumentation_metrics(self, start_time, expanded, end_time):
+        """
+        Turn the marks of the last search into result entries, and reset them.
+        """
+        stats, self._stats = self._stats, None
+        search_start = stats["search_start"] if stats["search_start"] is not None else start_time
+        search_time = stats["search_end"] - search_start
+        return {
+            "phase_times": {
+                # None when the solver does not mark where its search loop starts
+                "setup": search_start - start_time if stats["search_start"] is not None else None,
+                "search": search_time,
+                "reconstruction": stats["reconstruction"],
+                "result": end_time - stats["search_end"] - stats["reconstruction"],
+            },
+            "peak_open_list": stats["peak_open_list"],
+            "repushes": stats["repushes"],
+            "nodes_per_sec": expanded / search_time if search_time > 0 else None,
+        }
+
+    def _visited_list(self, visited):
+        """
+        Materialize the visited set of a node kernel (after the search loop).
+        """
+        self._end_search()
+        return list(visited)
+
+    def _in_bounds(self, maze, *positions):
+        """
+        Check that every given position lies inside the grid.
+        """
+        return all(0 <= x < maze.rows and 0 <= y < maze.cols for x, y in positions)
+
+    def _multi_endpoints(self, maze, starts, goals):
+        """
+        Validate the endpoints of a multi-source / multi-target search (index kernels).
+        Returns (sources, targets, is_target): the cell index of every start in the given order,
+        the goal positions that can be reached at all (no walls, no duplicates) and a byte map
+        marking their cells. A goal on a wall is kept only when it is also a start (reached at
+        distance 0, like a single search with start == goal).
+        """
+        self._require_in_memory(maze)
+        starts, goals = [tuple(start) for start in starts], [tuple(goal) for goal in goals]
+        if not starts:
+            raise ValueError("A multi-source search needs at least one start")
+        for position in starts + goals:
+            if not self._in_bounds(maze, position):
+                raise ValueError(f"{position} is outside the {maze.rows}x{maze.cols} grid")
+        is_target = bytearray(maze.size)
+        targets = []
+        for goal in goals:
+            index = maze.index(goal)
+            if (maze.is_valid_move(goal) or goal in starts) and not is_target[index]:
+                is_target[index] = 1
+                targets.append(goal)
+        return [maze.index(start) for start in starts], targets, is_target
+
+    def _multi_metrics(self, maze, found, owner, parents, expanded, start_time, order, starts,
+                       distances=None, **extra):
+        """
+        Result dictionary of a multi-source / multi-target search: the path from the source that
+        owns the reached target, plus "source", "target" and, when an ownership map was built,
+        "ownership" (start number owning each cell) and "distances" (steps from that start).
+        """
+        if distances is not None:
+            extra.update(ownership=owner, distances=distances)
+        visited = self._visited_positions(maze, order)
+        if found == -1:
+            return self._no_path_metrics(expanded, start_time, visited, source=None, target=None, **extra)
+        return self._reconstruct_metrics(
+            found, expanded, start_time, is_optimal=not maze.weighted, visited_list=visited, parents=parents, maze=maze,
+            source=tuple(starts[owner[found]]), target=maze.position(found), **extra)
+
+    def _unreachable_metrics(self, maze, start, goal):
+        """
+        When the maze already knows its connected regions and start and goal are in different
+        ones, return the "no path" result right away (O(1)) instead of exhausting the region.
+        Returns None when a search is needed.
+        """
+        if maze.separated(start, goal):
+            return self._no_path_metrics(0, time.perf_counter(), [])
+        return None
+
+    def _disconnected(self, maze, start, goal):
+        """
+        Like maze.separated(), but builds the component labels if needed (linear time, 4 bytes
+        per cell) and also answers for a start on a wall (it can still step into its free
+        neighbors). For the searches that cannot afford to exhaust a region before giving up.
+        """
+        if start == goal:
+            return False
+        if not maze.is_valid_move(goal):
+            return True
+        labels = maze.build_components()[0]
+        goal_label = labels[maze.index(goal)]
+        if maze.is_valid_move(start):
+            return labels[maze.index(start)] != goal_label
+        return all(labels[maze.index(neighbor)] != goal_label for neighbor in maze.get_neighbors(start))
+
+    def _require_in_memory(self, maze):
+        """
+        Solvers built on the flat buffers of an in-memory Maze (cells, neighbor mask, components)
+        reject a TiledMaze up front with a TypeError, instead of an AttributeError mid-search.
+        """
+        if not hasattr(maze, "neighbor_mask"):
+            raise TypeError(f"{self.name} needs an in-memory maze_engine.Maze, "
+                            f"not a {type(maze).__name__}")
+
+    def _use_index_kernel(self, maze, start, goal):
+        """
+        The index kernel needs both endpoints inside the grid to address them by index, and the
+        flat neighbor mask of an in-memory Maze (a TiledMaze has none).
+        Anything else falls back to the node kernel, which handles it like before.
+        """
+        return (self.kernel == "index" and hasattr(maze, "neighbor_mask")
+                and self._in_bounds(maze, start, goal))
+
+    def _reconstruct_path(self, node, parents=None, maze=None):
         """
         Rebuild the path from goal back to start using parent references.
+            node: the goal Node, or the goal cell index when a parent array is given
+            parents: flat array of parent indices (-1 marks the start), index kernel only
         Returns the path as a list of positions from start to goal.
         """
+        self._end_search()
+        reconstruction_start = time.perf_counter() if self.instrumented else None
         path = []
         current = node
-        while current:
-            path.append(current.position)
-            current = current.parent
-        return path[::-1]  # Invert the path to get it from start to goal
+        if parents is not None:
+            while current != -1:
+                path.append(maze.position(current))
+                current = parents[current]
+        else:
+            while current:
+                path.append(current.position)
+                current = current.parent
+        path.reverse()  # Invert the path to get it from start to goal
+        if reconstruction_start is not None:
+            self._stats["reconstruction"] += time.perf_counter() - reconstruction_start
+        return path
+
+    def _visited_positions(self, maze, order):
+        """
+        Wrap the cell indices recorded by an index kernel as a lazy visited list (VisitedCells):
+        positions are only decoded when the result is read.
+        """
+        self._end_search()
+        return VisitedCells(order, maze.rows, maze.cols)
+
+    def _reconstruct_metrics(self, node, expanded, start_time, is_optimal, visited_list,
+                             parents=None, maze=None, **extra):
+        """
+        Result dictionary for a found path. Algorithm specific metrics can be passed as extra keys.
+        """
+        self._end_search()
+        path = self._reconstruct_path(node, parents, maze)
+        return self._path_metrics(path, expanded, start_time, is_optimal, visited_list, **extra)
+
+    def _path_metrics(self, path, expanded, start_time, is_optimal, visited_list, **extra):
+        """
+        Result dictionary for a path that is already built (start to goal).
+        """
+        self._end_search()
+        result = {
+            "algorithm": self.name,
+            "path": path,
+            "expanded_nodes": expanded,
+            "solution_depth": len(path) - 1,
+            "execution_time": time.perf_counter() - start_time,
+            "is_optimal": is_optimal,
+            "visited_list": visited_list
+        }
+        result.update(extra)
+        if self.instrumented:
+            result.update(self._instrumentation_metrics(start_time, expanded, time.perf_counter()))
+        return result
+
+    def _no_path_metrics(self, expanded, start_time, visited_list, **extra):
+        """
+        Result dictionary for the case when no path is found.
+        """
+        self._end_search()
+        result = {
+            "algorithm": self.name,
+            "path": [],
+            "expanded_nodes": expanded,
+            "solution_depth": 0,
+            "execution_time": time.perf_counter() - start_time,
+            "is_optimal": False,
+            # Returns the explored nodes until failure
+            "visited_list": visited_list
+        }
+        result.update(extra)
+        if self.instrumented:
+            result.update(self._instrumentation_metrics(start_time, expanded, time.perf_counter()))
+        return result
 
 
 class UninformedSearchAlgorithm(SearchAlgorithm):
@@ -70,8 +376,46 @@ class InformedSearchAlgorithm(SearchAlgorithm):
     This is a base class for A* and Greedy algorithms.
     """
 
-    def __init__(self, heuristic_type="manhattan"):
+    def __init__(self, heuristic_type="manhattan", kernel="index", tie_breaking="high_g"):
+        super().__init__(kernel)
+        if tie_breaking not in TIE_BREAKING:
+            raise ValueError(f"Unknown tie-breaking policy '{tie_breaking}', expected one of {TIE_BREAKING}")
         self.heuristic_type = heuristic_type
+        self.tie_breaking = tie_breaking
+
+    def _tie_key(self, g):
+        """
+        Secondary priority key among equal f (or h) values, see TIE_BREAKING.
+        """
+        if self.tie_breaking == "high_g":
+            return -g
+        if self.tie_breaking == "low_g":
+            return g
+        return 0
+
+    def _get_index_h(self, maze, goal_pos):
+        """
+        Returns h(index) for the index kernels, equal to _get_h on the decoded position.
+        """
+        cols = maze.cols
+        gx, gy = goal_pos
+        if self.heuristic_type == "euclidean":
+            return lambda index: math.sqrt((index // cols - gx)**2 + (index % cols - gy)**2)
+        return lambda index: abs(index // cols - gx) + abs(index % cols - gy)
+
+    def _get_multi_index_h(self, maze, goals):
+        """
+        h(index) towards the nearest of several goals: the minimum of the heuristic over the goals
+        stays admissible and consistent. 0 when there are no goals.
+        """
+        if len(goals) == 1:
+            return self._get_index_h(maze, goals[0])
+        if not goals:
+            return lambda index: 0
+        cols = maze.cols
+        if self.heuristic_type == "euclidean":
+            return lambda index: math.sqrt(min((index // cols - gx)**2 + (index % cols - gy)**2 for gx, gy in goals))
+        return lambda index: min(abs(index // cols - gx) + abs(index % cols - gy) for gx, gy in goals)
 
     def _get_h(self, pos, goal_pos):
         """
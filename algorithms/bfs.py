@@ -1,27 +1,44 @@
+from array import array
 from collections import deque
 import time
+from query_engine import QueryEngine
 from .base import UninformedSearchAlgorithm, Node
 
 
 class BFS(UninformedSearchAlgorithm):
     # Uninformed Search Algorithm - Breadth-First Search
+    out_of_core = True
+
+    @property
+    def name(self):
+        return "BFS"
 
     def solve(self, maze, start, goal):
+        unreachable = self._unreachable_metrics(maze, start, goal)
+        if unreachable:
+            return unreachable
+
+        if self._use_index_kernel(maze, start, goal):
+            return self._solve_indexed(maze, start, goal)
+
         start_time = time.perf_counter()
         expanded_nodes = 0
 
         # (FIFO)
         queue = deque([Node(start)])
         visited = {start}
+        on_expand, on_push = self._begin_search()
 
         while queue:
             current_node = queue.popleft()
             expanded_nodes += 1
+            if on_expand is not None:
+                on_expand(current_node.position)
 
             # Check if we reached the goal
             if current_node.position == goal:
                 metrics = self._reconstruct_metrics(
-                    current_node, expanded_nodes, start_time, is_optimal=True, visited_list=list(visited)
+                    current_node, expanded_nodes, start_time, is_optimal=not maze.weighted, visited_list=self._visited_list(visited)
                 )
                 return metrics
 
@@ -30,26 +47,119 @@ class BFS(UninformedSearchAlgorithm):
                 if neighbor_pos not in visited:
                     visited.add(neighbor_pos)
                     queue.append(Node(neighbor_pos, parent=current_node))
+                    if on_push is not None:
+                        on_push(neighbor_pos, len(queue), False)
 
         # No solution path found
-        return {
-            "algorithm": "BFS",
-            "path": [],
-            "expanded_nodes": expanded_nodes,
-            "solution_depth": 0,
-            "execution_time": time.perf_counter() - start_time,
-            "is_optimal": False,
-            "visited_list": list(visited)
-        }
-
-    def _reconstruct_metrics(self, node, expanded, start_time, is_optimal, visited_list):
-        path = self._reconstruct_path(node)
-        return {
-            "algorithm": "BFS",
-            "path": path,
-            "expanded_nodes": expanded,
-            "solution_depth": len(path) - 1,
-            "execution_time": time.perf_counter() - start_time,
-            "is_optimal": is_optimal,
-            "visited_list": visited_list
-        }
+        return self._no_path_metrics(expanded_nodes, start_time, self._visited_list(visited))
+
+    def solve_many(self, maze, queries):
+        """
+        Answer the batch with one reverse BFS distance field per distinct goal (see QueryEngine).
+        The fields are cached per maze, so later batches with the same goals only walk the paths.
+        A TiledMaze has no flat buffers for the fields and answers query by query.
+        """
+        if not hasattr(maze, "neighbor_mask"):
+            return super().solve_many(maze, queries)
+        return QueryEngine.for_maze(maze).solve_many(queries)
+
+    def solve_multi(self, maze, starts, goals, ownership=False):
+        """
+        Multi-source / multi-target BFS in a single traversal.
+            All starts seed the frontier at distance 0, so the first goal dequeued is the nearest
+            goal of the nearest start; the result holds the path between them and names them in
+            "source" and "target".
+            ownership: keep going until the whole region is labeled and add the Voronoi-style
+                "ownership" map (array('i') of start numbers, -1 = wall or unreachable) and the
+                "distances" map (steps from the owning start). Equidistant cells go to the start
+                whose wave reached them first. goals may then be empty.
+        """
+        start_time = time.perf_counter()
+        sources, targets, is_target = self._multi_endpoints(maze, starts, goals)
+        expanded_nodes = 0
+        offsets, mask = maze.neighbor_offsets, maze.neighbor_mask
+
+        # Start number owning each cell (-1 = not reached yet, which doubles as the visited map)
+        owner = array('i', [-1]) * maze.size
+        parents = array('i', [-1]) * maze.size
+        distances = array('i', [-1]) * maze.size if ownership else None
+        order = array('i')
+        queue = deque()
+        for number, index in enumerate(sources):
+            if owner[index] == -1:
+                owner[index] = number
+                order.append(index)
+                queue.append(index)
+                if ownership:
+                    distances[index] = 0
+
+        found = -1
+        cols = maze.cols
+        on_expand, on_push = self._begin_search()
+
+        while queue and (targets or ownership):
+            current = queue.popleft()
+            expanded_nodes += 1
+            if on_expand is not None:
+                on_expand(divmod(current, cols))
+
+            if found == -1 and is_target[current]:
+                found = current
+                if not ownership:
+                    break
+
+            for offset in offsets[mask[current]]:
+                neighbor = current + offset
+                if owner[neighbor] == -1:
+                    owner[neighbor] = owner[current]
+                    parents[neighbor] = current
+                    order.append(neighbor)
+                    queue.append(neighbor)
+                    if ownership:
+                        distances[neighbor] = distances[current] + 1
+                    if on_push is not None:
+                        on_push(divmod(neighbor, cols), len(queue), False)
+
+        return self._multi_metrics(maze, found, owner, parents, expanded_nodes, start_time, order, starts,
+                                   distances)
+
+    def _solve_indexed(self, maze, start, goal):
+        start_time = time.perf_counter()
+        expanded_nodes = 0
+
+        start_idx, goal_idx = maze.index(start), maze.index(goal)
+        offsets, mask = maze.neighbor_offsets, maze.neighbor_mask
+
+        # Preallocated parent array and visited byte map, plus the order of discovery
+        parents = array('i', [-1]) * maze.size
+        visited = bytearray(maze.size)
+        visited[start_idx] = 1
+        order = array('i', [start_idx])
+
+        # (FIFO)
+        queue = deque([start_idx])
+        cols = maze.cols
+        on_expand, on_push = self._begin_search()
+
+        while queue:
+            current = queue.popleft()
+            expanded_nodes += 1
+            if on_expand is not None:
+                on_expand(divmod(current, cols))
+
+            if current == goal_idx:
+                return self._reconstruct_metrics(
+                    current, expanded_nodes, start_time, is_optimal=not maze.weighted,
+                    visited_list=self._visited_positions(maze, order), parents=parents, maze=maze)
+
+            for offset in offsets[mask[current]]:
+                neighbor = current + offset
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    parents[neighbor] = current
+                    order.append(neighbor)
+                    queue.append(neighbor)
+                    if on_push is not None:
+                        on_push(divmod(neighbor, cols), len(queue), False)
+
+        return self._no_path_metrics(expanded_nodes, start_time, self._visited_positions(maze, order))
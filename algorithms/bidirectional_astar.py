@@ -0,0 +1,116 @@
+from array import array
+import heapq
+import time
+from .base import InformedSearchAlgorithm
+
+
+class BidirectionalAStar(InformedSearchAlgorithm):
+    """
+    A* run simultaneously from the start (towards the goal) and from the goal (towards the start).
+        Both searches use the balanced ("average") potential p(v) = (h_goal(v) - h_start(v)) / 2:
+        the forward search orders its open list by g + p and the backward one by g - p. The
+        potentials cancel where the searches meet, so mu, the cost of the best path found where
+        they touch, can be compared with the sum of the two smallest keys: once that sum reaches
+        mu no unexplored path is cheaper and the result is optimal.
+        Each step grows the side with the smaller key. On an open route this is about as much
+        work as A* (the forward search runs into the goal side); the gain is when one end sits in
+        a small pocket or a dead-end region, which the other side would otherwise have to flood.
+    """
+
+    @property
+    def name(self):
+        return f"Bidirectional A* ({self.heuristic_type})"
+
+    def solve(self, maze, start, goal):
+        self._require_in_memory(maze)
+        start_time = time.perf_counter()
+        expanded_nodes = 0
+        reexpansions = 0
+        tie_key = self._tie_key
+
+        if maze.separated(start, goal) or not self._in_bounds(maze, start, goal):
+            return self._no_path_metrics(expanded_nodes, start_time, [], reexpansions=reexpansions)
+        if start != goal and not maze.is_valid_move(goal):
+            # The backward search would walk out of a wall goal
+            return self._no_path_metrics(expanded_nodes, start_time, [], reexpansions=reexpansions)
+
+        start_idx, goal_idx = maze.index(start), maze.index(goal)
+        offsets, mask = maze.neighbor_offsets, maze.neighbor_mask
+        # Balanced potentials: p for the forward search, -p for the backward one
+        h_goal, h_start = self._get_index_h(maze, goal), self._get_index_h(maze, start)
+        get_h = (lambda index: (h_goal(index) - h_start(index)) / 2,
+                 lambda index: (h_start(index) - h_goal(index)) / 2)
+
+        g_costs = (array('i', [-1]) * maze.size, array('i', [-1]) * maze.size)
+        parents = (array('i', [-1]) * maze.size, array('i', [-1]) * maze.size)
+        closed = (bytearray(maze.size), bytearray(maze.size))
+        g_costs[0][start_idx] = 0
+        g_costs[1][goal_idx] = 0
+        order = array('i', [start_idx])
+        if goal_idx != start_idx:
+            order.append(goal_idx)
+
+        # Priority Queues of (g +/- p, tie key, insertion counter, g, index)
+        counter = 0
+        open_lists = ([(get_h[0](start_idx), tie_key(0), 0, 0, start_idx)],
+                      [(get_h[1](goal_idx), tie_key(0), 0, 0, goal_idx)])
+
+        # Best known meeting: total cost and the cell where both searches met
+        mu = 0 if start_idx == goal_idx else float('inf')
+        meeting = start_idx if start_idx == goal_idx else -1
+        cols = maze.cols
+        on_expand, on_push = self._begin_search()
+
+        while open_lists[0] and open_lists[1]:
+            # Stale heap entries only overestimate, so the heap tops are valid lower bounds
+            if open_lists[0][0][0] + open_lists[1][0][0] >= mu:
+                break
+
+            # Grow the side with the smaller key (the forward one on a tie)
+            side = 0 if open_lists[0][0][0] <= open_lists[1][0][0] else 1
+            own_g, other_g = g_costs[side], g_costs[1 - side]
+            own_parents, own_closed, own_h = parents[side], closed[side], get_h[side]
+            open_list = open_lists[side]
+
+            g, current = heapq.heappop(open_list)[3:]
+            # Lazy deletion: a cheaper entry for this cell was pushed after this one
+            if g > own_g[current]:
+                continue
+            if own_closed[current]:
+                reexpansions += 1
+            else:
+                own_closed[current] = 1
+                expanded_nodes += 1
+            if on_expand is not None:
+                on_expand(divmod(current, cols))
+
+            new_g = g + 1
+            for offset in offsets[mask[current]]:
+                neighbor = current + offset
+                old_g = own_g[neighbor]
+
+                if old_g == -1 or new_g < old_g:
+                    if old_g == -1 and other_g[neighbor] == -1:
+                        order.append(neighbor)
+                    own_g[neighbor] = new_g
+                    own_parents[neighbor] = current
+                    counter += 1
+                    heapq.heappush(open_list, (new_g + own_h(neighbor), tie_key(new_g), counter, new_g, neighbor))
+                    if on_push is not None:
+                        # Both open lists together are the frontier
+                        on_push(divmod(neighbor, cols), len(open_lists[0]) + len(open_lists[1]), old_g != -1)
+
+                    # Both searches reached this cell: candidate start -> goal path
+                    if other_g[neighbor] != -1 and new_g + other_g[neighbor] < mu:
+                        mu = new_g + other_g[neighbor]
+                        meeting = neighbor
+
+        visited_list = self._visited_positions(maze, order)
+        if meeting == -1:
+            return self._no_path_metrics(expanded_nodes, start_time, visited_list, reexpansions=reexpansions)
+
+        forward = self._reconstruct_path(meeting, parents[0], maze)
+        backward = self._reconstruct_path(meeting, parents[1], maze)
+        path = forward + backward[-2::-1]
+        return self._path_metrics(path, expanded_nodes, start_time, is_optimal=not maze.weighted,
+                                  visited_list=visited_list, reexpansions=reexpansions)
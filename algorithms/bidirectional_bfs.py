@@ -0,0 +1,95 @@
+from array import array
+import time
+from .base import UninformedSearchAlgorithm
+
+
+class BidirectionalBFS(UninformedSearchAlgorithm):
+    """
+    Breadth-First Search run simultaneously from the start and from the goal.
+        Each step expands one whole level of the smaller frontier, so both searches
+        only need to reach about half of the solution depth.
+    """
+
+    @property
+    def name(self):
+        return "Bidirectional BFS"
+
+    def solve(self, maze, start, goal):
+        self._require_in_memory(maze)
+        start_time = time.perf_counter()
+        expanded_nodes = 0
+
+        if maze.separated(start, goal) or not self._in_bounds(maze, start, goal):
+            return self._no_path_metrics(expanded_nodes, start_time, [])
+        if start != goal and not maze.is_valid_move(goal):
+            # The backward search would walk out of a wall goal
+            return self._no_path_metrics(expanded_nodes, start_time, [])
+
+        start_idx, goal_idx = maze.index(start), maze.index(goal)
+        offsets, mask = maze.neighbor_offsets, maze.neighbor_mask
+
+        # One distance/parent array per direction (-1 = not reached yet)
+        dist = (array('i', [-1]) * maze.size, array('i', [-1]) * maze.size)
+        parents = (array('i', [-1]) * maze.size, array('i', [-1]) * maze.size)
+        dist[0][start_idx] = 0
+        dist[1][goal_idx] = 0
+        order = array('i', [start_idx])
+        frontiers = [[start_idx], [goal_idx]]
+
+        if start_idx == goal_idx:
+            expanded_nodes = 1
+            return self._reconstruct_metrics(
+                start_idx, expanded_nodes, start_time, is_optimal=True,
+                visited_list=self._visited_positions(maze, order), parents=parents[0], maze=maze)
+        order.append(goal_idx)
+        cols = maze.cols
+        on_expand, on_push = self._begin_search()
+
+        while frontiers[0] and frontiers[1]:
+            # Grow the side with the smaller frontier
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            own_dist, other_dist, own_parents = dist[side], dist[1 - side], parents[side]
+            next_frontier = []
+            best = None  # (length, cell on this side, cell on the other side)
+
+            for current in frontiers[side]:
+                expanded_nodes += 1
+                if on_expand is not None:
+                    on_expand(divmod(current, cols))
+                next_dist = own_dist[current] + 1
+                for offset in offsets[mask[current]]:
+                    neighbor = current + offset
+                    if other_dist[neighbor] != -1:
+                        length = next_dist + other_dist[neighbor]
+                        if best is None or length < best[0]:
+                            best = (length, current, neighbor)
+                    if own_dist[neighbor] == -1:
+                        own_dist[neighbor] = next_dist
+                        own_parents[neighbor] = current
+                        order.append(neighbor)
+                        next_frontier.append(neighbor)
+                        if on_push is not None:
+                            # Both frontiers together are the open list
+                            on_push(divmod(neighbor, cols), len(next_frontier) + len(frontiers[1 - side]), False)
+
+            # The whole level is finished, so the shortest meeting found in it is optimal
+            if best is not None:
+                _, own_cell, other_cell = best
+                if side == 0:
+                    path = self._join_paths(maze, parents, own_cell, other_cell)
+                else:
+                    path = self._join_paths(maze, parents, other_cell, own_cell)
+                return self._path_metrics(path, expanded_nodes, start_time, is_optimal=not maze.weighted,
+                                          visited_list=self._visited_positions(maze, order))
+
+            frontiers[side] = next_frontier
+
+        return self._no_path_metrics(expanded_nodes, start_time, self._visited_positions(maze, order))
+
+    def _join_paths(self, maze, parents, forward_cell, backward_cell):
+        """
+        Join the start -> forward_cell path with the backward_cell -> goal path.
+        """
+        forward = self._reconstruct_path(forward_cell, parents[0], maze)
+        backward = self._reconstruct_path(backward_cell, parents[1], maze)
+        return forward + backward[::-1]
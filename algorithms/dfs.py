@@ -1,48 +1,87 @@
+from array import array
 import time
 from .base import UninformedSearchAlgorithm, Node
 
 
 class DFS(UninformedSearchAlgorithm):
+    out_of_core = True
+
+    @property
+    def name(self):
+        return "DFS"
+
     def solve(self, maze, start, goal):
+        unreachable = self._unreachable_metrics(maze, start, goal)
+        if unreachable:
+            return unreachable
+
+        if self._use_index_kernel(maze, start, goal):
+            return self._solve_indexed(maze, start, goal)
+
         start_time = time.perf_counter()
         expanded_nodes = 0
 
         # (LIFO)
         stack = [Node(start)]
         visited = {start}
+        on_expand, on_push = self._begin_search()
 
         while stack:
             current_node = stack.pop()
             expanded_nodes += 1
+            if on_expand is not None:
+                on_expand(current_node.position)
 
             if current_node.position == goal:
                 return self._reconstruct_metrics(
                     current_node, expanded_nodes, start_time,
-                    is_optimal=False, visited_list=list(visited))
+                    is_optimal=False, visited_list=self._visited_list(visited))
 
             for neighbor_pos in maze.get_neighbors(current_node.position):
                 if neighbor_pos not in visited:
                     visited.add(neighbor_pos)
                     stack.append(Node(neighbor_pos, parent=current_node))
+                    if on_push is not None:
+                        on_push(neighbor_pos, len(stack), False)
+
+        return self._no_path_metrics(expanded_nodes, start_time, self._visited_list(visited))
+
+    def _solve_indexed(self, maze, start, goal):
+        start_time = time.perf_counter()
+        expanded_nodes = 0
+
+        start_idx, goal_idx = maze.index(start), maze.index(goal)
+        offsets, mask = maze.neighbor_offsets, maze.neighbor_mask
+
+        parents = array('i', [-1]) * maze.size
+        visited = bytearray(maze.size)
+        visited[start_idx] = 1
+        order = array('i', [start_idx])
+
+        # (LIFO)
+        stack = [start_idx]
+        cols = maze.cols
+        on_expand, on_push = self._begin_search()
+
+        while stack:
+            current = stack.pop()
+            expanded_nodes += 1
+            if on_expand is not None:
+                on_expand(divmod(current, cols))
+
+            if current == goal_idx:
+                return self._reconstruct_metrics(
+                    current, expanded_nodes, start_time, is_optimal=False,
+                    visited_list=self._visited_positions(maze, order), parents=parents, maze=maze)
+
+            for offset in offsets[mask[current]]:
+                neighbor = current + offset
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    parents[neighbor] = current
+                    order.append(neighbor)
+                    stack.append(neighbor)
+                    if on_push is not None:
+                        on_push(divmod(neighbor, cols), len(stack), False)
 
-        return {
-            "algorithm": "DFS",
-            "path": [],
-            "expanded_nodes": expanded_nodes,
-            "solution_depth": 0,
-            "execution_time": time.perf_counter() - start_time,
-            "is_optimal": False,
-            "visited_list": list(visited)
-        }
-
-    def _reconstruct_metrics(self, node, expanded, start_time, is_optimal, visited_list):
-        path = self._reconstruct_path(node)
-        return {
-            "algorithm": "DFS",
-            "path": path,
-            "expanded_nodes": expanded,
-            "solution_depth": len(path) - 1,
-            "execution_time": time.perf_counter() - start_time,
-            "is_optimal": is_optimal,
-            "visited_list": visited_list
-        }
+        return self._no_path_metrics(expanded_nodes, start_time, self._visited_positions(maze, order))
@@ -0,0 +1,112 @@
+from array import array
+import time
+from maze_engine import STEP_COST
+from .base import InformedSearchAlgorithm
+
+
+class Dijkstra(InformedSearchAlgorithm):
+    """
+    Dijkstra's algorithm for weighted terrain, with Dial's bucket queue instead of heapq.
+        Entering a cell costs 1 on a path and its value on terrain (2-9), see maze_engine.
+        Since costs are small integers, every priority in the open list lies between the
+        current one and current + the largest step cost, so a circular array of that many
+        buckets replaces the binary heap: push and pop are O(1) and the whole search runs in
+        linear time (cells + largest priority).
+        With heuristic_type="manhattan" the same queue runs A* (priority g + h, one more bucket
+        since h changes by at most 1 per step). The heuristic stays admissible and consistent
+        because no step costs less than 1. Euclidean distances are not integers and are refused.
+        Within a bucket cells are popped last in, first out (tie_breaking is not used).
+    """
+
+    def __init__(self, heuristic_type=None, kernel="index", tie_breaking="high_g"):
+        """
+        heuristic_type: None for Dijkstra, "manhattan" for A*.
+        """
+        if heuristic_type not in (None, "manhattan"):
+            raise ValueError(f"Dial's bucket queue needs integer priorities: heuristic_type must be "
+                             f"None or 'manhattan', not '{heuristic_type}'")
+        super().__init__(heuristic_type, kernel, tie_breaking)
+
+    @property
+    def name(self):
+        if self.heuristic_type is None:
+            return "Dijkstra (Dial)"
+        return f"A* (Dial, {self.heuristic_type})"
+
+    def solve(self, maze, start, goal):
+        self._require_in_memory(maze)
+        unreachable = self._unreachable_metrics(maze, start, goal)
+        if unreachable:
+            unreachable["path_cost"] = None
+            return unreachable
+
+        start_time = time.perf_counter()
+        if not self._in_bounds(maze, start, goal):
+            return self._no_path_metrics(0, start_time, [], path_cost=None)
+
+        expanded_nodes = 0
+        start_idx, goal_idx = maze.index(start), maze.index(goal)
+        offsets, mask, cells = maze.neighbor_offsets, maze.neighbor_mask, maze.cells
+        if self.heuristic_type is None:
+            get_h = None
+            slots = maze.max_cost + 1
+        else:
+            get_h = self._get_index_h(maze, goal)
+            slots = maze.max_cost + 2
+
+        # Lowest cost found for each cell (-1 = never reached) and the parent it came from
+        g_costs = array('i', [-1]) * maze.size
+        parents = array('i', [-1]) * maze.size
+        closed = bytearray(maze.size)
+        g_costs[start_idx] = 0
+        order = array('i', [start_idx])
+
+        # Circular bucket queue: the cells of priority f sit in buckets[f % slots]. Outdated
+        # entries (the cell got cheaper later) are skipped when popped, like heapq lazy deletion.
+        priority = get_h(start_idx) if get_h is not None else 0
+        buckets = [[] for _ in range(slots)]
+        buckets[priority % slots].append(start_idx)
+        queued = 1
+        cols = maze.cols
+        on_expand, on_push = self._begin_search()
+
+        while queued:
+            bucket = buckets[priority % slots]
+            if not bucket:
+                priority += 1
+                continue
+            current = bucket.pop()
+            queued -= 1
+            if closed[current]:
+                continue
+            closed[current] = 1
+            expanded_nodes += 1
+            if on_expand is not None:
+                on_expand(divmod(current, cols))
+
+            g = g_costs[current]
+            if current == goal_idx:
+                return self._reconstruct_metrics(
+                    current, expanded_nodes, start_time, is_optimal=True,
+                    visited_list=self._visited_positions(maze, order), parents=parents, maze=maze,
+                    path_cost=g)
+
+            for offset in offsets[mask[current]]:
+                neighbor = current + offset
+                if closed[neighbor]:
+                    continue
+                new_g = g + STEP_COST[cells[neighbor]]
+                old_g = g_costs[neighbor]
+                if old_g == -1 or new_g < old_g:
+                    if old_g == -1:
+                        order.append(neighbor)
+                    g_costs[neighbor] = new_g
+                    parents[neighbor] = current
+                    f = new_g + get_h(neighbor) if get_h is not None else new_g
+                    buckets[f % slots].append(neighbor)
+                    queued += 1
+                    if on_push is not None:
+                        on_push(divmod(neighbor, cols), queued, old_g != -1)
+
+        return self._no_path_metrics(expanded_nodes, start_time, self._visited_positions(maze, order),
+                                     path_cost=None)
@@ -0,0 +1,242 @@
+from array import array
+import heapq
+import time
+from maze_engine import WALL
+from .base import InformedSearchAlgorithm
+
+# g / rhs value of cells that cannot reach the goal (or were not computed yet)
+INF = float("inf")
+
+
+class DStarLite(InformedSearchAlgorithm):
+    """
+    D* Lite: incremental A* that keeps its search between calls and repairs it after edits.
+        The search runs backwards, from the goal towards the start: g(s) is the cost from s to
+        the goal and rhs(s) its one-step lookahead (1 + the best g among the open neighbors).
+        Cells where the two disagree are "inconsistent" and sit in the priority queue.
+        When the maze is edited (Maze.set_cells), only the cells next to the edited ones get a
+        new rhs, and the next solve() expands just the inconsistent region the edits created.
+        A moved start reuses the search too (the km offset keeps the old keys valid).
+        The state is kept for one (maze, goal) pair; another maze or goal starts a new search.
+    """
+
+    def __init__(self, heuristic_type="manhattan", kernel="index", tie_breaking="high_g"):
+        super().__init__(heuristic_type, kernel, tie_breaking)
+        self._state = None
+
+    @property
+    def name(self):
+        return f"D* Lite ({self.heuristic_type})"
+
+    def __getstate__(self):
+        # The search state belongs to one maze in this process (e.g. not sent to pool workers)
+        state = self.__dict__.copy()
+        state["_state"] = None
+        return state
+
+    def reset(self):
+        """
+        Forget the search state (the next solve() starts from scratch).
+        """
+        if self._state is not None:
+            self._state["maze"].unsubscribe(self._on_maze_change)
+            self._state = None
+
+    def _on_maze_change(self, maze, changed):
+        self._state["changed"].extend(changed)
+
+    def solve(self, maze, start, goal):
+        self._require_in_memory(maze)
+        unreachable = self._unreachable_metrics(maze, start, goal)
+        if unreachable:
+            return unreachable
+
+        start_time = time.perf_counter()
+        if not self._in_bounds(maze, start, goal):
+            self.reset()
+            return self._no_path_metrics(0, start_time, [])
+
+        state = self._state
+        replanned = state is not None and state["maze"] is maze and state["goal"] == goal
+        if not replanned:
+            self.reset()
+            state = self._start_search(maze, start, goal)
+
+        start_idx = maze.index(start)
+        get_h = self._get_index_h(maze, start)
+        # The heuristic now measures distances to the new start: raise every later key by the
+        # distance the start moved, instead of re-keying the whole queue
+        state["km"] += get_h(state["last_start"])
+        state["last_start"] = start_idx
+
+        order = []
+        updated_cells = len(state["changed"])
+        hooks = self._begin_search()
+        if state["changed"]:
+            self._apply_changes(state, maze, get_h, hooks[1])
+        self._compute_shortest_path(state, maze, start_idx, get_h, order, *hooks)
+
+        if start == goal:
+            path = [start]
+        else:
+            path = self._extract_path(state, maze, start_idx)
+        # A cell can be expanded twice in one repair (raised, then lowered again)
+        visited_list = self._visited_positions(maze, dict.fromkeys(order))
+        if not path:
+            return self._no_path_metrics(len(order), start_time, visited_list,
+                                         replanned=replanned, updated_cells=updated_cells)
+        return self._path_metrics(path, len(order), start_time, is_optimal=not maze.weighted, visited_list=visited_list,
+                                  replanned=replanned, updated_cells=updated_cells)
+
+    def _start_search(self, maze, start, goal):
+        goal_idx = maze.index(goal)
+        g = array('d', [INF]) * maze.size
+        rhs = array('d', [INF]) * maze.size
+        rhs[goal_idx] = 0
+        h_goal = self._get_h(start, goal)
+
+        self._state = {
+            "maze": maze, "goal": goal, "goal_idx": goal_idx, "g": g, "rhs": rhs,
+            # Priority queue of (k1, k2, index) with lazy deletion: open_keys holds the live key
+            "queue": [(h_goal, 0, goal_idx)], "open_keys": {goal_idx: (h_goal, 0)},
+            "km": 0, "last_start": maze.index(start), "changed": [],
+        }
+        maze.subscribe(self._on_maze_change)
+        return self._state
+
+    def _predecessors(self, maze, index):
+        """
+        In-bounds neighbors of a cell, i.e. the cells that can step into it when it is free.
+        """
+        x, y = divmod(index, maze.cols)
+        cells = []
+        if x > 0:
+            cells.append(index - maze.cols)
+        if x < maze.rows - 1:
+            cells.append(index + maze.cols)
+        if y > 0:
+            cells.append(index - 1)
+        if y < maze.cols - 1:
+            cells.append(index + 1)
+        return cells
+
+    def _lookahead(self, state, maze, index):
+        """
+        rhs of a cell: 1 + the smallest g among the neighbors it can move to.
+        """
+        if index == state["goal_idx"]:
+            return 0
+        g = state["g"]
+        best = INF
+        for offset in maze.neighbor_offsets[maze.neighbor_mask[index]]:
+            if g[index + offset] < best:
+                best = g[index + offset]
+        return best + 1
+
+    def _update_vertex(self, state, index, get_h, on_push=None):
+        g, rhs = state["g"], state["rhs"]
+        open_keys = state["open_keys"]
+        if g[index] != rhs[index]:
+            k2 = min(g[index], rhs[index])
+            key = (k2 + get_h(index) + state["km"], k2)
+            repush = index in open_keys
+            open_keys[index] = key
+            heapq.heappush(state["queue"], (key[0], key[1], index))
+            if on_push is not None:
+                on_push(divmod(index, state["maze"].cols), len(open_keys), repush)
+        elif index in open_keys:
+            del open_keys[index]
+
+    def _apply_changes(self, state, maze, get_h, on_push=None):
+        """
+        An edited cell changes the cost of stepping into it, so its neighbors get a new rhs.
+        """
+        rhs = state["rhs"]
+        touched = set()
+        for index in state["changed"]:
+            touched.update(self._predecessors(maze, index))
+        state["changed"] = []
+        for index in touched:
+            rhs[index] = self._lookahead(state, maze, index)
+            self._update_vertex(state, index, get_h, on_push)
+
+    def _top_key(self, state):
+        """
+        Smallest live key of the queue (stale heap entries are dropped on the way).
+        """
+        queue, open_keys = state["queue"], state["open_keys"]
+        while queue:
+            k1, k2, index = queue[0]
+            if open_keys.get(index) == (k1, k2):
+                return (k1, k2)
+            heapq.heappop(queue)
+        return (INF, INF)
+
+    def _compute_shortest_path(self, state, maze, start_idx, get_h, order, on_expand=None, on_push=None):
+        g, rhs = state["g"], state["rhs"]
+        queue, open_keys = state["queue"], state["open_keys"]
+
+        while True:
+            top = self._top_key(state)
+            start_k2 = min(g[start_idx], rhs[start_idx])
+            start_key = (start_k2 + get_h(start_idx) + state["km"], start_k2)
+            if top >= start_key and rhs[start_idx] == g[start_idx]:
+                break
+            if top == (INF, INF):
+                break
+
+            index = heapq.heappop(queue)[2]
+            k2 = min(g[index], rhs[index])
+            new_key = (k2 + get_h(index) + state["km"], k2)
+            if top < new_key:
+                # Key computed for an older start: queue it again with the current one
+                open_keys[index] = new_key
+                heapq.heappush(queue, (new_key[0], new_key[1], index))
+                continue
+
+            del open_keys[index]
+            order.append(index)
+            if on_expand is not None:
+                on_expand(divmod(index, maze.cols))
+            if g[index] > rhs[index]:
+                # Overconsistent: the cell got cheaper, settle it and relax the cells around it
+                g[index] = rhs[index]
+                if maze.cells[index] == WALL:
+                    # Nothing can step into a wall
+                    continue
+                step = g[index] + 1
+                for neighbor in self._predecessors(maze, index):
+                    if step < rhs[neighbor] and neighbor != state["goal_idx"]:
+                        rhs[neighbor] = step
+                        self._update_vertex(state, neighbor, get_h, on_push)
+            else:
+                # Underconsistent: the cell got more expensive, every cell that relied on it
+                # (and the cell itself) looks for a new best neighbor
+                old_step = g[index] + 1
+                g[index] = INF
+                for neighbor in self._predecessors(maze, index) + [index]:
+                    if rhs[neighbor] == old_step or neighbor == index:
+                        rhs[neighbor] = self._lookahead(state, maze, neighbor)
+                    self._update_vertex(state, neighbor, get_h, on_push)
+
+    def _extract_path(self, state, maze, start_idx):
+        """
+        Follow the smallest g from the start down to the goal (Up, Down, Left, Right on ties).
+        """
+        g = state["g"]
+        if g[start_idx] == INF:
+            return []
+        offsets, mask = maze.neighbor_offsets, maze.neighbor_mask
+        goal_idx = state["goal_idx"]
+        current = start_idx
+        path = [maze.position(current)]
+        while current != goal_idx:
+            best, best_g = -1, g[current]
+            for offset in offsets[mask[current]]:
+                if g[current + offset] < best_g:
+                    best, best_g = current + offset, g[current + offset]
+            if best == -1:
+                return []
+            current = best
+            path.append(maze.position(current))
+        return path
@@ -1,3 +1,4 @@
+from array import array
 import heapq
 import time
 import math
@@ -5,51 +6,99 @@ from .base import InformedSearchAlgorithm, Node
 
 
 class Greedy(InformedSearchAlgorithm):
+    out_of_core = True
+
+    @property
+    def name(self):
+        return f"Greedy ({self.heuristic_type})"
+
     def solve(self, maze, start, goal):
+        unreachable = self._unreachable_metrics(maze, start, goal)
+        if unreachable:
+            return unreachable
+
+        if self._use_index_kernel(maze, start, goal):
+            return self._solve_indexed(maze, start, goal)
+
         start_time = time.perf_counter()
         expanded_nodes = 0
+        tie_key = self._tie_key
 
-        # Priority Queue based on only h(n)
+        # Priority Queue based on only h(n): (h, tie key, insertion counter, node)
+        counter = 0
         open_list = []
         h_start = self._get_h(start, goal)
         # Set f = h so that heapq sorts by heuristic only
-        heapq.heappush(open_list, (h_start, Node(start, h=h_start)))
+        heapq.heappush(open_list, (h_start, tie_key(0), counter, Node(start, h=h_start)))
         visited = {start}
+        on_expand, on_push = self._begin_search()
 
         while open_list:
-            _, current_node = heapq.heappop(open_list)
+            current_node = heapq.heappop(open_list)[3]
             expanded_nodes += 1
+            if on_expand is not None:
+                on_expand(current_node.position)
 
             if current_node.position == goal:
                 return self._reconstruct_metrics(
                     current_node, expanded_nodes, start_time,
-                    is_optimal=False, visited_list=list(visited))
+                    is_optimal=False, visited_list=self._visited_list(visited))
 
             for neighbor_pos in maze.get_neighbors(current_node.position):
                 if neighbor_pos not in visited:
                     visited.add(neighbor_pos)
                     h = self._get_h(neighbor_pos, goal)
+                    # g only records the depth here, it is used for tie-breaking
+                    new_g = current_node.g + 1
+                    counter += 1
                     heapq.heappush(
-                        open_list, (h, Node(neighbor_pos, current_node, h=h)))
-
-        return {
-            "algorithm": f"Greedy ({self.heuristic_type})",
-            "path": [],
-            "expanded_nodes": expanded_nodes,
-            "solution_depth": 0,
-            "execution_time": time.perf_counter() - start_time,
-            "is_optimal": False,
-            "visited_list": list(visited)
-        }
-
-    def _reconstruct_metrics(self, node, expanded, start_time, is_optimal, visited_list):
-        path = self._reconstruct_path(node)
-        return {
-            "algorithm": f"Greedy ({self.heuristic_type})",
-            "path": path,
-            "expanded_nodes": expanded,
-            "solution_depth": len(path) - 1,
-            "execution_time": time.perf_counter() - start_time,
-            "is_optimal": is_optimal,
-            "visited_list": visited_list
-        }
+                        open_list, (h, tie_key(new_g), counter, Node(neighbor_pos, current_node, g=new_g, h=h)))
+                    if on_push is not None:
+                        on_push(neighbor_pos, len(open_list), False)
+
+        return self._no_path_metrics(expanded_nodes, start_time, self._visited_list(visited))
+
+    def _solve_indexed(self, maze, start, goal):
+        start_time = time.perf_counter()
+        expanded_nodes = 0
+
+        start_idx, goal_idx = maze.index(start), maze.index(goal)
+        offsets, mask = maze.neighbor_offsets, maze.neighbor_mask
+        get_h = self._get_index_h(maze, goal)
+        tie_key = self._tie_key
+
+        parents = array('i', [-1]) * maze.size
+        visited = bytearray(maze.size)
+        visited[start_idx] = 1
+        order = array('i', [start_idx])
+
+        # Priority Queue based on only h(n): (h, tie key, insertion counter, depth, index)
+        counter = 0
+        open_list = [(get_h(start_idx), tie_key(0), counter, 0, start_idx)]
+        cols = maze.cols
+        on_expand, on_push = self._begin_search()
+
+        while open_list:
+            depth, current = heapq.heappop(open_list)[3:]
+            expanded_nodes += 1
+            if on_expand is not None:
+                on_expand(divmod(current, cols))
+
+            if current == goal_idx:
+                return self._reconstruct_metrics(
+                    current, expanded_nodes, start_time, is_optimal=False,
+                    visited_list=self._visited_positions(maze, order), parents=parents, maze=maze)
+
+            depth += 1
+            for offset in offsets[mask[current]]:
+                neighbor = current + offset
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    parents[neighbor] = current
+                    order.append(neighbor)
+                    counter += 1
+                    heapq.heappush(open_list, (get_h(neighbor), tie_key(depth), counter, depth, neighbor))
+                    if on_push is not None:
+                        on_push(divmod(neighbor, cols), len(open_list), False)
+
+        return self._no_path_metrics(expanded_nodes, start_time, self._visited_positions(maze, order))
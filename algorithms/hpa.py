@@ -0,0 +1,444 @@
+from array import array
+from collections import deque
+import heapq
+import pickle
+import time
+from maze_engine import WALL
+from .base import InformedSearchAlgorithm
+
+# Entrances wider than this get two transitions (one at each end) instead of one in the middle
+WIDE_ENTRANCE = 6
+
+
+class ClusterAbstraction:
+    """
+    The abstract graph of HPA*, built once per maze.
+        The grid is cut into cluster_size x cluster_size clusters. Along every border between
+        two clusters, each run of cell pairs that are free on both sides is an entrance, and
+        one or two cell pairs of it become transitions (abstract nodes linked with cost 1).
+        Inside a cluster, the nodes are linked by their BFS distance restricted to the cluster.
+        Edits of the maze (Maze.set_cells) only rebuild the clusters and borders they touch.
+    """
+
+    def __init__(self, maze, cluster_size=16):
+        self.maze = maze
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-maze.rows // cluster_size)
+        self.cluster_cols = -(-maze.cols // cluster_size)
+        self._build_cluster_ids()
+        # border (cluster a, cluster b) -> list of transitions (cell in a, cell in b)
+        self.borders = {}
+        # cluster -> {node: {other node of the cluster: distance inside the cluster}}
+        self.intra = {}
+        self._changed = []
+        self.fingerprint = None
+
+        for border in self._all_borders():
+            self.borders[border] = self._scan_border(border)
+        self._link_transitions()
+        for cluster in range(self.cluster_rows * self.cluster_cols):
+            self._build_intra(cluster)
+        self._attach(maze)
+
+    @property
+    def node_count(self):
+        return len(self.inter)
+
+    def _build_cluster_ids(self):
+        """
+        Cluster of every cell, so a BFS can tell in O(1) whether it is leaving its cluster.
+        """
+        maze, size = self.maze, self.cluster_size
+        column_clusters = [y // size for y in range(maze.cols)]
+        ids = array('i')
+        for x in range(maze.rows):
+            base = (x // size) * self.cluster_cols
+            ids.extend([base + c for c in column_clusters])
+        self.cluster_id = ids
+
+    def _attach(self, maze):
+        self.version = maze.version
+        self.fingerprint = maze.fingerprint
+        maze.subscribe(self._on_maze_change)
+
+    def _on_maze_change(self, maze, changed):
+        self._changed.extend(changed)
+
+    def cluster_bounds(self, cluster):
+        """
+        (first row, last row + 1, first column, last column + 1) of a cluster.
+        """
+        size = self.cluster_size
+        cx, cy = divmod(cluster, self.cluster_cols)
+        return (cx * size, min((cx + 1) * size, self.maze.rows),
+                cy * size, min((cy + 1) * size, self.maze.cols))
+
+    def _all_borders(self):
+        for cx in range(self.cluster_rows):
+            for cy in range(self.cluster_cols):
+                cluster = cx * self.cluster_cols + cy
+                if cy + 1 < self.cluster_cols:
+                    yield (cluster, cluster + 1)
+                if cx + 1 < self.cluster_rows:
+                    yield (cluster, cluster + self.cluster_cols)
+
+    def _scan_border(self, border):
+        """
+        Find the transitions of the border between two neighboring clusters.
+        """
+        maze = self.maze
+        a, b = border
+        x0, x1, y0, y1 = self.cluster_bounds(a)
+        if b == a + 1 and (a + 1) % self.cluster_cols:
+            # Vertical border: last column of a against first column of b
+            pairs = [(x * maze.cols + y1 - 1, x * maze.cols + y1) for x in range(x0, x1)]
+        else:
+            # Horizontal border: last row of a against first row of b
+            pairs = [((x1 - 1) * maze.cols + y, x1 * maze.cols + y) for y in range(y0, y1)]
+
+        cells = maze.cells
+        transitions = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and cells[pair[0]] != WALL and cells[pair[1]] != WALL:
+                run.append(pair)
+                continue
+            if len(run) >= WIDE_ENTRANCE:
+                transitions += [run[0], run[-1]]
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+        return transitions
+
+    def _link_transitions(self):
+        """
+        Rebuild the inter-cluster links (node -> nodes of other clusters one step away).
+        """
+        self.inter = {}
+        for transitions in self.borders.values():
+            for a, b in transitions:
+                self.inter.setdefault(a, set()).add(b)
+                self.inter.setdefault(b, set()).add(a)
+
+    def _build_intra(self, cluster):
+        """
+        BFS from every node of a cluster (without leaving it) to get its distance to the others.
+        """
+        nodes = self._nodes_of(cluster)
+        links = {}
+        targets = set(nodes)
+        for node in nodes:
+            distances = self.local_distances(node, cluster, targets)
+            links[node] = {other: distances[other] for other in nodes if other != node and other in distances}
+        self.intra[cluster] = links
+
+    def _nodes_of(self, cluster):
+        """
+        Nodes of a cluster, read from the transitions of its (up to four) borders.
+        """
+        cols = self.cluster_cols
+        borders = ((cluster - 1, cluster), (cluster, cluster + 1), (cluster - cols, cluster), (cluster, cluster + cols))
+        nodes = []
+        cluster_id = self.cluster_id
+        for border in borders:
+            for pair in self.borders.get(border, ()):
+                for node in pair:
+                    if cluster_id[node] == cluster and node not in nodes:
+                        nodes.append(node)
+        return nodes
+
+    def local_distances(self, source, cluster, targets=None, order=None):
+        """
+        BFS distances from a cell to the cells of a cluster, without leaving the cluster.
+        With targets, stops once all of them are labeled. Expanded cells are added to order.
+        """
+        maze = self.maze
+        offsets, mask, cluster_id = maze.neighbor_offsets, maze.neighbor_mask, self.cluster_id
+        distances = {source: 0}
+        remaining = len(targets) if targets else -1
+        if targets and source in targets:
+            remaining -= 1
+        queue = deque([source])
+        while queue and remaining != 0:
+            current = queue.popleft()
+            if order is not None:
+                order.append(current)
+            next_dist = distances[current] + 1
+            for offset in offsets[mask[current]]:
+                neighbor = current + offset
+                if neighbor not in distances and cluster_id[neighbor] == cluster:
+                    distances[neighbor] = next_dist
+                    queue.append(neighbor)
+                    if targets and neighbor in targets:
+                        remaining -= 1
+        return distances
+
+    def local_path(self, source, target, cluster, order=None):
+        """
+        Shortest path (list of cell indices) from source to target inside one cluster.
+        """
+        maze = self.maze
+        offsets, mask, cluster_id = maze.neighbor_offsets, maze.neighbor_mask, self.cluster_id
+        parents = {source: -1}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if order is not None:
+                order.append(current)
+            if current == target:
+                break
+            for offset in offsets[mask[current]]:
+                neighbor = current + offset
+                if neighbor not in parents and cluster_id[neighbor] == cluster:
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+        if target not in parents:
+            return None
+        path = []
+        current = target
+        while current != -1:
+            path.append(current)
+            current = parents[current]
+        return path[::-1]
+
+    def refresh(self):
+        """
+        Apply the edits notified since the last refresh: rescan the borders next to edited
+        cells, then rebuild the intra-cluster links of every cluster whose cells or nodes changed.
+        Returns the number of rebuilt clusters.
+        """
+        if not self._changed:
+            return 0
+        maze, size, cols = self.maze, self.cluster_size, self.cluster_cols
+        borders, clusters = set(), set()
+        for index in set(self._changed):
+            x, y = divmod(index, maze.cols)
+            cluster = self.cluster_id[index]
+            clusters.add(cluster)
+            # Cells on the edge of a cluster belong to the border with the next cluster
+            if y % size == 0 and y > 0:
+                borders.add((cluster - 1, cluster))
+            if y % size == size - 1 and y + 1 < maze.cols:
+                borders.add((cluster, cluster + 1))
+            if x % size == 0 and x > 0:
+                borders.add((cluster - cols, cluster))
+            if x % size == size - 1 and x + 1 < maze.rows:
+                borders.add((cluster, cluster + cols))
+        self._changed = []
+
+        for border in borders:
+            self.borders[border] = self._scan_border(border)
+            clusters.update(border)
+        if borders:
+            self._link_transitions()
+        for cluster in clusters:
+            self._build_intra(cluster)
+        self.version = maze.version
+        self.fingerprint = maze.fingerprint
+        return len(clusters)
+
+    def neighbors(self, node):
+        """
+        Abstract edges of a node: (neighbor, cost) pairs.
+        """
+        links = list(self.intra[self.cluster_id[node]].get(node, {}).items())
+        links += [(other, 1) for other in self.inter.get(node, ())]
+        return links
+
+    def save(self, filename):
+        """
+        Write the abstraction (without the maze) to a file; see load().
+        """
+        self.refresh()
+        data = {
+            "rows": self.maze.rows, "cols": self.maze.cols, "cluster_size": self.cluster_size,
+            "fingerprint": self.fingerprint, "borders": self.borders, "intra": self.intra,
+        }
+        with open(filename, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, filename, maze):
+        """
+        Read an abstraction saved by save() for this maze (same size and contents).
+        """
+        with open(filename, 'rb') as f:
+            data = pickle.load(f)
+        if (data["rows"], data["cols"]) != (maze.rows, maze.cols) or data["fingerprint"] != maze.fingerprint:
+            raise ValueError("The saved abstraction was built for another maze")
+
+        abstraction = cls.__new__(cls)
+        abstraction.maze = maze
+        abstraction.cluster_size = data["cluster_size"]
+        abstraction.cluster_rows = -(-maze.rows // abstraction.cluster_size)
+        abstraction.cluster_cols = -(-maze.cols // abstraction.cluster_size)
+        abstraction._build_cluster_ids()
+        abstraction.borders = data["borders"]
+        abstraction.intra = data["intra"]
+        abstraction._changed = []
+        abstraction._link_transitions()
+        abstraction._attach(maze)
+        return abstraction
+
+
+class HPAStar(InformedSearchAlgorithm):
+    """
+    Hierarchical Path-Finding A* (near-optimal).
+        Start and goal are connected to the nodes of their clusters, A* runs on the small
+        abstract graph (see ClusterAbstraction), and only the abstract edges of the result are
+        refined into cells, each with a BFS that stays inside one cluster. Paths are optimal up
+        to the detours imposed by the transition cells; the analyzer reports the gap.
+    """
+
+    def __init__(self, cluster_size=16, heuristic_type="manhattan", kernel="index", tie_breaking="high_g"):
+        super().__init__(heuristic_type, kernel, tie_breaking)
+        self.cluster_size = cluster_size
+        self.abstraction = None
+
+    @property
+    def name(self):
+        return f"HPA* ({self.cluster_size}x{self.cluster_size})"
+
+    def __getstate__(self):
+        # The abstraction is tied to a maze of this process (pool workers build their own)
+        state = self.__dict__.copy()
+        state["abstraction"] = None
+        return state
+
+    def abstraction_for(self, maze):
+        """
+        Return the abstraction of a maze, building it on first use and refreshing it after edits.
+        """
+        abstraction = self.abstraction
+        if abstraction is None or abstraction.maze is not maze or abstraction.cluster_size != self.cluster_size:
+            if abstraction is not None:
+                abstraction.maze.unsubscribe(abstraction._on_maze_change)
+            self.abstraction = abstraction = ClusterAbstraction(maze, self.cluster_size)
+        else:
+            abstraction.refresh()
+        return abstraction
+
+    def solve(self, maze, start, goal):
+        self._require_in_memory(maze)
+        unreachable = self._unreachable_metrics(maze, start, goal)
+        if unreachable:
+            return unreachable
+
+        build_start = time.perf_counter()
+        if not self._in_bounds(maze, start, goal):
+            return self._no_path_metrics(0, build_start, [])
+        abstraction = self.abstraction_for(maze)
+        build_time = time.perf_counter() - build_start
+
+        start_time = time.perf_counter()
+        start_idx, goal_idx = maze.index(start), maze.index(goal)
+        order = []
+        if start_idx == goal_idx:
+            return self._path_metrics([start], 0, start_time, is_optimal=False, visited_list=[start],
+                                      abstract_expanded=0, build_time=build_time)
+
+        abstract_path, entries, abstract_expanded = self._abstract_search(abstraction, maze, start_idx, goal_idx, order)
+        if abstract_path is None:
+            return self._no_path_metrics(len(order) + abstract_expanded, start_time,
+                                         self._visited_positions(maze, order),
+                                         abstract_expanded=abstract_expanded, build_time=build_time)
+
+        path = self._refine(abstraction, abstract_path, entries, order)
+        return self._path_metrics([maze.position(index) for index in path], len(order) + abstract_expanded,
+                                  start_time, is_optimal=False, visited_list=self._visited_positions(maze, order),
+                                  abstract_expanded=abstract_expanded, build_time=build_time)
+
+    def _abstract_search(self, abstraction, maze, start_idx, goal_idx, order):
+        """
+        A* over the abstract graph, with start and goal linked to the nodes of their clusters.
+        Returns (abstract cells from start to goal or None, entry cell used to reach each node
+        linked to the start, abstract expansions).
+        """
+        cluster_id = abstraction.cluster_id
+        goal_cluster = cluster_id[goal_idx]
+
+        # The start is left through itself, or through its free neighbors when it is a wall
+        # (a wall has no moves inside its cluster, but may border free cells of other clusters)
+        if maze.cells[start_idx] != WALL:
+            first_steps = [(start_idx, 0)]
+        else:
+            first_steps = [(start_idx + offset, 1) for offset in maze.get_neighbor_offsets(start_idx)]
+        start_links, entries = {}, {}
+        for entry, cost in first_steps:
+            cluster = cluster_id[entry]
+            nodes = abstraction.intra[cluster]
+            distances = abstraction.local_distances(entry, cluster, set(nodes) | {goal_idx}, order)
+            for node, distance in distances.items():
+                # Reaching the goal inside the cluster competes with the routes through other clusters
+                if (node in nodes or node == goal_idx) and distance + cost < start_links.get(node, distance + cost + 1):
+                    start_links[node] = distance + cost
+                    entries[node] = entry
+
+        goal_links = {}
+        if maze.cells[goal_idx] != WALL:
+            # Moves are symmetric between free cells, so the distances to the goal are the
+            # distances from the goal
+            goal_nodes = abstraction.intra[goal_cluster].keys()
+            goal_distances = abstraction.local_distances(goal_idx, goal_cluster, set(goal_nodes), order)
+            goal_links = {node: d for node, d in goal_distances.items() if node in abstraction.intra[goal_cluster]}
+
+        get_h = self._get_index_h(maze, maze.position(goal_idx))
+        tie_key = self._tie_key
+        g_costs = {start_idx: 0}
+        parents = {start_idx: -1}
+        closed = set()
+        counter = 0
+        open_list = [(get_h(start_idx), tie_key(0), counter, 0, start_idx)]
+        expanded = 0
+        cols = maze.cols
+        on_expand, on_push = self._begin_search()
+
+        while open_list:
+            g, current = heapq.heappop(open_list)[3:]
+            if g > g_costs[current] or current in closed:
+                continue
+            closed.add(current)
+            expanded += 1
+            if on_expand is not None:
+                on_expand(divmod(current, cols))
+            if current == goal_idx:
+                path = []
+                while current != -1:
+                    path.append(current)
+                    current = parents[current]
+                return path[::-1], entries, expanded
+
+            if current == start_idx:
+                links = list(start_links.items()) + [(other, 1) for other in abstraction.inter.get(start_idx, ())]
+            else:
+                links = abstraction.neighbors(current)
+            if current in goal_links:
+                links.append((goal_idx, goal_links[current]))
+
+            for neighbor, cost in links:
+                new_g = g + cost
+                if new_g < g_costs.get(neighbor, new_g + 1):
+                    repush = neighbor in g_costs
+                    g_costs[neighbor] = new_g
+                    parents[neighbor] = current
+                    counter += 1
+                    heapq.heappush(open_list, (new_g + get_h(neighbor), tie_key(new_g), counter, new_g, neighbor))
+                    if on_push is not None:
+                        on_push(divmod(neighbor, cols), len(open_list), repush)
+        return None, entries, expanded
+
+    def _refine(self, abstraction, abstract_path, entries, order):
+        """
+        Turn the abstract path into cells: transitions are single steps, every other edge is
+        a shortest path inside the cluster of its first cell.
+        """
+        path = [abstract_path[0]]
+        for a, b in zip(abstract_path, abstract_path[1:]):
+            if b in abstraction.inter.get(a, ()):
+                path.append(b)
+            elif a == abstract_path[0] and entries[b] != a:
+                # Wall start: step onto the free neighbor the link was measured from
+                path += abstraction.local_path(entries[b], b, abstraction.cluster_id[entries[b]], order)
+            else:
+                path += abstraction.local_path(a, b, abstraction.cluster_id[a], order)[1:]
+        return path
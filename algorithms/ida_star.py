@@ -0,0 +1,164 @@
+from array import array
+import time
+from .base import InformedSearchAlgorithm
+from .visited import VisitedCells
+
+INF = float("inf")
+# Multiplier spreading neighboring cells over the transposition table slots (Knuth's
+# multiplicative hash); being prime, it maps cells one-to-one when the table has a slot per cell
+HASH_MULTIPLIER = 2654435761
+
+
+class IDAStar(InformedSearchAlgorithm):
+    """
+    Iterative Deepening A*: repeated depth-first searches bounded by f = g + h.
+        Each iteration explores every path whose f stays within the bound and raises the bound
+        to the smallest f that exceeded it, so the first goal reached is an optimal one. Only the
+        current path is on the stack; a transposition table (cell -> lowest g seen in this
+        iteration) stops the search from walking the same cell again with a worse g, which is
+        what keeps IDA* usable on grids with many equivalent routes.
+        The table is direct-mapped (a hash of the cell index picks the slot) with max_memory slots
+        of 8 bytes, allocated once and cleared in place between iterations. The registry uses
+        100000 slots; None means one per cell (8 bytes per cell, no collisions). A smaller table
+        forgets the cells that collide and searches them again: less memory for more time, and
+        the time grows quickly once the table is much smaller than the number of cells within
+        the bound. max_memory only bounds the table: the search also needs two bytes per cell
+        (current path and expanded flags), the path itself, and the maze's component labels
+        (4 bytes per cell, built once per maze and kept until it is edited), which rule out an
+        unreachable goal before iterating. The overhead is therefore O(N) whatever the budget.
+        Every distinct f value is a new iteration, so the Euclidean heuristic (many close values)
+        makes far more iterations than the Manhattan one.
+    """
+
+    def __init__(self, heuristic_type="manhattan", kernel="index", tie_breaking="high_g", max_memory=None):
+        """
+        max_memory: number of transposition table entries (None = one per cell, no collisions).
+        """
+        super().__init__(heuristic_type, kernel, tie_breaking)
+        if max_memory is not None and max_memory < 1:
+            raise ValueError("IDA* needs at least one transposition table entry (max_memory >= 1)")
+        self.max_memory = max_memory
+
+    @property
+    def name(self):
+        return f"IDA* ({self.heuristic_type})"
+
+    def solve(self, maze, start, goal):
+        self._require_in_memory(maze)
+        unreachable = self._unreachable_metrics(maze, start, goal)
+        if unreachable:
+            unreachable.update(iterations=0, forgotten_nodes=0, regenerated_nodes=0)
+            return unreachable
+
+        start_time = time.perf_counter()
+        # Without the whole search in memory, proving that the goal is unreachable could take
+        # exponentially long: the component labels answer it up front
+        if not self._in_bounds(maze, start, goal) or self._disconnected(maze, start, goal):
+            return self._no_path_metrics(0, start_time, [], iterations=0, forgotten_nodes=0, regenerated_nodes=0)
+
+        start_idx, goal_idx = maze.index(start), maze.index(goal)
+        offsets, mask = maze.neighbor_offsets, maze.neighbor_mask
+        get_h = self._get_index_h(maze, goal)
+        capacity = min(self.max_memory, maze.size) if self.max_memory is not None else maze.size
+
+        # 1 = expanded at least once (for the visited list and the regeneration count)
+        seen = bytearray(maze.size)
+        on_path = bytearray(maze.size)
+        seen[start_idx] = 1
+        expanded_nodes = 0
+        regenerated = 0
+        forgotten = 0
+        iterations = 0
+        cols = maze.cols
+        on_expand, on_push = self._begin_search()
+
+        bound = get_h(start_idx)
+        path = None
+        # Direct-mapped table of (cell, lowest g): a colliding cell replaces the entry
+        empty_slots = array('i', [-1]) * capacity
+        table_cells = array('i', empty_slots)
+        table_costs = array('i', [0]) * capacity
+        while path is None and bound != INF:
+            iterations += 1
+            next_bound = INF
+            if iterations > 1:
+                table_cells[:] = empty_slots
+            table_cells[start_idx * HASH_MULTIPLIER % capacity] = start_idx
+            filled = 1
+            # The current path: cell indices, their g and the neighbors still to try
+            cells, costs, pending = [start_idx], [0], [self._children(offsets, mask, start_idx, get_h)]
+            on_path[start_idx] = 1
+            expanded_nodes += 1
+            if iterations > 1:
+                regenerated += 1
+            if on_expand is not None:
+                on_expand(start)
+
+            while cells:
+                current = cells[-1]
+                if current == goal_idx:
+                    path = [divmod(index, cols) for index in cells]
+                    break
+                if not pending[-1]:
+                    # Every neighbor tried: backtrack
+                    on_path[current] = 0
+                    cells.pop()
+                    costs.pop()
+                    pending.pop()
+                    continue
+
+                neighbor = pending[-1].pop()
+                if on_path[neighbor]:
+                    continue
+                g = costs[-1] + 1
+                f = g + get_h(neighbor)
+                if f > bound:
+                    if f < next_bound:
+                        next_bound = f
+                    continue
+                slot = neighbor * HASH_MULTIPLIER % capacity
+                known = table_cells[slot] == neighbor
+                if known and table_costs[slot] <= g:
+                    continue
+                if not known:
+                    if table_cells[slot] == -1:
+                        filled += 1
+                    else:
+                        # Collision: the previous cell is forgotten and may be searched again
+                        forgotten += 1
+                    table_cells[slot] = neighbor
+                table_costs[slot] = g
+
+                cells.append(neighbor)
+                costs.append(g)
+                pending.append(self._children(offsets, mask, neighbor, get_h))
+                on_path[neighbor] = 1
+                expanded_nodes += 1
+                if seen[neighbor]:
+                    regenerated += 1
+                else:
+                    seen[neighbor] = 1
+                if on_expand is not None:
+                    on_expand(divmod(neighbor, cols))
+                if on_push is not None:
+                    on_push(divmod(neighbor, cols), len(cells), known)
+
+            for index in cells:
+                on_path[index] = 0
+            if path is None:
+                # The whole table is dropped before the next, deeper iteration
+                forgotten += filled
+                bound = next_bound
+
+        visited_list = VisitedCells.from_bitmap(seen, maze.rows, maze.cols)
+        if path is None:
+            return self._no_path_metrics(expanded_nodes, start_time, visited_list, iterations=iterations,
+                                         forgotten_nodes=forgotten, regenerated_nodes=regenerated)
+        return self._path_metrics(path, expanded_nodes, start_time, is_optimal=not maze.weighted, visited_list=visited_list,
+                                  iterations=iterations, forgotten_nodes=forgotten, regenerated_nodes=regenerated)
+
+    def _children(self, offsets, mask, index, get_h):
+        """
+        Neighbors of a cell, ordered so that pop() returns the one closest to the goal first.
+        """
+        return sorted((index + offset for offset in offsets[mask[index]]), key=get_h, reverse=True)
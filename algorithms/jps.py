@@ -0,0 +1,223 @@
+from array import array
+import heapq
+import time
+from maze_engine import UP, DOWN, LEFT, RIGHT, WALL
+from .base import InformedSearchAlgorithm
+
+# bytes.translate table turning cell values into b'1' (open) / b'0' (wall), for int(..., 2)
+_BIT_TABLE = bytes(ord('0') if value == WALL else ord('1') for value in range(256))
+
+
+class JumpPointSearch(InformedSearchAlgorithm):
+    """
+    Jump Point Search for the uniform-cost, 4-connected grid.
+        Horizontal runs are followed until a forced neighbor (an open cell above/below whose
+        predecessor is blocked) or the goal. Vertical runs also stop where a horizontal run
+        would find a jump point. Only these jump points are pushed on the A* open list; the
+        straight segments between them are expanded back into cells for the returned path.
+        Horizontal runs are resolved on per-row bitsets (walls and forced stops, see _JumpState)
+        instead of cell by cell, so the probes of the vertical runs cost a few integer
+        operations each and an open grid is crossed without scanning every row.
+        All per-search state lives in that object, so one instance can serve concurrent calls.
+    """
+
+    @property
+    def name(self):
+        return f"JPS ({self.heuristic_type})"
+
+    def solve(self, maze, start, goal):
+        self._require_in_memory(maze)
+        start_time = time.perf_counter()
+        expanded_nodes = 0
+        reexpansions = 0
+        tie_key = self._tie_key
+
+        if maze.separated(start, goal) or not self._in_bounds(maze, start, goal):
+            return self._no_path_metrics(expanded_nodes, start_time, [], reexpansions=reexpansions)
+
+        start_idx, goal_idx = maze.index(start), maze.index(goal)
+        get_h = self._get_index_h(maze, goal)
+        state = _JumpState(maze, goal_idx)
+
+        g_costs = array('i', [-1]) * maze.size
+        parents = array('i', [-1]) * maze.size
+        closed = bytearray(maze.size)
+        g_costs[start_idx] = 0
+        order = array('i', [start_idx])
+
+        # Priority Queue of (f, tie key, insertion counter, g, index)
+        counter = 0
+        open_list = [(get_h(start_idx), tie_key(0), counter, 0, start_idx)]
+        cols = maze.cols
+        on_expand, on_push = self._begin_search()
+
+        while open_list:
+            g, current = heapq.heappop(open_list)[3:]
+
+            # Lazy deletion: a cheaper entry for this jump point was pushed after this one
+            if g > g_costs[current]:
+                continue
+            if closed[current]:
+                reexpansions += 1
+            else:
+                closed[current] = 1
+                expanded_nodes += 1
+            if on_expand is not None:
+                on_expand(divmod(current, cols))
+
+            if current == goal_idx:
+                return self._path_metrics(
+                    self._expand_path(maze, parents, current), expanded_nodes, start_time, is_optimal=not maze.weighted,
+                    visited_list=self._visited_positions(maze, order),
+                    reexpansions=reexpansions, scanned_cells=state.scanned)
+
+            for jump_point, distance in state.successors(current, parents[current]):
+                new_g = g + distance
+                old_g = g_costs[jump_point]
+
+                if old_g == -1 or new_g < old_g:
+                    if old_g == -1:
+                        order.append(jump_point)
+                    g_costs[jump_point] = new_g
+                    parents[jump_point] = current
+                    counter += 1
+                    heapq.heappush(open_list, (new_g + get_h(jump_point), tie_key(new_g), counter, new_g, jump_point))
+                    if on_push is not None:
+                        on_push(divmod(jump_point, cols), len(open_list), old_g != -1)
+
+        return self._no_path_metrics(expanded_nodes, start_time, self._visited_positions(maze, order),
+                                     reexpansions=reexpansions, scanned_cells=state.scanned)
+
+    def _expand_path(self, maze, parents, goal_idx):
+        """
+        Turn the chain of jump points into a full cell-by-cell path.
+        """
+        jump_points = self._reconstruct_path(goal_idx, parents, maze)
+        path = [jump_points[0]]
+        for (x, y), (nx, ny) in zip(jump_points, jump_points[1:]):
+            dx, dy = (nx > x) - (nx < x), (ny > y) - (ny < y)
+            while (x, y) != (nx, ny):
+                x, y = x + dx, y + dy
+                path.append((x, y))
+        return path
+
+
+class _JumpState:
+    """
+    The state of one JPS search: the maze buffers, the goal, the scan counter and the rows
+    met so far as bitsets (bit y is column y), built on first use:
+        (walls, forced stops moving right, forced stops moving left).
+    A horizontal run is then answered with a few integer operations instead of a cell scan.
+    """
+
+    def __init__(self, maze, goal_idx):
+        self.maze = maze
+        self.mask = maze.neighbor_mask
+        self.cols = maze.cols
+        self.goal_idx = goal_idx
+        self.goal_x, self.goal_y = divmod(goal_idx, maze.cols)
+        self.scanned = 0
+        self.open_rows = {}
+        self.rows = {}
+
+    def open_bits(self, x):
+        bits = self.open_rows.get(x)
+        if bits is None:
+            if 0 <= x < self.maze.rows:
+                cols = self.cols
+                row = bytes(self.maze.cells[x * cols:(x + 1) * cols]).translate(_BIT_TABLE)
+                bits = int(row[::-1], 2)
+            else:
+                bits = 0
+            self.open_rows[x] = bits
+        return bits
+
+    def row(self, x):
+        known = self.rows.get(x)
+        if known is None:
+            here, above, below = self.open_bits(x), self.open_bits(x - 1), self.open_bits(x + 1)
+            # Forced neighbor: open above/below while the cell we came from is blocked there
+            forced_right = here & ((above & ~(above << 1)) | (below & ~(below << 1)))
+            forced_left = here & ((above & ~(above >> 1)) | (below & ~(below >> 1)))
+            known = (((1 << self.cols) - 1) ^ here, forced_right, forced_left)
+            self.rows[x] = known
+        return known
+
+    def successors(self, current, parent):
+        """
+        Jump from the current cell in every direction left after pruning.
+            Moving horizontally: keep going forward, and branch up and down.
+            Moving vertically: keep going forward, and branch left and right.
+            The start cell (no parent) jumps in all four directions.
+        Returns (jump point, distance) pairs.
+        """
+        cols = self.cols
+        # (index step, True for a horizontal run)
+        if parent == -1:
+            directions = ((-cols, False), (cols, False), (-1, True), (1, True))
+        elif current // cols == parent // cols:
+            directions = ((-cols, False), (cols, False), (1 if current > parent else -1, True))
+        else:
+            directions = ((-1, True), (1, True), (cols if current > parent else -cols, False))
+
+        successors = []
+        for step, horizontal in directions:
+            if horizontal:
+                jump_point = self.jump_horizontal(current, step)
+            else:
+                jump_point = self.jump_vertical(current, step)
+            if jump_point != -1:
+                # Jump points lie on a straight line from the current cell
+                successors.append((jump_point, abs(jump_point - current) // abs(step)))
+        return successors
+
+    def jump_horizontal(self, index, step):
+        """
+        Follow a row from index in the given direction (+1 right, -1 left).
+        Returns the first jump point, or -1 when the run hits a wall or the border.
+        """
+        x, y = divmod(index, self.cols)
+        walls, forced_right, forced_left = self.row(x)
+        goal_y = self.goal_y if x == self.goal_x else -1
+        if step > 0:
+            # First wall / forced stop after column y (the border counts as a wall at cols)
+            ahead = walls >> (y + 1)
+            end = y + (ahead & -ahead).bit_length() if ahead else self.cols
+            ahead = forced_right >> (y + 1)
+            jump = y + (ahead & -ahead).bit_length() if ahead else self.cols
+            if y < goal_y < jump:
+                jump = goal_y
+            if jump >= end:
+                return -1
+        else:
+            # Last wall / forced stop before column y (the border counts as a wall at -1)
+            below = (1 << y) - 1
+            end = (walls & below).bit_length() - 1
+            jump = (forced_left & below).bit_length() - 1
+            if jump < goal_y < y:
+                jump = goal_y
+            if jump <= end:
+                return -1
+        return x * self.cols + jump
+
+    def jump_vertical(self, index, step):
+        """
+        Follow a column from index in the given direction (+cols down, -cols up).
+        Returns the first jump point, or -1 when the run hits a wall or the border.
+        """
+        mask, goal_idx = self.mask, self.goal_idx
+        move = DOWN if step > 0 else UP
+        while mask[index] & move:
+            index += step
+            self.scanned += 1
+            if index == goal_idx:
+                return index
+            bits = mask[index]
+            behind = mask[index - step]
+            if (bits & LEFT and not behind & LEFT) or (bits & RIGHT and not behind & RIGHT):
+                return index
+            # A horizontal run starting here leads to a jump point
+            if ((bits & RIGHT and self.jump_horizontal(index, 1) != -1) or
+                    (bits & LEFT and self.jump_horizontal(index, -1) != -1)):
+                return index
+        return -1
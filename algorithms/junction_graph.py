@@ -0,0 +1,409 @@
+from array import array
+import heapq
+import time
+import weakref
+from maze_engine import WALL
+from .base import InformedSearchAlgorithm
+
+_OPEN_TABLE = bytes(0 if value == WALL else 1 for value in range(256))
+# Number of open neighbors of a cell, from its neighbor mask
+_DEGREE_TABLE = bytes(bin(mask).count("1") for mask in range(256))
+
+
+class JunctionGraph:
+    """
+    A maze compiled into a weighted graph of junctions and corridors, built once per maze version.
+        The nodes are the open cells with more or less than two open neighbors: junctions and
+        dead ends. The cells with exactly two are chained into corridors, the edges, whose
+        length is their number of steps and whose cells are stored in order so a path can be
+        expanded later. A loop without any junction gets one of its cells as a node.
+        Dead-end branches are then marked: cells with at most one open neighbor are peeled off
+        until none is left, and what remains is the "core", which holds every cell a shortest
+        path between two core cells can use. Each peeled node keeps the node one step closer to
+        the core (or to the last cell peeled from a region without a core, such as a perfect
+        maze) and its depth in that tree, so a query can open the branches holding its endpoints
+        and skip all the others.
+        Unit step costs, like BFS and A*. The compiled graph is only as small as the maze is
+        corridor-like: open rooms keep almost every cell as a node.
+    """
+
+    # One graph per maze, rebuilt when the maze version changes (see Maze.set_cells)
+    _graphs = weakref.WeakKeyDictionary()
+
+    def __init__(self, maze):
+        build_start = time.perf_counter()
+        self.version = maze.version
+        size = maze.size
+        offsets, mask = maze.neighbor_offsets, maze.neighbor_mask
+        is_open = bytes(maze.cells).translate(_OPEN_TABLE)
+        full_degree = bytes(mask).translate(_DEGREE_TABLE)
+
+        # node -> list of (other node, length, edge, position of the other node on the edge)
+        self.adjacency = {}
+        # Edges: end nodes, and their interior cells in edge_cells[edge_first[e]:edge_first[e + 1]]
+        self.edge_a = array('i')
+        self.edge_b = array('i')
+        self.edge_first = array('i', [0])
+        self.edge_cells = array('i')
+        # Edge holding each corridor cell (-1 = not a corridor cell) and its steps from edge_a
+        self.corridor_edge = array('i', [-1]) * size
+        self.corridor_pos = array('i', [0]) * size
+
+        nodes = [index for index in range(size) if is_open[index] and full_degree[index] != 2]
+        for node in nodes:
+            self.adjacency[node] = []
+        for node in nodes:
+            self._trace_edges(node, offsets, mask)
+        # Loops without a junction: promote one cell of each to a node
+        for index in range(size):
+            if is_open[index] and self.corridor_edge[index] == -1 and index not in self.adjacency:
+                self.adjacency[index] = []
+                self._trace_edges(index, offsets, mask)
+
+        # Peel the dead ends: alive[i] = 1 for the core cells. toward_cell[i] is the neighbor a
+        # peeled cell was still attached to (-1 = none), peeled_nodes the nodes in peeling order
+        alive = bytearray(is_open)
+        degree = bytearray(full_degree)
+        toward_cell = array('i', [-1]) * size
+        peeled_nodes = []
+        stack = [index for index in range(size) if alive[index] and degree[index] <= 1]
+        while stack:
+            current = stack.pop()
+            if not alive[current]:
+                continue
+            alive[current] = 0
+            if current in self.adjacency:
+                peeled_nodes.append(current)
+            for offset in offsets[mask[current]]:
+                neighbor = current + offset
+                if alive[neighbor]:
+                    toward_cell[current] = neighbor
+                    degree[neighbor] -= 1
+                    if degree[neighbor] == 1:
+                        stack.append(neighbor)
+        self.core = alive
+
+        # Peeled node -> next node towards the core (-1 = none) and number of peeled nodes above
+        # it. A node is peeled before the nodes above it, so the reverse order visits them first
+        self.toward = {}
+        self.depth = {}
+        for node in peeled_nodes:
+            cell = toward_cell[node]
+            if cell != -1 and cell not in self.adjacency:
+                edge = self.corridor_edge[cell]
+                cell = self.edge_b[edge] if self.edge_a[edge] == node else self.edge_a[edge]
+            self.toward[node] = cell
+        for node in reversed(peeled_nodes):
+            parent = self.toward[node]
+            self.depth[node] = self.depth[parent] + 1 if parent != -1 and not alive[parent] else 0
+
+        self.build_time = time.perf_counter() - build_start
+
+    @classmethod
+    def for_maze(cls, maze):
+        """
+        Return the graph compiled for the current version of a maze, compiling it if needed.
+        """
+        graph = cls._graphs.get(maze)
+        if graph is None or graph.version != maze.version:
+            graph = cls(maze)
+            cls._graphs[maze] = graph
+        return graph
+
+    @classmethod
+    def cached(cls, maze):
+        """
+        The graph of the current version of a maze if it was already compiled, else None.
+        """
+        graph = cls._graphs.get(maze)
+        return graph if graph is not None and graph.version == maze.version else None
+
+    @property
+    def node_count(self):
+        return len(self.adjacency)
+
+    @property
+    def edge_count(self):
+        return len(self.edge_a)
+
+    def _trace_edges(self, node, offsets, mask):
+        """
+        Follow every corridor leaving a node up to the node at its other end and record it as an
+        edge. Corridors already recorded from their other end are skipped.
+        """
+        corridor_edge, corridor_pos = self.corridor_edge, self.corridor_pos
+        adjacency = self.adjacency
+        for offset in offsets[mask[node]]:
+            current = node + offset
+            if current in adjacency:
+                # Two adjacent nodes: a corridor of length 1, recorded once
+                if node < current:
+                    self._add_edge(node, current, [])
+                continue
+            if corridor_edge[current] != -1:
+                continue
+
+            edge = len(self.edge_a)
+            interior = []
+            previous = node
+            while current not in adjacency:
+                corridor_edge[current] = edge
+                corridor_pos[current] = len(interior) + 1
+                interior.append(current)
+                for step in offsets[mask[current]]:
+                    following = current + step
+                    if following != previous:
+                        break
+                previous, current = current, following
+            self._add_edge(node, current, interior)
+
+    def _add_edge(self, a, b, interior):
+        edge = len(self.edge_a)
+        length = len(interior) + 1
+        self.edge_a.append(a)
+        self.edge_b.append(b)
+        self.edge_cells.extend(interior)
+        self.edge_first.append(len(self.edge_cells))
+        if a != b:
+            # A loop back to the same node never shortens a path
+            self.adjacency[a].append((b, length, edge, length))
+            self.adjacency[b].append((a, length, edge, 0))
+
+    def edge_length(self, edge):
+        return self.edge_first[edge + 1] - self.edge_first[edge] + 1
+
+    def edge_segment(self, edge, first, last):
+        """
+        Cells of an edge from position first to position last (both included, either order).
+        Position 0 is edge_a, edge_length(edge) is edge_b and 1..length-1 are the corridor cells.
+        """
+        length = self.edge_length(edge)
+        base = self.edge_first[edge] - 1
+        step = 1 if last >= first else -1
+        cells = []
+        for position in range(first, last + step, step):
+            if position == 0:
+                cells.append(self.edge_a[edge])
+            elif position == length:
+                cells.append(self.edge_b[edge])
+            else:
+                cells.append(self.edge_cells[base + position])
+        return cells
+
+    def open_branches(self, start_nodes, goal_nodes):
+        """
+        The peeled nodes a search between two sets of nodes may need: the branches from each of
+        them up to the core, walked deepest first. Once every branch has merged into one and no
+        node of either set is in the core, the route cannot go any higher and the walk stops.
+        Returns the set of peeled nodes to open (core nodes are always open).
+        """
+        core, toward, depth = self.core, self.toward, self.depth
+        marks = {}
+        heap = []
+        in_core = False
+        for side, nodes in ((1, start_nodes), (2, goal_nodes)):
+            for node in nodes:
+                if core[node]:
+                    in_core = True
+                    continue
+                if node not in marks:
+                    heapq.heappush(heap, (-depth[node], node))
+                marks[node] = marks.get(node, 0) | side
+        while heap:
+            _, node = heapq.heappop(heap)
+            sides = marks[node]
+            if not heap and sides == 3 and not in_core:
+                break
+            parent = toward[node]
+            if parent == -1 or core[parent]:
+                continue
+            if parent not in marks:
+                heapq.heappush(heap, (-depth[parent], parent))
+                marks[parent] = sides
+            else:
+                marks[parent] |= sides
+        return marks
+
+    def links(self, index, distance):
+        """
+        Ways from an open cell to the graph: (node, steps, edge, position of the cell, position of
+        the node) for the node itself or the two ends of its corridor. distance is added to steps.
+        """
+        if index in self.adjacency:
+            return [(index, distance, -1, 0, 0)]
+        edge = self.corridor_edge[index]
+        position = self.corridor_pos[index]
+        length = self.edge_length(edge)
+        return [(self.edge_a[edge], distance + position, edge, position, 0),
+                (self.edge_b[edge], distance + length - position, edge, position, length)]
+
+
+class JunctionGraphSearch(InformedSearchAlgorithm):
+    """
+    A* on the junction graph of the maze (see JunctionGraph) instead of the grid.
+        Start and goal are linked to the graph: a node is its own link, a corridor cell is
+        linked to both ends of its corridor (a start on a wall goes through its open neighbors).
+        The dead-end branches holding them are opened (JunctionGraph.open_branches) and every
+        other one is skipped, so A* runs over the core junctions plus those branches, with
+        corridor lengths as costs and the heuristic of the goal cell. Only the corridors of the
+        answer are expanded back into cells. The path is a shortest one.
+        The graph is compiled on the first query of a maze (reported in "build_time", 0 when it
+        was cached) and reused until the maze is edited.
+    """
+
+    @property
+    def name(self):
+        return f"Junction graph A* ({self.heuristic_type})"
+
+    def solve(self, maze, start, goal):
+        self._require_in_memory(maze)
+        empty = {"graph_nodes": 0, "graph_edges": 0, "graph_expanded": 0, "build_time": 0.0}
+        unreachable = self._unreachable_metrics(maze, start, goal)
+        if unreachable:
+            unreachable.update(empty)
+            return unreachable
+
+        start_time = time.perf_counter()
+        if not self._in_bounds(maze, start, goal):
+            return self._no_path_metrics(0, start_time, [], **empty)
+
+        graph = JunctionGraph.cached(maze)
+        build_time = 0.0
+        if graph is None:
+            graph = JunctionGraph.for_maze(maze)
+            build_time = graph.build_time
+        extra = {"graph_nodes": graph.node_count, "graph_edges": graph.edge_count, "graph_expanded": 0,
+                 "build_time": build_time}
+        start_idx, goal_idx = maze.index(start), maze.index(goal)
+        if start_idx == goal_idx:
+            return self._path_metrics([start], 1, start_time, True, [start], **extra)
+        if not maze.is_valid_move(goal):
+            return self._no_path_metrics(0, start_time, [], **extra)
+
+        on_expand, on_push = self._begin_search()
+        # Open cells the start steps from (its open neighbors when it is a wall), with their cost
+        if maze.is_valid_move(start):
+            start_cells = [(start_idx, 0)]
+        else:
+            start_cells = [(start_idx + offset, 1) for offset in maze.neighbor_offsets[maze.neighbor_mask[start_idx]]]
+        start_links = [link for cell, steps in start_cells for link in graph.links(cell, steps)]
+        goal_links = graph.links(goal_idx, 0)
+        opened = graph.open_branches([link[0] for link in start_links], [link[0] for link in goal_links])
+
+        # Best answer so far and how it was found: ("corridor", start cell) when the goal is that
+        # cell or lies on its corridor, or ("graph", last node) through the graph
+        best_cost, best = float("inf"), None
+        goal_edge = graph.corridor_edge[goal_idx]
+        for cell, steps in start_cells:
+            if cell == goal_idx:
+                cost = steps
+            elif goal_edge != -1 and graph.corridor_edge[cell] == goal_edge:
+                cost = steps + abs(graph.corridor_pos[cell] - graph.corridor_pos[goal_idx])
+            else:
+                continue
+            if cost < best_cost:
+                best_cost, best = cost, ("corridor", cell)
+
+        # Node -> (steps to the goal, edge, goal position, node position)
+        exits = {}
+        for node, steps, edge, cell_pos, node_pos in goal_links:
+            if node not in exits or steps < exits[node][0]:
+                exits[node] = (steps, edge, cell_pos, node_pos)
+
+        # A* over the nodes. parents[node] is (previous node, edge, node position on the edge), or
+        # (-1, start cell, edge, cell position, node position) for the nodes linked to the start
+        get_h = self._get_index_h(maze, goal)
+        tie_key = self._tie_key
+        cols = maze.cols
+        g_costs, parents = {}, {}
+        open_list = []
+        counter = 0
+        for cell, steps in start_cells:
+            for node, node_steps, edge, cell_pos, node_pos in graph.links(cell, steps):
+                if node not in g_costs or node_steps < g_costs[node]:
+                    g_costs[node] = node_steps
+                    parents[node] = (-1, cell, edge, cell_pos, node_pos)
+                    counter += 1
+                    heapq.heappush(open_list, (node_steps + get_h(node), tie_key(node_steps), counter,
+                                               node_steps, node))
+
+        adjacency, core = graph.adjacency, graph.core
+        order = array('i')
+        graph_expanded = 0
+        closed = set()
+        while open_list:
+            f, _, _, g, current = heapq.heappop(open_list)
+            if f >= best_cost:
+                break
+            if current in closed or g != g_costs[current]:
+                continue
+            closed.add(current)
+            graph_expanded += 1
+            order.append(current)
+            if on_expand is not None:
+                on_expand(divmod(current, cols))
+
+            if current in exits and g + exits[current][0] < best_cost:
+                best_cost, best = g + exits[current][0], ("graph", current)
+
+            for neighbor, length, edge, neighbor_pos in adjacency[current]:
+                # Dead-end branches are only entered when they hold the start or the goal
+                if not core[neighbor] and neighbor not in opened:
+                    continue
+                new_g = g + length
+                if neighbor in g_costs and new_g >= g_costs[neighbor]:
+                    continue
+                repush = neighbor in g_costs
+                g_costs[neighbor] = new_g
+                parents[neighbor] = (current, edge, neighbor_pos)
+                counter += 1
+                heapq.heappush(open_list, (new_g + get_h(neighbor), tie_key(new_g), counter, new_g, neighbor))
+                if on_push is not None:
+                    on_push(divmod(neighbor, cols), len(open_list), repush)
+
+        extra["graph_expanded"] = graph_expanded
+        visited = self._visited_positions(maze, order)
+        if best is None:
+            return self._no_path_metrics(graph_expanded, start_time, visited, **extra)
+
+        if best[0] == "corridor":
+            cell = best[1]
+            cells = [start_idx] if cell == start_idx else [start_idx, cell]
+            if cell != goal_idx:
+                self._extend(cells, graph.edge_segment(goal_edge, graph.corridor_pos[cell],
+                                                       graph.corridor_pos[goal_idx]))
+        else:
+            cells = self._expand(graph, start_idx, best[1], parents)
+            _, edge, cell_pos, node_pos = exits[best[1]]
+            if edge != -1:
+                self._extend(cells, graph.edge_segment(edge, node_pos, cell_pos))
+
+        path = [divmod(index, cols) for index in cells]
+        return self._path_metrics(path, graph_expanded, start_time, not maze.weighted, visited, **extra)
+
+    def _expand(self, graph, start_idx, node, parents):
+        """
+        Cells from the start to a node: the step out of a wall start, the corridor from the start
+        cell to the first node, then the corridor of every edge of the node chain.
+        """
+        chain = []
+        while True:
+            link = parents[node]
+            if link[0] == -1:
+                break
+            chain.append((link[0], link[1], link[2]))
+            node = link[0]
+        _, cell, edge, cell_pos, node_pos = parents[node]
+
+        cells = [start_idx] if cell == start_idx else [start_idx, cell]
+        if edge != -1:
+            self._extend(cells, graph.edge_segment(edge, cell_pos, node_pos))
+        for _, edge, node_pos in reversed(chain):
+            self._extend(cells, graph.edge_segment(edge, graph.edge_length(edge) - node_pos, node_pos))
+        return cells
+
+    def _extend(self, cells, segment):
+        """
+        Append a segment whose first cell is the last cell of the path.
+        """
+        cells.extend(segment[1:])
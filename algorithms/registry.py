@@ -0,0 +1,48 @@
+import importlib
+
+# Every algorithm of the package, by short key: (module, class name, constructor arguments).
+# Modules are only imported when an algorithm is created, so listing the keys is free.
+ALGORITHMS = {
+    "bfs": ("algorithms.bfs", "BFS", {}),
+    "dfs": ("algorithms.dfs", "DFS", {}),
+    "astar": ("algorithms.astar", "AStar", {"heuristic_type": "manhattan"}),
+    "astar-euclidean": ("algorithms.astar", "AStar", {"heuristic_type": "euclidean"}),
+    "greedy": ("algorithms.greedy", "Greedy", {"heuristic_type": "manhattan"}),
+    "greedy-euclidean": ("algorithms.greedy", "Greedy", {"heuristic_type": "euclidean"}),
+    "bidirectional-bfs": ("algorithms.bidirectional_bfs", "BidirectionalBFS", {}),
+    "bidirectional-astar": ("algorithms.bidirectional_astar", "BidirectionalAStar", {"heuristic_type": "manhattan"}),
+    "jps": ("algorithms.jps", "JumpPointSearch", {"heuristic_type": "manhattan"}),
+    "wavefront": ("algorithms.wavefront", "WavefrontBFS", {}),
+    "dstar-lite": ("algorithms.dstar_lite", "DStarLite", {"heuristic_type": "manhattan"}),
+    "hpa": ("algorithms.hpa", "HPAStar", {"cluster_size": 16}),
+    "dijkstra": ("algorithms.dijkstra", "Dijkstra", {"heuristic_type": None}),
+    "astar-dial": ("algorithms.dijkstra", "Dijkstra", {"heuristic_type": "manhattan"}),
+    "ida-star": ("algorithms.ida_star", "IDAStar", {"heuristic_type": "manhattan", "max_memory": 100000}),
+    "sma-star": ("algorithms.sma_star", "SMAStar", {"heuristic_type": "manhattan", "max_memory": 100000}),
+    "ara-star": ("algorithms.ara_star", "ARAStar", {"heuristic_type": "manhattan", "epsilon": 3.0}),
+    "junction": ("algorithms.junction_graph", "JunctionGraphSearch", {"heuristic_type": "manhattan"}),
+}
+
+
+def create_algorithm(key, **kwargs):
+    """
+    Instantiate an algorithm by key. Keyword arguments override the registered defaults.
+    """
+    if key not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{key}', expected one of {', '.join(ALGORITHMS)}")
+    module_name, class_name, defaults = ALGORITHMS[key]
+    cls = getattr(importlib.import_module(module_name), class_name)
+    return cls(**{**defaults, **kwargs})
+
+
+def parse_algorithm_keys(text):
+    """
+    Turn a comma separated list of keys (or "all") into a list of keys.
+    """
+    if text.strip().lower() == "all":
+        return list(ALGORITHMS)
+    keys = [key.strip().lower() for key in text.split(",") if key.strip()]
+    for key in keys:
+        if key not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm '{key}', expected one of {', '.join(ALGORITHMS)}")
+    return keys
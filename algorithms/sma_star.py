@@ -0,0 +1,290 @@
+import heapq
+import time
+from .base import InformedSearchAlgorithm
+from .visited import VisitedCells
+
+INF = float("inf")
+
+
+class SMANode:
+    """
+    Search tree node of SMA*.
+        remaining: neighbor cells not generated yet
+        children: {cell: SMANode} successors currently in memory
+        forgotten: {cell: f} successors that were dropped, with the f they had (their parent
+            regenerates the best one when it becomes the most promising action again)
+    """
+    __slots__ = ('index', 'g', 'f', 'parent', 'depth', 'remaining', 'children', 'forgotten', 'alive')
+
+    def __init__(self, index, g, f, parent, remaining):
+        self.index = index
+        self.g = g
+        self.f = f
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.remaining = remaining
+        self.children = {}
+        self.forgotten = {}
+        self.alive = True
+
+
+class SMAStar(InformedSearchAlgorithm):
+    """
+    Simplified Memory-bounded A*: A* that never holds more than max_memory nodes.
+        Successors are generated one at a time from the deepest, lowest-f node. When memory is
+        full, the shallowest, highest-f leaf is dropped and its parent remembers its f, so the
+        parent's f stays an accurate lower bound and the dropped branch is regenerated only if
+        it becomes the best option again. When all successors of a node are known its f is
+        backed up to the best of them (the cost of what was learned below it).
+        A new cell is skipped when a node of the same cell with a lower or equal g is in memory.
+        The path is optimal as long as the budget can hold it; with a budget smaller than the
+        path length no path is returned. A node (with its share of the queues) takes about 1 KB.
+    """
+
+    def __init__(self, heuristic_type="manhattan", kernel="index", tie_breaking="high_g", max_memory=100000):
+        """
+        max_memory: maximum number of search nodes kept in memory.
+        """
+        super().__init__(heuristic_type, kernel, tie_breaking)
+        if max_memory < 2:
+            raise ValueError("SMA* needs room for at least two nodes (max_memory >= 2)")
+        self.max_memory = max_memory
+
+    @property
+    def name(self):
+        return f"SMA* ({self.heuristic_type})"
+
+    def solve(self, maze, start, goal):
+        self._require_in_memory(maze)
+        unreachable = self._unreachable_metrics(maze, start, goal)
+        if unreachable:
+            unreachable.update(forgotten_nodes=0, regenerated_nodes=0, peak_nodes=0)
+            return unreachable
+
+        start_time = time.perf_counter()
+        # Without the whole search in memory, proving that the goal is unreachable could take
+        # exponentially long: the component labels answer it up front
+        if not self._in_bounds(maze, start, goal) or self._disconnected(maze, start, goal):
+            return self._no_path_metrics(0, start_time, [], forgotten_nodes=0, regenerated_nodes=0, peak_nodes=0)
+
+        start_idx, goal_idx = maze.index(start), maze.index(goal)
+        get_h = self._get_index_h(maze, goal)
+        # Everything the search changes lives in the tree, so one instance can run several
+        # searches at once
+        tree = _SMATree(maze, goal_idx, get_h)
+        root = SMANode(start_idx, 0, get_h(start_idx), None, tree.successors(start_idx, -1))
+        tree.in_memory[start_idx] = root
+        tree.used = 1
+        tree.push_open(root)
+        tree.push_leaf(root)
+
+        seen = bytearray(maze.size)
+        seen[start_idx] = 1
+        expanded_nodes = 0
+        regenerated = 0
+        peak = 1
+        cols = maze.cols
+        on_expand, on_push = self._begin_search()
+        goal_node = None
+
+        while True:
+            node = tree.pop_best()
+            if node is None:
+                break
+            if node.index == goal_idx:
+                goal_node = node
+                break
+            expanded_nodes += 1
+            if on_expand is not None:
+                on_expand(divmod(node.index, cols))
+
+            if node.remaining:
+                cell = node.remaining.pop()
+                regenerating = False
+            else:
+                cell = min(node.forgotten, key=node.forgotten.get)
+                del node.forgotten[cell]
+                regenerating = True
+
+            g = node.g + 1
+            existing = tree.in_memory.get(cell)
+            successors = tree.successors(cell, node.index)
+            if ((existing is not None and existing.g <= g) or (not successors and cell != goal_idx)
+                    or g >= maze.size):
+                # Reached more cheaply by a node in memory, a dead end, or longer than any path
+                # without loops: nothing to keep
+                tree.backup(node)
+                continue
+
+            if tree.used >= self.max_memory and not tree.drop_leaf(node):
+                # The budget cannot even hold the current path
+                break
+            child = SMANode(cell, g, max(node.f, g + get_h(cell)), node, successors)
+            node.children[cell] = child
+            tree.in_memory[cell] = child
+            tree.used += 1
+            peak = max(peak, tree.used)
+            if regenerating:
+                regenerated += 1
+            seen[cell] = 1
+            tree.push_open(child)
+            tree.push_leaf(child)
+            if on_push is not None:
+                on_push(divmod(cell, cols), tree.used, regenerating)
+            tree.backup(node)
+            if len(tree.open) + len(tree.leaves) > 3 * tree.used + 64:
+                tree.compact()
+
+        extra = {"forgotten_nodes": tree.forgotten, "regenerated_nodes": regenerated, "peak_nodes": peak}
+        visited_list = VisitedCells.from_bitmap(seen, maze.rows, maze.cols)
+        if goal_node is None:
+            return self._no_path_metrics(expanded_nodes, start_time, visited_list, **extra)
+
+        path = []
+        while goal_node is not None:
+            path.append(divmod(goal_node.index, cols))
+            goal_node = goal_node.parent
+        path.reverse()
+        return self._path_metrics(path, expanded_nodes, start_time, is_optimal=not maze.weighted, visited_list=visited_list,
+                                  **extra)
+
+
+class _SMATree:
+    """
+    The state of one SMA* search: the nodes in memory and the two queues over them.
+        open: heap of (action f, -depth, counter, node), the deepest node with the cheapest next
+            successor first
+        leaves: heap of (-f, depth, counter, node), the shallowest, highest-f leaf first
+        in_memory: node of every cell in memory with the lowest g (for the duplicate test)
+        Both heaps use lazy deletion (entries are checked when popped).
+    """
+
+    def __init__(self, maze, goal_idx, get_h):
+        self.offsets, self.mask = maze.neighbor_offsets, maze.neighbor_mask
+        self.goal_idx = goal_idx
+        self.get_h = get_h
+        self.open, self.leaves, self.counter = [], [], 0
+        self.in_memory = {}
+        self.used = 0
+        self.forgotten = 0
+
+    def successors(self, index, parent_index):
+        """
+        Neighbors of a cell except the one it came from, so that pop() returns the one closest
+        to the goal first.
+        """
+        cells = [index + offset for offset in self.offsets[self.mask[index]] if index + offset != parent_index]
+        cells.sort(key=self.get_h, reverse=True)
+        return cells
+
+    def action_f(self, node):
+        """
+        f of the next successor a node can generate (None when it has nothing left to generate).
+        """
+        if node.remaining or node.index == self.goal_idx:
+            return node.f
+        if node.forgotten:
+            return min(node.forgotten.values())
+        return None
+
+    def push_open(self, node):
+        f = self.action_f(node)
+        if f is not None:
+            self.counter += 1
+            heapq.heappush(self.open, (f, -node.depth, self.counter, node))
+
+    def push_leaf(self, node):
+        self.counter += 1
+        heapq.heappush(self.leaves, (-node.f, node.depth, self.counter, node))
+
+    def pop_best(self):
+        open_list = self.open
+        while open_list:
+            f, _, _, node = heapq.heappop(open_list)
+            if node.alive and f != INF and f == self.action_f(node):
+                return node
+        return None
+
+    def compact(self):
+        """
+        Rebuild both heaps from their live entries (one per node), so that outdated entries do
+        not grow them beyond a few times the number of nodes in memory.
+        """
+        live = {}
+        for entry in self.open:
+            node = entry[3]
+            if node.alive and entry[0] == self.action_f(node):
+                live[node] = entry
+        self.open = list(live.values())
+        heapq.heapify(self.open)
+        live = {}
+        for entry in self.leaves:
+            node = entry[3]
+            if node.alive and not node.children and -entry[0] == node.f:
+                live[node] = entry
+        self.leaves = list(live.values())
+        heapq.heapify(self.leaves)
+
+    def drop_leaf(self, keep):
+        """
+        Forget the shallowest, highest-f leaf (never the root or keep). Returns False if none.
+        """
+        leaves, skipped = self.leaves, []
+        dropped = False
+        while leaves:
+            entry = heapq.heappop(leaves)
+            leaf = entry[3]
+            if not leaf.alive or leaf.children or -entry[0] != leaf.f:
+                continue
+            if leaf is keep or leaf.parent is None:
+                skipped.append(entry)
+                continue
+            self.remove(leaf, remember=True)
+            dropped = True
+            break
+        for entry in skipped:
+            heapq.heappush(leaves, entry)
+        return dropped
+
+    def remove(self, node, remember):
+        node.alive = False
+        self.used -= 1
+        if self.in_memory.get(node.index) is node:
+            del self.in_memory[node.index]
+        parent = node.parent
+        del parent.children[node.index]
+        if remember:
+            parent.forgotten[node.index] = node.f
+            self.forgotten += 1
+        self.push_open(parent)
+        if not parent.children:
+            self.push_leaf(parent)
+
+    def backup(self, node):
+        """
+        Once every successor of a node is known, its f becomes the best f among them; the change
+        is propagated to the ancestors. A node with nothing left below it is removed.
+        """
+        while node is not None and not node.remaining and node.index != self.goal_idx:
+            values = [child.f for child in node.children.values()]
+            values.extend(node.forgotten.values())
+            if not values:
+                if node.parent is None:
+                    # The whole reachable tree is exhausted
+                    node.f = INF
+                    return
+                parent = node.parent
+                self.remove(node, remember=False)
+                node = parent
+                continue
+            best = min(values)
+            if best <= node.f:
+                self.push_open(node)
+                return
+            node.f = best
+            self.push_open(node)
+            if not node.children:
+                self.push_leaf(node)
+            node = node.parent
+        if node is not None:
+            self.push_open(node)
@@ -0,0 +1,96 @@
+from array import array
+from itertools import compress
+
+
+class VisitedCells:
+    """
+    Compact, read-only "visited_list" of the index kernels.
+        The expanded cells are kept as flat indices in an array('i') (4 bytes per cell) instead
+        of a list of (x, y) tuples, and are only decoded when somebody asks: iterating, indexing
+        and len() behave like the list the results used to carry, to_list() builds that list,
+        and mask() / bitmap() give the whole set at once for rendering and membership tests.
+    """
+
+    def __init__(self, order, rows, cols):
+        """
+        order: flat cell indices in expansion order (list, array or any iterable of ints)
+        """
+        self.rows = rows
+        self.cols = cols
+        self._order = order if isinstance(order, array) and order.typecode == 'i' else array('i', order)
+        self._bitmap = None
+
+    @classmethod
+    def from_positions(cls, positions, rows, cols):
+        return cls((x * cols + y for x, y in positions), rows, cols)
+
+    @classmethod
+    def from_bitmap(cls, bitmap, rows, cols):
+        """
+        The cells whose byte is non-zero in a rows * cols byte map, in index order.
+        """
+        return cls(compress(range(len(bitmap)), bitmap), rows, cols)
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self):
+        cols = self.cols
+        for index in self._order:
+            yield divmod(index, cols)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [divmod(index, self.cols) for index in self._order[item]]
+        return divmod(self._order[item], self.cols)
+
+    def __contains__(self, position):
+        x, y = position
+        if not (0 <= x < self.rows and 0 <= y < self.cols):
+            return False
+        return self.bitmap()[x * self.cols + y] == 1
+
+    def __eq__(self, other):
+        if isinstance(other, VisitedCells):
+            return self.cols == other.cols and self._order == other._order
+        if isinstance(other, (list, tuple)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"VisitedCells({len(self)} cells, {self.rows}x{self.cols})"
+
+    @property
+    def indices(self):
+        """
+        The flat cell indices, in expansion order (not a copy).
+        """
+        return self._order
+
+    def to_list(self):
+        """
+        Decode every cell into the [(x, y), ...] list of the other solvers.
+        """
+        cols = self.cols
+        return [divmod(index, cols) for index in self._order]
+
+    def bitmap(self):
+        """
+        bytearray of rows * cols bytes, 1 for the visited cells (built on first use).
+        """
+        if self._bitmap is None:
+            bitmap = bytearray(self.rows * self.cols)
+            for index in self._order:
+                bitmap[index] = 1
+            self._bitmap = bitmap
+        return self._bitmap
+
+    def mask(self):
+        """
+        (rows, cols) NumPy bool array, True for the visited cells.
+        """
+        import numpy as np
+
+        mask = np.zeros(self.rows * self.cols, dtype=bool)
+        mask[np.frombuffer(self._order, dtype=np.intc)] = True
+        return mask.reshape(self.rows, self.cols)
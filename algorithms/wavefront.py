@@ -0,0 +1,110 @@
+from array import array
+import time
+import numpy as np
+from maze_engine import UP, DOWN, LEFT, RIGHT
+from .base import UninformedSearchAlgorithm
+
+
+class WavefrontBFS(UninformedSearchAlgorithm):
+    """
+    Breadth-First Search expanded one whole level at a time with NumPy (distance transform).
+        The frontier is an array of cell indices. Each step reads the neighbor masks of the
+        whole frontier, shifts it in the four directions, drops walls and labeled cells, and
+        labels the new level in the distance map. The shortest path is then read back by
+        descending the distance map from the goal.
+    """
+
+    def __init__(self, stop_at_goal=True, kernel="index"):
+        """
+        stop_at_goal: stop after the level that reaches the goal. With False the whole region of
+            the start is labeled, which gives the full distance map (e.g. for a heatmap).
+        """
+        super().__init__(kernel)
+        self.stop_at_goal = stop_at_goal
+
+    @property
+    def name(self):
+        return "Wavefront BFS"
+
+    def solve(self, maze, start, goal):
+        self._require_in_memory(maze)
+        unreachable = self._unreachable_metrics(maze, start, goal)
+        if unreachable:
+            unreachable["distance_map"] = None
+            return unreachable
+
+        start_time = time.perf_counter()
+        if not self._in_bounds(maze, start, goal):
+            return self._no_path_metrics(0, start_time, [], distance_map=None)
+
+        distances = self.distance_map(maze, start, goal if self.stop_at_goal else None)
+        flat = distances.reshape(-1)
+        expanded_nodes = int(np.count_nonzero(flat >= 0))
+        labeled = array('i')
+        labeled.frombytes(np.flatnonzero(flat >= 0).astype(np.intc).tobytes())
+        visited_list = self._visited_positions(maze, labeled)
+
+        goal_idx = maze.index(goal)
+        if flat[goal_idx] == -1:
+            return self._no_path_metrics(expanded_nodes, start_time, visited_list, distance_map=distances)
+
+        path = self._descend(maze, flat, goal_idx, maze.index(start))
+        return self._path_metrics(path, expanded_nodes, start_time, is_optimal=not maze.weighted,
+                                  visited_list=visited_list, distance_map=distances)
+
+    def distance_map(self, maze, start, goal=None):
+        """
+        Return a (rows, cols) int32 array with the number of steps from start to every cell
+        (-1 for walls and unreachable cells). With a goal, labeling stops at the goal's level.
+        """
+        cols = maze.cols
+        mask = np.frombuffer(maze.neighbor_mask, dtype=np.uint8)
+        distances = np.full(maze.size, -1, dtype=np.int32)
+        # Scratch array used to drop duplicates from a new level in linear time
+        owner = np.empty(maze.size, dtype=np.int64)
+        moves = ((UP, -cols), (DOWN, cols), (LEFT, -1), (RIGHT, 1))
+
+        start_idx = maze.index(start)
+        goal_idx = maze.index(goal) if goal is not None else -1
+        distances[start_idx] = 0
+        frontier = np.array([start_idx], dtype=np.int64)
+        level = 0
+
+        while frontier.size:
+            if goal_idx != -1 and distances[goal_idx] != -1:
+                break
+
+            frontier_mask = mask[frontier]
+            candidates = np.concatenate([frontier[(frontier_mask & bit) != 0] + offset for bit, offset in moves])
+            candidates = candidates[distances[candidates] == -1]
+            # Keep the first occurrence of every cell
+            positions = np.arange(candidates.size)
+            owner[candidates] = positions
+            candidates = candidates[owner[candidates] == positions]
+
+            level += 1
+            distances[candidates] = level
+            frontier = candidates
+
+        return distances.reshape(maze.rows, cols)
+
+    def _descend(self, maze, flat, goal_idx, start_idx):
+        """
+        Walk from the goal to ever smaller distances until the start (distance 0) is reached.
+        """
+        offsets, mask = maze.neighbor_offsets, maze.neighbor_mask
+        current = goal_idx
+        path = [maze.position(current)]
+        while flat[current] != 0:
+            target = flat[current] - 1
+            if target == 0:
+                # The masks only list free neighbors, and the start itself may be a wall
+                current = start_idx
+                path.append(maze.position(current))
+                break
+            for offset in offsets[mask[current]]:
+                if flat[current + offset] == target:
+                    current += offset
+                    break
+            path.append(maze.position(current))
+        return path[::-1]
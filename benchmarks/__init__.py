@@ -0,0 +1,6 @@
+"""
+Headless scaling benchmarks for the search algorithms.
+
+    python -m benchmarks run --quick --output base.json
+    python -m benchmarks compare base.json new.json
+"""
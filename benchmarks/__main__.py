@@ -0,0 +1,78 @@
+"""
+Command line entry point of the benchmark suite (see benchmarks/__init__.py).
+"""
+import argparse
+import sys
+from algorithms.registry import parse_algorithm_keys
+from . import runner
+
+
+def parse_list(text, cast):
+    return [cast(value) for value in text.split(",") if value.strip()]
+
+
+def command_run(args):
+    sizes = parse_list(args.sizes, int) if args.sizes else (runner.QUICK_SIZES if args.quick else runner.DEFAULT_SIZES)
+    densities = parse_list(args.densities, float)
+
+    def progress(record):
+        print(f"{record['size']:>6} {record['density']:<5} {record['algorithm']:<30} "
+              f"expanded={record['expanded_nodes']:<10} depth={record['solution_depth']:<8} "
+              f"first={record['time_first'] * 1000:.2f} ms median={record['time_median'] * 1000:.2f} ms",
+              file=sys.stderr)
+
+    report = runner.run_suite(sizes=sizes, densities=densities, algorithms=parse_algorithm_keys(args.algos),
+                              repeats=args.repeats, warmup=args.warmup, seed=args.seed,
+                              track_memory=not args.no_memory, progress=progress)
+    runner.save_json(report, args.output)
+    if args.csv:
+        runner.save_csv(report, args.csv)
+    return 0
+
+
+def command_compare(args):
+    rows = runner.compare(runner.load_json(args.baseline), runner.load_json(args.current),
+                          args.threshold, args.min_time)
+    print(f"{'SIZE':>6} {'DENS.':<6} {'ALGORITHM':<22} {'OLD (ms)':>10} {'NEW (ms)':>10} {'RATIO':>7}  NOTES")
+    for row in rows:
+        flag = "!" if row["regression"] else " "
+        print(f"{row['size']:>6} {row['density']:<6} {row['key']:<22} {row['old_time'] * 1000:>10.2f} "
+              f"{row['new_time'] * 1000:>10.2f} {row['ratio']:>7.2f} {flag}{', '.join(row['notes'])}")
+
+    regressions = sum(row["regression"] for row in rows)
+    print(f"\n{len(rows)} cases compared, {regressions} regression(s)")
+    # Non-zero exit code so scripts and CI can fail on regressions
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmark suite")
+    run.add_argument("--sizes", help="comma separated maze sizes (default: 10 ... 4000)")
+    run.add_argument("--quick", action="store_true", help="only sizes up to 250")
+    run.add_argument("--densities", default="0.1,0.25", help="comma separated obstacle probabilities")
+    run.add_argument("--algos", default="all", help="comma separated algorithm keys, or 'all'")
+    run.add_argument("--repeats", type=int, default=3)
+    run.add_argument("--warmup", type=int, default=1)
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory run")
+    run.add_argument("--output", default="bench_results.json", help="JSON report file")
+    run.add_argument("--csv", help="also write the results as CSV")
+    run.set_defaults(handler=command_run)
+
+    diff = commands.add_parser("compare", help="compare two JSON reports and flag regressions")
+    diff.add_argument("baseline")
+    diff.add_argument("current")
+    diff.add_argument("--threshold", type=float, default=0.10, help="relative slowdown considered a regression")
+    diff.add_argument("--min-time", type=float, default=0.001,
+                      help="cases faster than this (seconds) are never flagged as slower")
+    diff.set_defaults(handler=command_compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
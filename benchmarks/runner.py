@@ -0,0 +1,177 @@
+import csv
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from maze_engine import Maze
+from algorithms.registry import ALGORITHMS, create_algorithm
+from utils import maze_generator
+
+DEFAULT_SIZES = (10, 50, 100, 250, 500, 1000, 2000, 4000)
+QUICK_SIZES = (10, 50, 100, 250)
+DEFAULT_DENSITIES = (0.1, 0.25)
+
+CSV_FIELDS = ("size", "density", "algorithm", "key", "found", "expanded_nodes", "solution_depth",
+              "time_first", "build_time", "time_min", "time_median", "time_mean", "nodes_per_sec",
+              "peak_memory")
+
+
+def build_case(size, density, seed):
+    """
+    Generate the seeded size x size maze of a benchmark case and pick its endpoints.
+    Start and goal are the first and last cells (row-major) of the largest connected region,
+    so every case has a long, solvable query. Returns (maze, start, goal).
+    """
+    maze = Maze.from_cells(maze_generator.noise_cells(size, size, density, seed), size, size)
+    labels, sizes = maze.build_components()
+    if not sizes:
+        # Only walls: nothing to search, every algorithm reports no path
+        return maze, (0, 0), (size - 1, size - 1)
+
+    largest = max(range(len(sizes)), key=sizes.__getitem__)
+    first = labels.index(largest)
+    last = next(i for i in range(maze.size - 1, -1, -1) if labels[i] == largest)
+    return maze, maze.position(first), maze.position(last)
+
+
+def measure(key, maze, start, goal, repeats=3, warmup=1, track_memory=True):
+    """
+    Time one algorithm (registry key) on one case. Every run uses a new instance, so no solver
+    carries a search tree or an abstraction over from the previous run.
+        time_first: the first query on a fresh copy of the maze, preprocessing included (the
+            HPA* clusters, the junction graph, ...); build_time is the part the solver reports
+            as preprocessing (None when it has none)
+        time_min/median/mean: the following queries once the per-maze caches exist, without the
+            preprocessing a solver reports in build_time
+    Warm-up runs are discarded; the peak memory is measured in a separate run under tracemalloc
+    so that tracing does not slow down the timed runs.
+    """
+    begin = time.perf_counter()
+    first = create_algorithm(key).solve(maze.copy(), start, goal)
+    time_first = time.perf_counter() - begin
+
+    for _ in range(warmup):
+        create_algorithm(key).solve(maze, start, goal)
+
+    times = []
+    result = None
+    for _ in range(repeats):
+        algorithm = create_algorithm(key)
+        begin = time.perf_counter()
+        result = algorithm.solve(maze, start, goal)
+        times.append(time.perf_counter() - begin - (result.get("build_time") or 0.0))
+
+    peak_memory = None
+    if track_memory:
+        algorithm = create_algorithm(key)
+        tracemalloc.start()
+        algorithm.solve(maze, start, goal)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    median = statistics.median(times)
+    return {
+        "algorithm": result["algorithm"],
+        "found": bool(result["path"]),
+        "expanded_nodes": result["expanded_nodes"],
+        "solution_depth": result["solution_depth"],
+        "time_first": time_first,
+        "build_time": first.get("build_time"),
+        "time_min": min(times),
+        "time_median": median,
+        "time_mean": statistics.mean(times),
+        "nodes_per_sec": result["expanded_nodes"] / median if median > 0 else None,
+        "peak_memory": peak_memory,
+    }
+
+
+def run_suite(sizes=DEFAULT_SIZES, densities=DEFAULT_DENSITIES, algorithms=None, repeats=3, warmup=1,
+              seed=42, track_memory=True, progress=None):
+    """
+    Run every algorithm (keys of the registry, default: all) on every (size, density) case.
+    Returns the report dictionary written by save_json.
+    """
+    keys = list(algorithms or ALGORITHMS)
+    records = []
+    for size in sizes:
+        for density in densities:
+            maze, start, goal = build_case(size, density, seed)
+            for key in keys:
+                record = {"size": size, "density": density, "key": key}
+                record.update(measure(key, maze, start, goal,
+                                      repeats=repeats, warmup=warmup, track_memory=track_memory))
+                records.append(record)
+                if progress:
+                    progress(record)
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "generator": "noise",
+            "repeats": repeats,
+            "warmup": warmup,
+        },
+        "results": records,
+    }
+
+
+def save_json(report, filename):
+    with open(filename, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_json(filename):
+    with open(filename) as f:
+        return json.load(f)
+
+
+def save_csv(report, filename):
+    with open(filename, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(report["results"])
+
+
+def compare(baseline, current, threshold=0.10, min_time=0.001):
+    """
+    Diff two reports case by case (cases missing from either report are skipped).
+    A case is a regression when its median time grows by more than `threshold` (relative),
+    when it stops finding a path, or when its solution gets longer. Slowdowns of cases faster
+    than `min_time` seconds are only noted, since they are mostly timer noise.
+    Returns one dictionary per case with the old/new median times, their ratio and notes.
+    """
+    old_records = {(r["size"], r["density"], r["key"]): r for r in baseline["results"]}
+    rows = []
+    for record in current["results"]:
+        case = (record["size"], record["density"], record["key"])
+        old = old_records.get(case)
+        if old is None:
+            continue
+
+        notes = []
+        regression = False
+        ratio = record["time_median"] / old["time_median"] if old["time_median"] > 0 else 1.0
+        if ratio > 1 + threshold:
+            notes.append("slower")
+            regression = record["time_median"] >= min_time
+        elif ratio < 1 - threshold:
+            notes.append("faster")
+        if record["found"] != old["found"]:
+            notes.append(f"found {old['found']} -> {record['found']}")
+            regression = regression or old["found"]
+        if record["solution_depth"] != old["solution_depth"]:
+            notes.append(f"depth {old['solution_depth']} -> {record['solution_depth']}")
+            regression = regression or (record["found"] and record["solution_depth"] > old["solution_depth"])
+        if record["expanded_nodes"] != old["expanded_nodes"]:
+            notes.append(f"expanded {old['expanded_nodes']} -> {record['expanded_nodes']}")
+
+        rows.append({
+            "size": case[0], "density": case[1], "key": case[2],
+            "old_time": old["time_median"], "new_time": record["time_median"], "ratio": ratio,
+            "regression": bool(regression), "notes": notes,
+        })
+    return rows
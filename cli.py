@@ -0,0 +1,319 @@
+"""
+Non-interactive command line of the maze solver (used by main.py when it gets arguments).
+
+    python main.py solve --maze inputs/complex.txt --start 0,0 --goal 8,9 --algos astar,bfs --json
+    python main.py solve --manifest jobs.jsonl --json
+    python main.py convert inputs/complex.txt complex.mzb --start 0,0 --goal 8,9
+    python main.py solve --maze huge.mzb --algos astar --tiled --tile-budget 256 --json
+    python main.py serve --socket /tmp/maze.sock --load complex=inputs/complex.txt
+    python main.py generate big.mzb --kind kruskal --rows 10001 --cols 10001 --seed 7
+    python main.py list
+
+A manifest holds one JSON job per line, e.g. {"maze": "inputs/complex.txt", "start": [0, 0],
+"goal": [8, 9], "algos": "astar,bfs"}; missing fields fall back to the command line options
+and "-" reads the manifest from stdin. Mazes can be text files or .mzb files (see
+utils.mzb_format); the start and goal stored in a .mzb file are used when a job has none.
+With --json every result is written as one JSON line as soon as it is ready. matplotlib and
+NumPy are only imported when --plot or --plot-dir is given (or when an algorithm needs NumPy);
+--plot-dir writes the plots as PNG files and never opens a window.
+"""
+import argparse
+import json
+import os
+import sys
+from algorithms.registry import ALGORITHMS, create_algorithm, parse_algorithm_keys
+from utils.analyzer import Analyzer
+from utils.input_handler import InputHandler
+
+# Result keys that are never written as JSON (large or not serializable)
+_SKIPPED_KEYS = {"path", "visited_list", "distance_map"}
+
+
+def parse_point(text):
+    """
+    Parse "x,y" (or a JSON [x, y] list) into a position tuple.
+    """
+    if isinstance(text, (list, tuple)):
+        x, y = text
+    elif isinstance(text, str):
+        x, y = text.split(",")
+    else:
+        raise ValueError(f"invalid position {text!r}, expected x,y")
+    return (int(x), int(y))
+
+
+def load_maze(filename, cache, tiled=False, tile_size=256, tile_budget=64 * 1024 * 1024):
+    """
+    Load a maze file once per run; later jobs on the same file reuse the Maze.
+    With tiled, a .mzb file is opened as an out-of-core TiledMaze (see utils.tiled_maze).
+    Returns (maze, start, goal) with the endpoints stored in the file (None for text files).
+    """
+    if filename not in cache:
+        if tiled:
+            from utils.tiled_maze import load_tiled
+            cache[filename] = load_tiled(filename, tile_size, tile_budget)
+        else:
+            cache[filename] = InputHandler.load_maze(filename)
+    return cache[filename]
+
+
+def iter_jobs(args):
+    """
+    Yield job dictionaries from the manifest (if any) or from the command line options.
+    A manifest line that is not a JSON object is yielded as a ValueError, so that only its job fails.
+    """
+    defaults = {"maze": args.maze, "start": args.start, "goal": args.goal, "algos": args.algos}
+    if not args.manifest:
+        yield defaults
+        return
+
+    manifest = sys.stdin if args.manifest == "-" else open(args.manifest)
+    try:
+        for line in manifest:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                try:
+                    job = json.loads(line)
+                except ValueError as error:
+                    yield ValueError(f"invalid manifest line: {error}")
+                    continue
+                if not isinstance(job, dict):
+                    yield ValueError("a manifest line must be a JSON object")
+                    continue
+                yield {**defaults, **job}
+    finally:
+        if manifest is not sys.stdin:
+            manifest.close()
+
+
+def result_to_json(job_id, job, key, res, include_visited=False):
+    """
+    Flatten a result dictionary into a JSON-friendly record.
+    """
+    record = {
+        "job": job_id,
+        "maze": job["maze"],
+        "start": list(job["start"]),
+        "goal": list(job["goal"]),
+        "key": key,
+        "found": bool(res["path"]),
+        "path": [list(position) for position in res["path"]],
+    }
+    for name, value in res.items():
+        if name not in _SKIPPED_KEYS and (value is None or isinstance(value, (bool, int, float, str))):
+            record[name] = value
+    # Instrumented results: one "<phase>_time" field per search phase
+    for phase, seconds in res.get("phase_times", {}).items():
+        record[f"{phase}_time"] = seconds
+    if include_visited:
+        record["visited"] = [list(position) for position in res["visited_list"]]
+    return record
+
+
+def run_job(job_id, job, args, cache, out, path_cache=None):
+    maze, stored_start, stored_goal = load_maze(job["maze"], cache, args.tiled, args.tile_size,
+                                                args.tile_budget * 1024 * 1024)
+    start = parse_point(job["start"]) if job.get("start") is not None else stored_start
+    goal = parse_point(job["goal"]) if job.get("goal") is not None else stored_goal
+    if start is None or goal is None:
+        raise ValueError("a job needs a start and a goal")
+    job = {**job, "start": start, "goal": goal}
+    for label, (x, y) in (("start", start), ("goal", goal)):
+        if not (0 <= x < maze.rows and 0 <= y < maze.cols):
+            raise ValueError(f"{label} {(x, y)} is out of bounds ({maze.rows}x{maze.cols})")
+        if not maze.is_valid_move((x, y)):
+            raise ValueError(f"{label} {(x, y)} is a wall")
+
+    if not isinstance(job["algos"], str):
+        raise ValueError(f"invalid algos {job['algos']!r}, expected comma separated keys")
+    keys = parse_algorithm_keys(job["algos"])
+    algorithms = [create_algorithm(key) for key in keys]
+    if args.tiled:
+        unsupported = [key for key, algo in zip(keys, algorithms) if not algo.out_of_core]
+        if unsupported:
+            raise ValueError(f"{', '.join(unsupported)} cannot run on a tiled maze (they need the in-memory Maze)")
+    analyzer = Analyzer(algorithms, maze, start, goal, cache=path_cache)
+    results = analyzer.run_tests(parallel=args.parallel, workers=args.workers, profile=args.profile)
+
+    tile_stats = maze.tile_stats() if args.tiled else None
+    if args.json:
+        for key, res in zip(keys, results):
+            out.write(json.dumps(result_to_json(job_id, job, key, res, args.visited)) + "\n")
+        if tile_stats:
+            out.write(json.dumps({"job": job_id, "tiles": tile_stats}) + "\n")
+        out.flush()
+    else:
+        print(f"Job {job_id}: {job['maze']} {start} -> {goal}", file=out)
+        analyzer.print_summary_table(out)
+        if tile_stats:
+            print(f"Tiles: {tile_stats['hits']} hits, {tile_stats['misses']} misses "
+                  f"({tile_stats['hit_rate']:.1%} hit rate), {tile_stats['evictions']} evictions, "
+                  f"{tile_stats['reads']} reads ({tile_stats['bytes_read']} bytes)", file=out)
+    if tile_stats:
+        maze.reset_stats()
+
+    if args.plot:
+        for res in results:
+            InputHandler.visualize_result(maze, res['path'], res['visited_list'], title=res['algorithm'])
+    if args.plot_dir:
+        # PNG artifacts instead of windows: job<id>_<key>.png per result and one comparison chart
+        for key, res in zip(keys, results):
+            InputHandler.visualize_result(maze, res['path'], res['visited_list'], title=res['algorithm'],
+                                          save_to=os.path.join(args.plot_dir, f"job{job_id}_{key}.png"))
+        analyzer.plot_comparison(save_to=os.path.join(args.plot_dir, f"job{job_id}_comparison.png"))
+
+
+def command_solve(args, out=sys.stdout):
+    cache = {}
+    path_cache = None
+    if args.plot_dir:
+        # Never open a window (works without a display)
+        import matplotlib
+        matplotlib.use("Agg")
+        os.makedirs(args.plot_dir, exist_ok=True)
+    if args.cache:
+        from utils.path_cache import PathCache
+        path_cache = PathCache(directory=args.cache)
+    failures = 0
+    for job_id, job in enumerate(iter_jobs(args)):
+        try:
+            if isinstance(job, ValueError):
+                raise job
+            if not job.get("maze") or not isinstance(job["maze"], str):
+                raise ValueError("a job needs a maze file name")
+            run_job(job_id, job, args, cache, out, path_cache)
+        except (OSError, ValueError, KeyError, IndexError, TypeError) as error:
+            failures += 1
+            if args.json:
+                out.write(json.dumps({"job": job_id, "error": str(error)}) + "\n")
+                out.flush()
+            else:
+                print(f"Job {job_id}: [Error] {error}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def command_convert(args, out=sys.stdout):
+    from utils import mzb_format
+
+    try:
+        if args.source.endswith(".mzb"):
+            mzb_format.mzb_to_text(args.source, args.target)
+            print(f"{args.source} -> {args.target}", file=out)
+        else:
+            start = parse_point(args.start) if args.start else None
+            goal = parse_point(args.goal) if args.goal else None
+            header = mzb_format.text_to_mzb(args.source, args.target, start, goal)
+            print(f"{args.source} -> {args.target} ({header.rows}x{header.cols})", file=out)
+    except (OSError, ValueError) as error:
+        print(f"[Error] {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def command_generate(args, out=sys.stdout):
+    from utils import maze_generator
+
+    try:
+        start = parse_point(args.start) if args.start else None
+        goal = parse_point(args.goal) if args.goal else None
+        cells, start, goal = maze_generator.generate_cells(
+            args.kind, args.rows, args.cols, args.density, args.seed, start, goal, connect=not args.no_connect)
+        maze_generator.write_maze(args.target, cells, args.rows, args.cols, start, goal)
+    except (OSError, ValueError) as error:
+        print(f"[Error] {error}", file=sys.stderr)
+        return 1
+    print(f"{args.kind} {args.rows}x{args.cols} -> {args.target} (start {start}, goal {goal})", file=out)
+    return 0
+
+
+def command_serve(args, out=sys.stdout):
+    import service
+
+    try:
+        preload = [entry.split("=", 1) for entry in args.load]
+        if any(len(pair) != 2 for pair in preload):
+            raise ValueError("--load expects ID=FILE")
+        address = args.socket or f"{args.host}:{args.port}"
+        service.serve(args.socket, args.host, args.port, args.workers, preload,
+                      ready=lambda server: print(f"Serving on {address}", file=sys.stderr, flush=True))
+    except (OSError, ValueError) as error:
+        print(f"[Error] {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def command_list(args, out=sys.stdout):
+    for key, (module, class_name, kwargs) in ALGORITHMS.items():
+        options = ", ".join(f"{name}={value!r}" for name, value in kwargs.items())
+        print(f"{key:<22} {class_name}({options})", file=out)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python main.py", description="Headless maze solver.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve = commands.add_parser("solve", help="solve one maze or a manifest of jobs")
+    solve.add_argument("--maze", help="maze text file (# = wall, . = path) or .mzb file")
+    solve.add_argument("--start", help="start position as x,y")
+    solve.add_argument("--goal", help="goal position as x,y")
+    solve.add_argument("--algos", default="astar", help="comma separated algorithm keys, or 'all' (see 'list')")
+    solve.add_argument("--manifest", help="JSON lines file of jobs ('-' for stdin)")
+    solve.add_argument("--json", action="store_true", help="stream one JSON line per result")
+    solve.add_argument("--visited", action="store_true", help="include the visited cells in the JSON output")
+    solve.add_argument("--parallel", action="store_true", help="run the algorithms of a job in a process pool")
+    solve.add_argument("--workers", type=int, help="number of worker processes (default: one per CPU)")
+    solve.add_argument("--profile", action="store_true",
+                       help="instrument the searches: phase times, peak open list, re-pushes, nodes/sec, peak memory")
+    solve.add_argument("--cache", metavar="DIR", help="reuse results stored in DIR by earlier runs (and add new ones)")
+    solve.add_argument("--plot", action="store_true", help="show the result plots (imports matplotlib)")
+    solve.add_argument("--plot-dir", metavar="DIR",
+                       help="write the result and comparison plots to DIR as PNG files, without opening windows")
+    solve.add_argument("--tiled", action="store_true",
+                       help="read .mzb mazes in tiles through an LRU cache instead of loading them (out-of-core)")
+    solve.add_argument("--tile-size", type=int, default=256, help="side of a tile in cells, a multiple of 8 (default 256)")
+    solve.add_argument("--tile-budget", type=int, default=64, metavar="MB",
+                       help="memory of the tile cache in MB (default 64)")
+    solve.set_defaults(handler=command_solve)
+
+    convert = commands.add_parser("convert", help="convert a text maze to .mzb, or a .mzb file back to text")
+    convert.add_argument("source", help="text maze or .mzb file")
+    convert.add_argument("target", help="output file")
+    convert.add_argument("--start", help="start position stored in the .mzb header, as x,y")
+    convert.add_argument("--goal", help="goal position stored in the .mzb header, as x,y")
+    convert.set_defaults(handler=command_convert)
+
+    generate = commands.add_parser("generate", help="generate a seeded random maze as a text or .mzb file")
+    generate.add_argument("target", help="output file (.mzb for the binary format, anything else for text)")
+    generate.add_argument("--kind", default="noise", choices=("noise", "backtracker", "kruskal", "wilson"),
+                          help="noise walls (default) or a perfect maze algorithm")
+    generate.add_argument("--rows", type=int, default=101, help="number of rows (default 101)")
+    generate.add_argument("--cols", type=int, default=101, help="number of columns (default 101)")
+    generate.add_argument("--density", type=float, default=0.25, help="wall probability of noise mazes (default 0.25)")
+    generate.add_argument("--seed", type=int, help="random seed (the same seed gives the same maze)")
+    generate.add_argument("--start", help="start position as x,y (default: a corner or the first room)")
+    generate.add_argument("--goal", help="goal position as x,y (default: the opposite corner or the last room)")
+    generate.add_argument("--no-connect", action="store_true", help="do not guarantee a path from start to goal")
+    generate.set_defaults(handler=command_generate)
+
+    serve = commands.add_parser("serve", help="run the JSON lines solver service (see service.py)")
+    serve.add_argument("--socket", help="listen on this Unix socket instead of TCP")
+    serve.add_argument("--host", default="127.0.0.1", help="TCP address (default 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="TCP port (default 8765)")
+    serve.add_argument("--workers", type=int, help="number of worker processes (default: one per CPU)")
+    serve.add_argument("--load", action="append", default=[], metavar="ID=FILE",
+                       help="register a maze file under ID at startup (repeatable)")
+    serve.set_defaults(handler=command_serve)
+
+    listing = commands.add_parser("list", help="list the algorithm keys")
+    listing.set_defaults(handler=command_list)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,14 @@
 import os
+import sys
 from maze_engine import Maze
-from algorithms.bfs import BFS
-from algorithms.dfs import DFS
-from algorithms.astar import AStar
-from algorithms.greedy import Greedy
 from algorithms.base import Colors
+from algorithms.registry import create_algorithm
 from utils.analyzer import Analyzer
 from utils.input_handler import InputHandler
+from utils.path_cache import PathCache
+
+# Results shared by every experiment of the session: re-running a maze answers from memory
+PATH_CACHE = PathCache()
 
 
 def select_algorithms():
@@ -22,30 +24,55 @@ def select_algorithms():
     print(f"{Colors.BOLD}4. A* (Euclidean){Colors.END}")
     print(f"{Colors.BOLD}5. Greedy (Manhattan){Colors.END}")
     print(f"{Colors.BOLD}6. Greedy (Euclidean){Colors.END}")
-    print(f"{Colors.BOLD}7. All algorithms{Colors.END}")
+    print(f"{Colors.BOLD}7. Bidirectional BFS{Colors.END}")
+    print(f"{Colors.BOLD}8. Bidirectional A* (Manhattan){Colors.END}")
+    print(f"{Colors.BOLD}9. Jump Point Search (Manhattan){Colors.END}")
+    print(f"{Colors.BOLD}10. Wavefront BFS (NumPy distance map){Colors.END}")
+    print(f"{Colors.BOLD}11. D* Lite (Manhattan, incremental replanning){Colors.END}")
+    print(f"{Colors.BOLD}12. HPA* (hierarchical, near-optimal){Colors.END}")
+    print(f"{Colors.BOLD}13. Dijkstra (terrain costs, bucket queue){Colors.END}")
+    print(f"{Colors.BOLD}14. A* (Manhattan, terrain costs, bucket queue){Colors.END}")
+    print(f"{Colors.BOLD}15. IDA* (Manhattan, memory-bounded){Colors.END}")
+    print(f"{Colors.BOLD}16. SMA* (Manhattan, at most 100000 nodes in memory){Colors.END}")
+    print(f"{Colors.BOLD}17. ARA* (Manhattan, anytime, epsilon 3 down to 1){Colors.END}")
+    print(f"{Colors.BOLD}18. Junction graph A* (Manhattan, corridors contracted){Colors.END}")
+    print(f"{Colors.BOLD}0. All algorithms{Colors.END}")
 
     choice = input(
         f"\n{Colors.BOLD}>> Enter the algorithms ids to compare (comma separated string, e.g. 1, 3, 5): {Colors.END}")
 
+    # Menu id -> algorithm key (see algorithms/registry.py)
     mapping = {
-        '1': BFS(),
-        '2': DFS(),
-        '3': AStar(heuristic_type="manhattan"),
-        '4': AStar(heuristic_type="euclidean"),
-        '5': Greedy(heuristic_type="manhattan"),
-        '6': Greedy(heuristic_type="euclidean")
+        '1': "bfs",
+        '2': "dfs",
+        '3': "astar",
+        '4': "astar-euclidean",
+        '5': "greedy",
+        '6': "greedy-euclidean",
+        '7': "bidirectional-bfs",
+        '8': "bidirectional-astar",
+        '9': "jps",
+        '10': "wavefront",
+        '11': "dstar-lite",
+        '12': "hpa",
+        '13': "dijkstra",
+        '14': "astar-dial",
+        '15': "ida-star",
+        '16': "sma-star",
+        '17': "ara-star",
+        '18': "junction"
     }
 
     selected = []
-    if choice.strip() == '7':
-        return list(mapping.values())
+    if choice.strip() == '0':
+        return [create_algorithm(key) for key in mapping.values()]
 
     for c in choice.split(','):
         c = c.strip()
         if c in mapping:
-            selected.append(mapping[c])
+            selected.append(create_algorithm(mapping[c]))
 
-    return selected if selected else list(mapping.values())
+    return selected if selected else [create_algorithm(key) for key in mapping.values()]
 
 
 def run_experiment(grid, start, goal):
@@ -64,7 +91,7 @@ def run_experiment(grid, start, goal):
     InputHandler.visualize_input(grid, start, goal)
 
     # 2. Run all algorithms and collect results
-    analyzer = Analyzer(algos, maze, start, goal)
+    analyzer = Analyzer(algos, maze, start, goal, cache=PATH_CACHE)
     results = analyzer.run_tests()
 
     if not results:
@@ -84,6 +111,10 @@ def run_experiment(grid, start, goal):
                 res['path'],
                 res['visited_list'],
                 title=title_with_time)
+            # Solvers that build a distance map (Wavefront BFS) also get a heatmap
+            if res.get('distance_map') is not None:
+                InputHandler.visualize_distance_map(
+                    res['distance_map'], res['path'], title=f"{res['algorithm']} | Distance Map")
 
         # 4. Plot comparison graph. The program is stopped until the last window is closed.
         analyzer.plot_comparison()
@@ -174,18 +205,31 @@ Help Tom reach Jerry before it's too late!{Colors.END}
                 r = int(input(f"{Colors.BOLD}>> Number of rows:{Colors.END} "))
                 c = int(
                     input(f"{Colors.BOLD}>> Number of columns:{Colors.END} "))
-                prob = float(
-                    input(f"{Colors.BOLD}>> Obstacle probability (e.g. 0.2 for 20%):{Colors.END} "))
+                kind = input(
+                    f"{Colors.BOLD}>> Generator (noise/backtracker/kruskal/wilson, default noise):{Colors.END} ").strip() or "noise"
+                prob = 0.25
+                if kind == "noise":
+                    prob = float(
+                        input(f"{Colors.BOLD}>> Obstacle probability (e.g. 0.2 for 20%):{Colors.END} "))
 
-                grid = InputHandler.generate_random_maze(r, c, prob)
+                grid = InputHandler.generate_random_maze(r, c, prob, kind=kind)
 
                 # Print the generated grid to help user choose positions
                 InputHandler.print_grid_to_terminal(grid)
 
-                # Get suggestions for start and goal positions
+                # Get suggestions for start and goal positions, with the size of the region
+                # each one belongs to (start and goal must share a region to be connected)
+                maze = Maze(grid)
                 suggestions = InputHandler.get_free_points(grid, count=8)
+                regions = ", ".join(
+                    f"{point} [region {maze.component_of(point)}: {maze.component_size(point)} cells]"
+                    for point in suggestions)
                 print(
-                    f"{Colors.CYAN}{Colors.BOLD}\nFree points suggestions:{Colors.END} {Colors.BLUE}{suggestions}{Colors.END}")
+                    f"{Colors.CYAN}{Colors.BOLD}\nFree points suggestions:{Colors.END} {Colors.BLUE}{regions}{Colors.END}")
+                if maze.component_sizes:
+                    print(
+                        f"{Colors.CYAN}{Colors.BOLD}Connected regions:{Colors.END} {Colors.BLUE}{len(maze.component_sizes)} "
+                        f"(largest: {max(maze.component_sizes)} cells){Colors.END}")
 
                 # Force start and goal to be paths in case of overlapping
                 print(
@@ -196,7 +240,7 @@ Help Tom reach Jerry before it's too late!{Colors.END}
                 run_experiment(grid, start, goal)
             except ValueError:
                 print(
-                    f"{Colors.BOLD}{Colors.RED}[Error]{Colors.END} Please enter valid integer values for dimensions and a float for probability.")
+                    f"{Colors.BOLD}{Colors.RED}[Error]{Colors.END} Please enter valid integer values for dimensions, a known generator and a float for probability.")
 
         elif choice == '4':
             print(f"{Colors.BOLD}{Colors.RED}Exit ...{Colors.END}")
@@ -206,4 +250,8 @@ Help Tom reach Jerry before it's too late!{Colors.END}
 
 
 if __name__ == "__main__":
+    # Any argument switches to the non-interactive command line (see cli.py)
+    if len(sys.argv) > 1:
+        import cli
+        sys.exit(cli.main(sys.argv[1:]))
     main()
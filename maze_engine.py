@@ -1,13 +1,156 @@
+from array import array
+import hashlib
+
+# Bit flags of the precomputed open-neighbor mask.
+# The order matches the one get_neighbors has always used: Up, Down, Left, Right.
+UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+# For every possible 4-bit mask, the (dx, dy) moves it allows (in Up, Down, Left, Right order).
+MASK_DIRECTIONS = tuple(
+    tuple(move for bit, move in enumerate(DIRECTIONS) if mask & (1 << bit))
+    for mask in range(16))
+
+# Cell values: 0 is a path of cost 1, 1 is a wall and 2-9 are terrain with that step cost
+# (carpet, stairs, doors, ...). Entering a cell costs STEP_COST[value].
+PATH, WALL = 0, 1
+STEP_COST = tuple(value if value > 1 else 1 for value in range(256))
+
+# bytes.translate table turning cell values into 1 (open) / 0 (wall)
+_OPEN_TABLE = bytes(0 if value == WALL else 1 for value in range(256))
+
+# bytes.translate table of the text format: '#' is a wall, the digits 2-9 are terrain costs and
+# anything else ('.', ' ', '0', ...) a path
+TEXT_TO_CELL = bytes(WALL if value == ord('#') else value - ord('0') if ord('2') <= value <= ord('9') else PATH
+                     for value in range(256))
+
+
+def text_cell(char):
+    """
+    Cell value of one character of the text format.
+    """
+    return TEXT_TO_CELL[ord(char)] if ord(char) < 256 else PATH
+
+
+def cell_text(value):
+    """
+    Character of one cell value in the text format.
+    """
+    return '.' if value == PATH else '#' if value == WALL else str(value)
+
+
 class Maze:
     def __init__(self, grid):
         """
         Grid: List[List[int]]
-            0 is path, 1 is wall
+            0 is path, 1 is wall, 2-9 is terrain with that step cost
+        The grid is copied once into a flat bytearray (row-major, cell index = x * cols + y)
+        and a 4-bit open-neighbor mask is precomputed for every cell.
         """
-        self.grid = grid
+        self._grid = None
         self.rows = len(grid)
         self.cols = len(grid[0])
 
+        cells = bytearray(self.rows * self.cols)
+        for x, row in enumerate(grid):
+            row = row[:self.cols]
+            base = x * self.cols
+            cells[base:base + len(row)] = bytes(row)
+            # Ragged (short) rows are padded with walls
+            cells[base + len(row):base + self.cols] = b'\x01' * (self.cols - len(row))
+        self._init_buffers(cells)
+
+    @classmethod
+    def from_cells(cls, cells, rows, cols):
+        """
+        Build a maze directly from a flat buffer of rows * cols cell values (row-major).
+        The nested `grid` view is only materialized if someone asks for it.
+        """
+        maze = cls.__new__(cls)
+        maze._grid = None
+        maze.rows = rows
+        maze.cols = cols
+        maze._init_buffers(cells)
+        return maze
+
+    def copy(self):
+        """
+        A new maze with the same cells and no cached state, except the component labels when
+        they are built (they are replaced, never modified, so both mazes can share them).
+        """
+        maze = Maze.from_cells(bytearray(bytes(self.cells)), self.rows, self.cols)
+        maze._components = self._components
+        return maze
+
+    def _init_buffers(self, cells):
+        self.cells = cells
+        # Connected-component labels, built on first use (see build_components)
+        self._components = None
+        # Bumped by every edit, so caches can tell whether they are still valid
+        self.version = 0
+        self._listeners = []
+        # Content fingerprint and the per-row hashes it is made of, built on first use
+        self._fingerprint = None
+        self._row_hashes = None
+        # Highest step cost of the maze, computed on first use (1 for unit-cost mazes)
+        self._max_cost = None
+        self.size = self.rows * self.cols
+        # Index deltas for Up, Down, Left, Right and, for each mask, the deltas it allows
+        offsets = (-self.cols, self.cols, -1, 1)
+        self.neighbor_offsets = tuple(
+            tuple(offset for bit, offset in enumerate(offsets) if mask & (1 << bit))
+            for mask in range(16))
+        self.neighbor_mask = self._build_neighbor_mask()
+
+    def _build_neighbor_mask(self):
+        """
+        Compute the open-neighbor mask of every cell, one row at a time.
+        Each row is turned into a big integer holding one 0/1 byte per cell, so the
+        Up/Down/Left/Right tests become a few bitwise operations on whole rows.
+        """
+        rows, cols = self.rows, self.cols
+        width = (1 << (8 * cols)) - 1
+        mask = bytearray(rows * cols)
+
+        def open_row(x):
+            return int.from_bytes(bytes(self.cells[x * cols:(x + 1) * cols]).translate(_OPEN_TABLE), 'big')
+
+        prev_row, row = 0, open_row(0) if rows else 0
+        for x in range(rows):
+            next_row = open_row(x + 1) if x + 1 < rows else 0
+            # In big-endian order the left neighbor sits one byte higher, the right one byte lower
+            left = row >> 8
+            right = (row << 8) & width
+            bits = prev_row | (next_row << 1) | (left << 2) | (right << 3)
+            mask[x * cols:(x + 1) * cols] = bits.to_bytes(cols, 'big')
+            prev_row, row = row, next_row
+        return mask
+
+    @property
+    def grid(self):
+        """
+        Read-only nested view of the cells (a tuple of row tuples), built on first access.
+            The flat `cells` buffer is the maze: assigning into the old nested list used to move
+            walls, but the solvers no longer read it, so the view is immutable and edits go
+            through set_wall / clear_wall / set_cells (which also refresh the masks and caches).
+        """
+        if self._grid is None:
+            cols = self.cols
+            self._grid = tuple(tuple(self.cells[x * cols:(x + 1) * cols]) for x in range(self.rows))
+        return self._grid
+
+    def index(self, position):
+        """
+        Convert an (x, y) position into its flat cell index.
+        """
+        return position[0] * self.cols + position[1]
+
+    def position(self, index):
+        """
+        Convert a flat cell index back into an (x, y) position.
+        """
+        return divmod(index, self.cols)
+
     def is_valid_move(self, position):
         """
         Check if a position is within matrix bounds and not a wall.
@@ -15,17 +158,246 @@ class Maze:
         x, y = position
         return (0 <= x < self.rows and
                 0 <= y < self.cols and
-                self.grid[x][y] == 0)
+                self.cells[x * self.cols + y] != WALL)
+
+    @property
+    def max_cost(self):
+        """
+        Highest cost of stepping into a cell (1 when the maze has no terrain).
+        """
+        if self._max_cost is None:
+            terrain = bytes(self.cells).translate(None, bytes((PATH, WALL)))
+            self._max_cost = max(terrain) if terrain else 1
+        return self._max_cost
+
+    @property
+    def weighted(self):
+        """
+        True when some cell costs more than one step.
+        """
+        return self.max_cost > 1
+
+    def step_cost(self, position):
+        """
+        Cost of stepping into a cell (1 for paths, the terrain value otherwise).
+        """
+        return STEP_COST[self.cells[self.index(position)]]
+
+    def path_cost(self, path):
+        """
+        Total cost of a path (the cost of every cell entered after the start).
+        """
+        return sum(self.step_cost(position) for position in path[1:])
 
     def get_neighbors(self, position):
         """
         Return a list of valid neighboring positions. (Up, Down, Left, Right)
         """
         x, y = position
-        neighbors = []
-        # Directions:   Up,      Down,   Left,    Right
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            new_pos = (x + dx, y + dy)
-            if self.is_valid_move(new_pos):
-                neighbors.append(new_pos)
-        return neighbors
+        if 0 <= x < self.rows and 0 <= y < self.cols:
+            moves = MASK_DIRECTIONS[self.neighbor_mask[x * self.cols + y]]
+            return [(x + dx, y + dy) for dx, dy in moves]
+
+        # Positions outside the grid have no precomputed mask
+        return [(x + dx, y + dy) for dx, dy in DIRECTIONS if self.is_valid_move((x + dx, y + dy))]
+
+    def get_neighbor_offsets(self, index):
+        """
+        Return the index deltas of the open neighbors of a cell (Up, Down, Left, Right).
+        The tuple is shared between cells, so the lookup does not allocate.
+        """
+        return self.neighbor_offsets[self.neighbor_mask[index]]
+
+    def set_wall(self, position):
+        """
+        Turn a cell into a wall. Returns True if the cell changed.
+        """
+        return bool(self.set_cells([(position, 1)]))
+
+    def clear_wall(self, position):
+        """
+        Turn a cell into a free path. Returns True if the cell changed.
+        """
+        return bool(self.set_cells([(position, 0)]))
+
+    def set_cells(self, changes):
+        """
+        Apply a batch of (position, value) edits (0 = path, 1 = wall, 2-9 = terrain cost).
+        Only the edited cells and the neighbor masks around them are updated; the component
+        labels are dropped and the listeners are notified once for the whole batch.
+        Returns the list of cell indices whose value actually changed.
+        """
+        changed = []
+        for position, value in changes:
+            x, y = position
+            if not (0 <= x < self.rows and 0 <= y < self.cols):
+                raise IndexError(f"Cell {position} is outside the {self.rows}x{self.cols} grid")
+            index = x * self.cols + y
+            if self.cells[index] == value:
+                continue
+            if not isinstance(self.cells, bytearray):
+                self._own_cells()
+            self.cells[index] = value
+            self._grid = None
+            changed.append(index)
+            # The cell's own mask does not depend on its value, only the masks pointing at it do
+            for dx, dy in DIRECTIONS:
+                if 0 <= x + dx < self.rows and 0 <= y + dy < self.cols:
+                    self._update_mask(x + dx, y + dy)
+
+        if changed:
+            self._components = None
+            self._max_cost = None
+            if self._fingerprint is not None:
+                for x in {index // self.cols for index in changed}:
+                    new_hash = self._row_hash(x)
+                    self._fingerprint ^= self._row_hashes[x] ^ new_hash
+                    self._row_hashes[x] = new_hash
+            self.version += 1
+            for callback in list(self._listeners):
+                callback(self, changed)
+        return changed
+
+    def _own_cells(self):
+        """
+        Replace a read-only cell buffer (the memory-mapped body of a .mzb file, see
+        mzb_format.PackedCells) with an in-memory copy before the first edit, and release it.
+        """
+        view = self.cells
+        self.cells = bytearray(bytes(view))
+        if hasattr(view, "close"):
+            view.close()
+
+    def close(self):
+        """
+        Release the file mapping of a maze loaded from a .mzb file (nothing to do otherwise).
+        The maze cannot be searched afterwards unless it was edited (its cells are then a copy).
+        """
+        if hasattr(self.cells, "close"):
+            self.cells.close()
+
+    def _update_mask(self, x, y):
+        """
+        Recompute the open-neighbor mask of one cell.
+        """
+        bits = 0
+        for bit, (dx, dy) in enumerate(DIRECTIONS):
+            if self.is_valid_move((x + dx, y + dy)):
+                bits |= 1 << bit
+        self.neighbor_mask[x * self.cols + y] = bits
+
+    def subscribe(self, callback):
+        """
+        Register callback(maze, changed_indices), called after every batch of edits.
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    @property
+    def fingerprint(self):
+        """
+        64-bit hash of the maze contents: equal grids get equal fingerprints, whatever edits
+        led to them. It is the XOR of one hash per row, so an edit only rehashes its own row.
+        """
+        if self._fingerprint is None:
+            self._row_hashes = [self._row_hash(x) for x in range(self.rows)]
+            fingerprint = int.from_bytes(
+                hashlib.blake2b(f"{self.rows}x{self.cols}".encode(), digest_size=8).digest(), 'big')
+            for row_hash in self._row_hashes:
+                fingerprint ^= row_hash
+            self._fingerprint = fingerprint
+        return self._fingerprint
+
+    def _row_hash(self, x):
+        cols = self.cols
+        # The row number is the salt, so identical rows at different heights do not cancel out
+        digest = hashlib.blake2b(bytes(self.cells[x * cols:(x + 1) * cols]), digest_size=8,
+                                 salt=x.to_bytes(16, 'little'))
+        return int.from_bytes(digest.digest(), 'big')
+
+    @property
+    def has_components(self):
+        """
+        True once the connected-component labels have been built.
+        """
+        return self._components is not None
+
+    def build_components(self):
+        """
+        Label every free cell with the id of its connected region (flood fill, linear time).
+        Walls get -1. The labels are built once and reused until the maze is edited.
+        Returns (labels, sizes): a flat array('i') of labels and the cell count of each region.
+        """
+        if self._components is not None:
+            return self._components
+
+        offsets, mask = self.neighbor_offsets, self.neighbor_mask
+        labels = array('i', [-1]) * self.size
+        sizes = []
+        # 1 marks a free cell that has no label yet; find() jumps straight to the next seed
+        unlabeled = bytearray(bytes(self.cells).translate(_OPEN_TABLE))
+
+        seed = unlabeled.find(1)
+        while seed != -1:
+            label = len(sizes)
+            labels[seed] = label
+            unlabeled[seed] = 0
+            stack = [seed]
+            count = 1
+            while stack:
+                current = stack.pop()
+                for offset in offsets[mask[current]]:
+                    neighbor = current + offset
+                    if unlabeled[neighbor]:
+                        unlabeled[neighbor] = 0
+                        labels[neighbor] = label
+                        stack.append(neighbor)
+                        count += 1
+            sizes.append(count)
+            seed = unlabeled.find(1, seed)
+
+        self._components = (labels, sizes)
+        return self._components
+
+    @property
+    def component_sizes(self):
+        """
+        Number of cells of every connected region, indexed by label.
+        """
+        return self.build_components()[1]
+
+    def component_of(self, position):
+        """
+        Return the region label of a position, or -1 for walls and positions outside the grid.
+        """
+        if not self.is_valid_move(position):
+            return -1
+        return self.build_components()[0][self.index(position)]
+
+    def component_size(self, position):
+        """
+        Return how many cells are reachable from a position (itself included), 0 for walls.
+        """
+        label = self.component_of(position)
+        return self.component_sizes[label] if label != -1 else 0
+
+    def connected(self, start, goal):
+        """
+        Check if there is a path between two positions (builds the labels on first use).
+        """
+        label = self.component_of(start)
+        return label != -1 and label == self.component_of(goal)
+
+    def separated(self, start, goal):
+        """
+        True only when both positions are free cells of different regions, i.e. no search can
+        connect them. Answers in O(1) once the labels exist and never builds them on its own.
+        """
+        if self._components is None or not (self.is_valid_move(start) and self.is_valid_move(goal)):
+            return False
+        labels = self._components[0]
+        return labels[self.index(start)] != labels[self.index(goal)]
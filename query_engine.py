@@ -0,0 +1,187 @@
+from array import array
+from collections import OrderedDict, deque
+import time
+import weakref
+
+
+class QueryEngine:
+    """
+    Answers many (start, goal) queries on the same maze.
+        Queries are grouped by goal. For every goal a single reverse BFS builds a distance field
+        (steps to the goal) and a next-step field (the neighbor one step closer to the goal).
+        Each query is then answered by following the next-step field from its start, so a batch
+        costs one BFS per distinct goal plus the length of the returned paths.
+    """
+
+    # One engine per maze, so the fields are shared by every caller of for_maze()
+    _engines = weakref.WeakKeyDictionary()
+
+    def __init__(self, maze, max_fields=8):
+        """
+        max_fields: how many goal fields are kept (least recently used ones are dropped).
+            Each field takes 8 bytes per cell.
+        """
+        self.maze = maze
+        self.max_fields = max_fields
+        self._fields = OrderedDict()
+        # Maze version the cached fields were built for (see Maze.set_cells)
+        self._version = maze.version
+
+    @classmethod
+    def for_maze(cls, maze):
+        """
+        Return the engine (and its cached fields) associated with a maze.
+        """
+        engine = cls._engines.get(maze)
+        if engine is None:
+            engine = cls(maze)
+            cls._engines[maze] = engine
+        return engine
+
+    def distance_field(self, goal):
+        """
+        Return (distances, next_steps, expanded) for a goal, building them on first use.
+            distances: array('i'), steps from each cell to the goal (-1 = goal not reachable)
+            next_steps: array('i'), index of the neighbor one step closer to the goal (-1 = none)
+            expanded: number of cells labeled by the BFS that built the field (0 when cached)
+        """
+        if self._version != self.maze.version:
+            # The maze was edited: every cached field may be wrong
+            self.clear()
+        field = self._fields.get(goal)
+        if field is not None:
+            self._fields.move_to_end(goal)
+            return field[0], field[1], 0
+
+        maze = self.maze
+        offsets, mask = maze.neighbor_offsets, maze.neighbor_mask
+        distances = array('i', [-1]) * maze.size
+        next_steps = array('i', [-1]) * maze.size
+        expanded = 0
+
+        if maze.is_valid_move(goal):
+            goal_idx = maze.index(goal)
+            distances[goal_idx] = 0
+            queue = deque([goal_idx])
+            while queue:
+                current = queue.popleft()
+                expanded += 1
+                next_dist = distances[current] + 1
+                for offset in offsets[mask[current]]:
+                    neighbor = current + offset
+                    if distances[neighbor] == -1:
+                        distances[neighbor] = next_dist
+                        next_steps[neighbor] = current
+                        queue.append(neighbor)
+
+        self._fields[goal] = (distances, next_steps)
+        if len(self._fields) > self.max_fields:
+            self._fields.popitem(last=False)
+        return distances, next_steps, expanded
+
+    def distance(self, start, goal):
+        """
+        Return the number of steps of the shortest path, or -1 if there is none.
+        """
+        distances, next_steps, _ = self.distance_field(goal)
+        if start == goal and self._in_bounds(start):
+            return 0
+        entry = self._entry(start, distances)
+        if entry is None:
+            return -1
+        # A start on a wall takes one step into the field first
+        return distances[entry] + (entry != self.maze.index(start))
+
+    def path(self, start, goal):
+        """
+        Return the shortest path from start to goal (list of positions), or [] if there is none.
+        """
+        distances, next_steps, _ = self.distance_field(goal)
+        return self._follow(start, goal, distances, next_steps)
+
+    def solve(self, start, goal):
+        """
+        Answer one query with the same result dictionary as the search algorithms.
+        """
+        return self.solve_many([(start, goal)])[0]
+
+    def solve_many(self, queries):
+        """
+        Answer a batch of (start, goal) queries. Results are returned in the order of the queries.
+        The field of each goal is built at most once; its cost is reported as expanded_nodes on the
+        first query that needed it.
+        """
+        results = [None] * len(queries)
+        by_goal = OrderedDict()
+        for i, (start, goal) in enumerate(queries):
+            by_goal.setdefault(goal, []).append(i)
+
+        for goal, indices in by_goal.items():
+            start_time = time.perf_counter()
+            distances, next_steps, expanded = self.distance_field(goal)
+            for i in indices:
+                path = self._follow(queries[i][0], goal, distances, next_steps)
+                results[i] = {
+                    "algorithm": "BFS (distance field)",
+                    "path": path,
+                    "expanded_nodes": expanded,
+                    "solution_depth": len(path) - 1 if path else 0,
+                    "execution_time": time.perf_counter() - start_time,
+                    "is_optimal": bool(path) and not self.maze.weighted,
+                    # The field covers the whole region, there is no per-query exploration
+                    "visited_list": [],
+                    "cached_field": expanded == 0
+                }
+                expanded = 0
+                start_time = time.perf_counter()
+        return results
+
+    def clear(self):
+        """
+        Drop every cached field.
+        """
+        self._fields.clear()
+        self._version = self.maze.version
+
+    def _in_bounds(self, position):
+        return 0 <= position[0] < self.maze.rows and 0 <= position[1] < self.maze.cols
+
+    def _entry(self, start, distances):
+        """
+        Return the cell the walk down the field starts from, or None if the goal is not reachable.
+        Like the search algorithms, a start on a wall may step into one of its free neighbors:
+        the closest one to the goal is used.
+        """
+        if not self._in_bounds(start):
+            return None
+        maze = self.maze
+        start_idx = maze.index(start)
+        if distances[start_idx] != -1:
+            return start_idx
+        if maze.is_valid_move(start):
+            return None
+        entry = None
+        for offset in maze.get_neighbor_offsets(start_idx):
+            neighbor = start_idx + offset
+            if distances[neighbor] != -1 and (entry is None or distances[neighbor] < distances[entry]):
+                entry = neighbor
+        return entry
+
+    def _follow(self, start, goal, distances, next_steps):
+        """
+        Walk the next-step field from start down to the goal (distance 0).
+        """
+        if start == goal:
+            # Already there, even on a wall (which has no field)
+            return [start] if self._in_bounds(start) else []
+        current = self._entry(start, distances)
+        if current is None:
+            return []
+        maze = self.maze
+        path = [start]
+        if current != maze.index(start):
+            path.append(maze.position(current))
+        while distances[current] != 0:
+            current = next_steps[current]
+            path.append(maze.position(current))
+        return path
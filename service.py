@@ -0,0 +1,379 @@
+"""
+Long-running solver service: mazes are loaded once into a registry and solved on request,
+so callers skip the interpreter start, the imports and the maze parsing on every query.
+
+    python main.py serve --socket /tmp/maze.sock --load complex=inputs/complex.txt
+    python main.py serve --port 8765 --workers 4
+
+The protocol is JSON lines over a Unix socket or localhost TCP: one request object per line,
+one response per request, with the request "id" echoed back (a connection may pipeline
+requests, and their responses come back in completion order).
+
+    {"id": 1, "op": "load", "maze": "complex", "path": "inputs/complex.txt"}
+    {"id": 2, "op": "load", "maze": "tiny", "rows": ["..#", "#..", "..."]}
+    {"id": 3, "op": "solve", "maze": "complex", "start": [0, 0], "goal": [8, 9], "algo": "astar"}
+    {"id": 4, "op": "unload", "maze": "tiny"}
+    {"op": "mazes"}, {"op": "algorithms"}, {"op": "stats"}, {"op": "ping"}
+
+Responses carry "ok": true and the fields of the operation, or "ok": false and an "error".
+A solve response is the JSON record of `python main.py solve --json` plus the latencies
+queue_time (waiting for a worker), solve_time (inside the worker) and total_time (from the
+request to the response), in seconds. Searches run in a process pool; every registered maze
+is published once in shared memory (utils.shared_maze), so a task only ships its endpoints
+and the algorithm settings and the workers attach to the cells without copying them.
+SolverClient is a small blocking client for scripts and tests.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import json
+import os
+import signal
+import socket
+import time
+from algorithms.registry import ALGORITHMS, create_algorithm
+from maze_engine import Maze, TEXT_TO_CELL
+from utils.input_handler import InputHandler
+from utils.shared_maze import SharedMaze, attach_maze, detach_stale
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Longest request line: inline mazes ("rows" / "grid") travel in a single line
+MAX_LINE = 1 << 26
+
+
+def _solve_task(descriptor, live, maze_id, key, algorithm, start, goal, include_visited):
+    """
+    Worker task: run one search on a shared maze and return (JSON record, start, end time).
+    Segments of mazes that were unloaded since (not in live) are detached first.
+    """
+    from cli import result_to_json
+
+    detach_stale(live)
+    started = time.time()
+    result = algorithm.solve(attach_maze(descriptor), start, goal)
+    job = {"maze": maze_id, "start": start, "goal": goal}
+    record = result_to_json(None, job, key, result, include_visited)
+    del record["job"]
+    return record, started, time.time()
+
+
+class SolverService:
+    """
+    The maze registry and the request handlers of the JSON lines protocol.
+        workers: size of the process pool (default: one per CPU)
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers
+        self.mazes = {}
+        self._pool = None
+        self._server = None
+        self.stats = {"requests": 0, "errors": 0, "solved": 0, "in_flight": 0}
+        self._started = time.time()
+
+    # --- Registry ---
+
+    def load(self, maze_id, path=None, rows=None, grid=None, start=None, goal=None):
+        """
+        Register a maze under maze_id (replacing any maze of that id), from a text / .mzb file,
+        from text rows ('#' wall, '.' path, 2-9 terrain) or from a nested 0/1 grid.
+        Returns the registry entry.
+        """
+        if path is not None:
+            maze, stored_start, stored_goal = InputHandler.load_maze(path)
+        elif rows is not None:
+            cols = len(rows[0]) if rows else 0
+            cells = bytearray()
+            for row in rows:
+                row = row.encode().translate(TEXT_TO_CELL)
+                cells += row[:cols] + b'\x01' * (cols - len(row))
+            maze, stored_start, stored_goal = Maze.from_cells(cells, len(rows), cols), None, None
+        elif grid is not None:
+            maze, stored_start, stored_goal = Maze(grid), None, None
+        else:
+            raise ValueError("load needs a path, rows or grid")
+        if not maze.size:
+            raise ValueError("the maze is empty")
+
+        entry = {
+            "maze": maze,
+            "shared": SharedMaze(maze),
+            "start": tuple(start) if start is not None else stored_start,
+            "goal": tuple(goal) if goal is not None else stored_goal,
+        }
+        self.unload(maze_id)
+        self.mazes[maze_id] = entry
+        return entry
+
+    def unload(self, maze_id):
+        """
+        Remove a maze from the registry and release its shared memory. Returns True if it existed.
+        """
+        entry = self.mazes.pop(maze_id, None)
+        if entry is None:
+            return False
+        entry["shared"].close()
+        return True
+
+    def _entry(self, maze_id):
+        if maze_id not in self.mazes:
+            raise ValueError(f"unknown maze {maze_id!r}")
+        return self.mazes[maze_id]
+
+    def describe(self, maze_id):
+        entry = self._entry(maze_id)
+        maze = entry["maze"]
+        return {"maze": maze_id, "rows": maze.rows, "cols": maze.cols,
+                "start": list(entry["start"]) if entry["start"] else None,
+                "goal": list(entry["goal"]) if entry["goal"] else None}
+
+    # --- Requests ---
+
+    async def handle_request(self, request):
+        """
+        Answer one decoded request (a dict); errors become {"ok": false, "error": ...}.
+        """
+        received = time.time()
+        self.stats["requests"] += 1
+        response = {"id": request.get("id")} if isinstance(request, dict) else {"id": None}
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("a request must be a JSON object")
+            op = request.get("op")
+            handler = getattr(self, f"_op_{op}", None) if isinstance(op, str) else None
+            if handler is None:
+                raise ValueError(f"unknown op {op!r}")
+            response.update(await handler(request, received))
+            response["ok"] = True
+        except (OSError, ValueError, KeyError, IndexError, TypeError) as error:
+            self.stats["errors"] += 1
+            response.update({"ok": False, "error": str(error)})
+        except Exception as error:
+            # Anything else (a solver bug, a crashed worker, RecursionError, MemoryError, ...)
+            # still gets an answer, or the client would wait for it forever
+            self.stats["errors"] += 1
+            response.update({"ok": False, "error": f"{type(error).__name__}: {error}"})
+            if isinstance(error, BrokenProcessPool) and self._pool is not None:
+                # The pool cannot run anything any more: start a new one on the next solve
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+        return response
+
+    async def _op_ping(self, request, received):
+        return {}
+
+    async def _op_algorithms(self, request, received):
+        return {"algorithms": list(ALGORITHMS)}
+
+    async def _op_mazes(self, request, received):
+        return {"mazes": [self.describe(maze_id) for maze_id in self.mazes]}
+
+    async def _op_stats(self, request, received):
+        return {**self.stats, "mazes": len(self.mazes), "uptime": time.time() - self._started}
+
+    async def _op_load(self, request, received):
+        maze_id = request.get("maze")
+        if not isinstance(maze_id, str) or not maze_id:
+            raise ValueError("load needs a maze id")
+        # Parsing a large file must not stall the other connections
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self.load(maze_id, request.get("path"), request.get("rows"), request.get("grid"),
+                                    request.get("start"), request.get("goal")))
+        return {**self.describe(maze_id), "load_time": time.time() - received}
+
+    async def _op_unload(self, request, received):
+        return {"maze": request.get("maze"), "unloaded": self.unload(request.get("maze"))}
+
+    async def _op_solve(self, request, received):
+        maze_id = request.get("maze")
+        entry = self._entry(maze_id)
+        maze = entry["maze"]
+        start = tuple(request["start"]) if request.get("start") is not None else entry["start"]
+        goal = tuple(request["goal"]) if request.get("goal") is not None else entry["goal"]
+        if start is None or goal is None:
+            raise ValueError("solve needs a start and a goal")
+        for label, (x, y) in (("start", start), ("goal", goal)):
+            if not (0 <= x < maze.rows and 0 <= y < maze.cols):
+                raise ValueError(f"{label} {(x, y)} is out of bounds ({maze.rows}x{maze.cols})")
+        key = request.get("algo", "astar")
+        algorithm = create_algorithm(key, **request.get("options", {}))
+
+        live = tuple(other["shared"].name for other in self.mazes.values())
+        self.stats["in_flight"] += 1
+        try:
+            record, started, finished = await asyncio.get_running_loop().run_in_executor(
+                self._get_pool(), _solve_task, entry["shared"].descriptor, live, maze_id, key,
+                algorithm, start, goal, bool(request.get("visited")))
+        finally:
+            self.stats["in_flight"] -= 1
+        self.stats["solved"] += 1
+        record.update(queue_time=max(started - received, 0.0), solve_time=finished - started,
+                      total_time=time.time() - received)
+        return record
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    # --- Transport ---
+
+    async def _serve_connection(self, reader, writer):
+        lock = asyncio.Lock()
+        pending = set()
+
+        async def respond(line):
+            try:
+                request = json.loads(line)
+            except (ValueError, RecursionError) as error:
+                self.stats["errors"] += 1
+                response = {"id": None, "ok": False, "error": f"invalid JSON: {error}"}
+            else:
+                response = await self.handle_request(request)
+            async with lock:
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.create_task(respond(line))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        except (ConnectionError, ValueError):
+            # ValueError: a line longer than MAX_LINE
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Start listening on a Unix socket (socket_path) or on host:port. Returns the server.
+        """
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self._server = await asyncio.start_unix_server(self._serve_connection, socket_path, limit=MAX_LINE)
+        else:
+            self._server = await asyncio.start_server(self._serve_connection, host, port, limit=MAX_LINE)
+        return self._server
+
+    async def serve_forever(self, socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        server = await self.start(socket_path, host, port)
+        try:
+            # SIGTERM stops the service like Ctrl+C, so the socket and shared memory are released
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except (NotImplementedError, RuntimeError):
+            # No signal handlers on Windows or outside the main thread
+            pass
+        if ready:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+            if socket_path and os.path.exists(socket_path):
+                os.remove(socket_path)
+
+    def close(self):
+        """
+        Stop the workers and release the shared memory of every registered maze.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        for maze_id in list(self.mazes):
+            self.unload(maze_id)
+
+
+class ServiceError(Exception):
+    """
+    Raised by SolverClient when the service answers a request with "ok": false.
+    """
+
+
+class SolverClient:
+    """
+    Blocking JSON lines client of a SolverService (one request at a time).
+        client = SolverClient(socket_path="/tmp/maze.sock")   # or SolverClient(port=8765)
+        client.load("complex", path="inputs/complex.txt")
+        result = client.solve("complex", (0, 0), (8, 9), algo="jps")
+    """
+
+    def __init__(self, socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=None):
+        if socket_path:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(timeout)
+            self._socket.connect(socket_path)
+        else:
+            self._socket = socket.create_connection((host, port), timeout=timeout)
+        self._file = self._socket.makefile("rwb")
+        self._next_id = 0
+
+    def request(self, op, **fields):
+        """
+        Send one request and return its response. Raises ServiceError when it failed.
+        """
+        self._next_id += 1
+        self._file.write((json.dumps({"id": self._next_id, "op": op, **fields}) + "\n").encode())
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("the service closed the connection")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise ServiceError(response.get("error"))
+        return response
+
+    def load(self, maze_id, path=None, rows=None, grid=None, start=None, goal=None):
+        fields = {"path": path, "rows": rows, "grid": grid, "start": start, "goal": goal}
+        return self.request("load", maze=maze_id, **{name: value for name, value in fields.items() if value is not None})
+
+    def unload(self, maze_id):
+        return self.request("unload", maze=maze_id)["unloaded"]
+
+    def solve(self, maze_id, start=None, goal=None, algo="astar", visited=False, **options):
+        fields = {"start": list(start) if start else None, "goal": list(goal) if goal else None}
+        return self.request("solve", maze=maze_id, algo=algo, visited=visited, options=options,
+                            **{name: value for name, value in fields.items() if value is not None})
+
+    def mazes(self):
+        return self.request("mazes")["mazes"]
+
+    def stats(self):
+        return self.request("stats")
+
+    def ping(self):
+        return self.request("ping")
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def serve(socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, preload=(), ready=None):
+    """
+    Run a SolverService until interrupted. preload: (maze id, file) pairs registered up front.
+    """
+    service = SolverService(workers)
+    try:
+        for maze_id, path in preload:
+            service.load(maze_id, path)
+        asyncio.run(service.serve_forever(socket_path, host, port, ready))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        service.close()
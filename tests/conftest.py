@@ -0,0 +1,30 @@
+import os
+import random
+import sys
+
+# Run from anywhere: the modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from maze_engine import Maze
+
+
+@pytest.fixture
+def rng():
+    return random.Random(1234)
+
+
+@pytest.fixture
+def small_maze():
+    """
+    A small winding maze with a few dead ends.
+    """
+    rows = ["..........",
+            ".########.",
+            "........#.",
+            "#######.#.",
+            "..........",
+            ".#########",
+            ".........."]
+    return Maze([[1 if char == "#" else 0 for char in row] for row in rows])
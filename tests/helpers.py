@@ -0,0 +1,34 @@
+"""
+Shared helpers of the test modules: random mazes and path checks.
+"""
+from maze_engine import Maze, WALL
+
+
+def random_grid(rng, rows, cols, density):
+    """
+    A nested 0/1 grid with roughly `density` walls.
+    """
+    return [[1 if rng.random() < density else 0 for _ in range(cols)] for _ in range(rows)]
+
+
+def random_case(rng, max_side=14, densities=(0.1, 0.25, 0.4)):
+    """
+    A random maze with open start and goal cells. Returns (maze, start, goal).
+    """
+    rows, cols = rng.randint(1, max_side), rng.randint(1, max_side)
+    grid = random_grid(rng, rows, cols, rng.choice(densities))
+    start = (rng.randrange(rows), rng.randrange(cols))
+    goal = (rng.randrange(rows), rng.randrange(cols))
+    grid[start[0]][start[1]] = grid[goal[0]][goal[1]] = 0
+    return Maze(grid), start, goal
+
+
+def assert_valid_path(maze, path, start, goal):
+    """
+    The path goes from start to goal in unit steps over open cells.
+    """
+    path = [tuple(position) for position in path]
+    assert path[0] == tuple(start) and path[-1] == tuple(goal)
+    for a, b in zip(path, path[1:]):
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+        assert maze.cells[maze.index(b)] != WALL
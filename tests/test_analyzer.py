@@ -0,0 +1,42 @@
+from algorithms.astar import AStar
+from algorithms.bfs import BFS
+from algorithms.dfs import DFS
+from algorithms.greedy import Greedy
+from maze_engine import Maze
+from utils.analyzer import Analyzer
+from helpers import random_grid
+
+
+def make_case(rng):
+    grid = random_grid(rng, 30, 30, 0.25)
+    grid[0][0] = grid[29][29] = 0
+    return Maze(grid), (0, 0), (29, 29)
+
+
+def summary(results):
+    return [(res["algorithm"], [tuple(p) for p in res["path"]], res["expanded_nodes"]) for res in results]
+
+
+def test_parallel_results_match_serial_in_order(rng):
+    maze, start, goal = make_case(rng)
+    algorithms = [BFS(), DFS(), AStar(), Greedy()]
+    serial = Analyzer(algorithms, maze, start, goal).run_tests()
+    parallel = Analyzer(algorithms, maze, start, goal).run_tests(parallel=True, workers=2)
+    assert summary(parallel) == summary(serial)
+
+
+def test_run_batch_keeps_job_and_algorithm_order(rng):
+    jobs = [make_case(rng) for _ in range(3)]
+    algorithms = [BFS(), AStar()]
+    batches = Analyzer.run_batch(algorithms, jobs, workers=2)
+    assert len(batches) == 3
+    for (maze, start, goal), results in zip(jobs, batches):
+        assert summary(results) == summary([algo.solve(maze, start, goal) for algo in algorithms])
+
+
+def test_optimality_gap_uses_the_optimal_reference():
+    maze = Maze([[0] * 8 for _ in range(8)])
+    results = Analyzer([BFS(), DFS()], maze, (0, 0), (7, 7)).run_tests()
+    bfs, dfs = results
+    assert bfs["optimality_gap"] == 0.0
+    assert dfs["optimality_gap"] == (dfs["solution_depth"] - 14) / 14
@@ -0,0 +1,60 @@
+import pytest
+
+from algorithms.ara_star import ARAStar
+from algorithms.dijkstra import Dijkstra
+from maze_engine import Maze
+from utils import maze_generator
+from helpers import assert_valid_path, random_grid
+
+
+def terrain_maze(rng, size):
+    grid = [[rng.choice((0, 0, 0, 1, 3, 7)) for _ in range(size)] for _ in range(size)]
+    grid[0][0] = grid[size - 1][size - 1] = 0
+    return Maze(grid)
+
+
+def test_unbounded_search_ends_optimal(rng):
+    for _ in range(60):
+        maze = terrain_maze(rng, rng.randint(2, 16))
+        goal = (maze.rows - 1, maze.cols - 1)
+        res = ARAStar(epsilon=3.0).solve(maze, (0, 0), goal)
+        ref = Dijkstra().solve(maze, (0, 0), goal)
+        assert bool(res["path"]) == bool(ref["path"])
+        if res["path"]:
+            assert_valid_path(maze, res["path"], (0, 0), goal)
+            assert res["path_cost"] == ref["path_cost"] == maze.path_cost(res["path"])
+            assert res["epsilon"] == 1.0 and res["is_optimal"] and not res["budget_exhausted"]
+
+
+def test_improvements_never_get_worse(rng):
+    grid = random_grid(rng, 60, 60, 0.3)
+    grid[0][0] = grid[59][59] = 0
+    maze = Maze(grid)
+    res = ARAStar(epsilon=5.0, epsilon_step=1.0).solve(maze, (0, 0), (59, 59))
+    bounds = [bound for bound, _, _ in res["improvements"]]
+    costs = [cost for _, cost, _ in res["improvements"]]
+    assert bounds == sorted(bounds, reverse=True) and costs == sorted(costs, reverse=True)
+
+
+def test_expansion_budget_returns_the_best_path_so_far():
+    maze, start, goal = maze_generator.generate("backtracker", 81, 81, seed=1)
+    full = ARAStar(epsilon=3.0).solve(maze, start, goal)
+    res = ARAStar(epsilon=3.0, max_expansions=full["expanded_nodes"] - 200).solve(maze, start, goal)
+    assert res["budget_exhausted"] and res["expanded_nodes"] <= full["expanded_nodes"] - 200
+    assert_valid_path(maze, res["path"], start, goal)
+    assert full["path_cost"] <= res["path_cost"] <= res["epsilon"] * full["path_cost"]
+    starved = ARAStar(epsilon=3.0, max_expansions=5).solve(maze, start, goal)
+    assert starved["path"] == [] and starved["budget_exhausted"]
+
+
+def test_time_budget_is_respected():
+    maze = Maze([[0] * 150 for _ in range(150)])
+    res = ARAStar(epsilon=1.0, time_budget=0.0).solve(maze, (0, 0), (149, 149))
+    assert res["budget_exhausted"]
+
+
+def test_bad_parameters():
+    with pytest.raises(ValueError):
+        ARAStar(epsilon=0.5)
+    with pytest.raises(ValueError):
+        ARAStar(epsilon_step=0)
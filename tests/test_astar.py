@@ -0,0 +1,45 @@
+import pytest
+
+from algorithms.astar import AStar
+from algorithms.base import TIE_BREAKING
+from algorithms.bfs import BFS
+from algorithms.greedy import Greedy
+from maze_engine import Maze
+from helpers import assert_valid_path, random_case
+
+
+@pytest.mark.parametrize("kernel", ["index", "node"])
+@pytest.mark.parametrize("tie_breaking", TIE_BREAKING)
+def test_astar_is_optimal_without_reexpansions(rng, kernel, tie_breaking):
+    for _ in range(100):
+        maze, start, goal = random_case(rng)
+        res = AStar(kernel=kernel, tie_breaking=tie_breaking).solve(maze, start, goal)
+        ref = BFS().solve(maze, start, goal)
+        assert res["solution_depth"] == ref["solution_depth"]
+        if res["path"]:
+            assert_valid_path(maze, res["path"], start, goal)
+        # Manhattan distance is consistent: stale heap entries are skipped, never re-expanded
+        assert res["reexpansions"] == 0
+        assert res["expanded_nodes"] <= sum(1 for cell in maze.cells if cell != 1)
+
+
+@pytest.mark.parametrize("cls", [AStar, Greedy])
+def test_searches_are_deterministic(rng, cls):
+    maze, start, goal = random_case(rng, max_side=20, densities=(0.2,))
+    first = cls().solve(maze, start, goal)
+    second = cls().solve(maze, start, goal)
+    assert first["path"] == second["path"]
+    assert first["expanded_nodes"] == second["expanded_nodes"]
+
+
+def test_high_g_expands_less_on_an_open_grid():
+    maze = Maze([[0] * 30 for _ in range(30)])
+    deep = AStar(tie_breaking="high_g").solve(maze, (0, 0), (29, 29))
+    fifo = AStar(tie_breaking="fifo").solve(maze, (0, 0), (29, 29))
+    assert deep["solution_depth"] == fifo["solution_depth"] == 58
+    assert deep["expanded_nodes"] < fifo["expanded_nodes"]
+
+
+def test_unknown_tie_breaking():
+    with pytest.raises(ValueError):
+        AStar(tie_breaking="random")
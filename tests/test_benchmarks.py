@@ -0,0 +1,46 @@
+import copy
+
+from benchmarks import runner
+from algorithms.registry import create_algorithm
+
+
+def test_every_run_uses_a_new_solver(monkeypatch):
+    created = []
+
+    def counting_create(key, **kwargs):
+        algorithm = create_algorithm(key, **kwargs)
+        created.append(algorithm)
+        return algorithm
+
+    monkeypatch.setattr(runner, "create_algorithm", counting_create)
+    maze, start, goal = runner.build_case(20, 0.1, 1)
+    record = runner.measure("hpa", maze, start, goal, repeats=3, warmup=1, track_memory=True)
+    # first query + warm-up + repeats + memory run
+    assert len(created) == 6 and len({id(algorithm) for algorithm in created}) == 6
+    assert record["found"] and record["build_time"] is not None
+    assert record["time_first"] > 0 and record["time_min"] <= record["time_median"]
+
+
+def test_suite_report_round_trip(tmp_path):
+    report = runner.run_suite(sizes=(10, 20), densities=(0.1,), algorithms=["bfs", "astar"],
+                              repeats=1, warmup=0, track_memory=False)
+    assert [(r["size"], r["key"]) for r in report["results"]] == \
+        [(10, "bfs"), (10, "astar"), (20, "bfs"), (20, "astar")]
+    runner.save_json(report, tmp_path / "report.json")
+    assert runner.load_json(tmp_path / "report.json") == report
+    runner.save_csv(report, tmp_path / "report.csv")
+    header = (tmp_path / "report.csv").read_text().splitlines()[0]
+    assert header == ",".join(runner.CSV_FIELDS)
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": [{"size": 10, "density": 0.1, "key": "bfs", "found": True,
+                             "solution_depth": 18, "expanded_nodes": 80, "time_median": 0.01}]}
+    current = copy.deepcopy(baseline)
+    assert not runner.compare(baseline, current)[0]["regression"]
+    current["results"][0]["time_median"] = 0.02
+    row = runner.compare(baseline, current)[0]
+    assert row["regression"] and "slower" in row["notes"]
+    current = copy.deepcopy(baseline)
+    current["results"][0]["solution_depth"] = 20
+    assert runner.compare(baseline, current)[0]["regression"]
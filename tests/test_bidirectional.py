@@ -0,0 +1,50 @@
+import pytest
+
+from algorithms.astar import AStar
+from algorithms.bfs import BFS
+from algorithms.bidirectional_astar import BidirectionalAStar
+from algorithms.bidirectional_bfs import BidirectionalBFS
+from maze_engine import Maze
+from helpers import assert_valid_path, random_case, random_grid
+
+SOLVERS = [BidirectionalBFS, BidirectionalAStar]
+
+
+@pytest.mark.parametrize("cls", SOLVERS)
+def test_shortest_paths_match_bfs(rng, cls):
+    for _ in range(300):
+        maze, start, goal = random_case(rng)
+        res = cls().solve(maze, start, goal)
+        ref = BFS().solve(maze, start, goal)
+        assert res["solution_depth"] == ref["solution_depth"]
+        assert bool(res["path"]) == bool(ref["path"])
+        if res["path"]:
+            assert_valid_path(maze, res["path"], start, goal)
+            assert res["is_optimal"]
+
+
+@pytest.mark.parametrize("cls", SOLVERS)
+def test_wall_goal_has_no_path(cls):
+    # The goal is a wall next to an open corridor: the backward search must not walk out of it
+    maze = Maze([[0, 0, 0],
+                 [1, 1, 0],
+                 [0, 1, 0]])
+    assert cls().solve(maze, (0, 0), (1, 1))["path"] == []
+    assert cls().solve(maze, (0, 0), (2, 0))["path"] == []
+
+
+@pytest.mark.parametrize("cls", SOLVERS)
+def test_start_equals_goal(cls):
+    maze = Maze([[0, 0], [0, 0]])
+    res = cls().solve(maze, (1, 1), (1, 1))
+    assert res["path"] == [(1, 1)] and res["solution_depth"] == 0
+
+
+def test_bidirectional_astar_work_is_close_to_astar(rng):
+    grid = random_grid(rng, 120, 120, 0.2)
+    grid[0][0] = grid[119][119] = 0
+    maze = Maze(grid)
+    forward = AStar().solve(maze, (0, 0), (119, 119))
+    both = BidirectionalAStar().solve(maze, (0, 0), (119, 119))
+    assert both["solution_depth"] == forward["solution_depth"]
+    assert both["expanded_nodes"] <= 1.2 * forward["expanded_nodes"]
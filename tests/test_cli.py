@@ -0,0 +1,72 @@
+import io
+import json
+import os
+import subprocess
+import sys
+
+import cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMPLEX = os.path.join(ROOT, "inputs", "complex.txt")
+
+
+def run(argv):
+    """
+    Run a command of the CLI, returning (exit status, output lines).
+    """
+    args = cli.build_parser().parse_args(argv)
+    out = io.StringIO()
+    status = args.handler(args, out=out)
+    return status, out.getvalue().splitlines()
+
+
+def test_solve_streams_one_json_line_per_result():
+    status, lines = run(["solve", "--maze", COMPLEX, "--start", "0,0", "--goal", "8,9",
+                         "--algos", "bfs,astar", "--json"])
+    records = [json.loads(line) for line in lines]
+    assert status == 0
+    assert [record["key"] for record in records] == ["bfs", "astar"]
+    assert all(record["found"] and record["path"][0] == [0, 0] for record in records)
+
+
+def test_text_mode_writes_everything_to_out(capsys):
+    status, lines = run(["solve", "--maze", COMPLEX, "--start", "0,0", "--goal", "8,9",
+                         "--algos", "bfs,astar", "--profile"])
+    text = "\n".join(lines)
+    assert status == 0 and lines[0].startswith("Job 0:")
+    assert "ALGORITHM" in text and "PEAK OPEN" in text and "BFS" in text
+    assert capsys.readouterr().out == ""
+
+
+def test_bad_jobs_fail_alone(tmp_path):
+    jobs = [
+        {"maze": COMPLEX, "start": [0, 0], "goal": [8, 9], "algos": "bfs"},
+        {"maze": COMPLEX, "start": [1, 1], "goal": [8, 9], "algos": "bfs"},
+        {"maze": COMPLEX, "start": [0, 0], "goal": [80, 9], "algos": "bfs"},
+        {"maze": 5, "start": [0, 0], "goal": [8, 9], "algos": "bfs"},
+        {"maze": COMPLEX, "start": 5, "goal": [8, 9], "algos": "bfs"},
+        {"maze": COMPLEX, "start": [0, 0], "goal": [8, 9], "algos": ["bfs"]},
+        {"maze": COMPLEX, "start": [0, 0], "goal": [8, 9], "algos": "nope"},
+    ]
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text("\n".join(json.dumps(job) for job in jobs) + "\nnot json\n[1, 2]\n"
+                        + json.dumps(jobs[0]) + "\n")
+    status, lines = run(["solve", "--manifest", str(manifest), "--json"])
+    records = [json.loads(line) for line in lines]
+    assert status == 1
+    assert [record["job"] for record in records if "error" not in record] == [0, 9]
+    errors = {record["job"]: record["error"] for record in records if "error" in record}
+    assert sorted(errors) == [1, 2, 3, 4, 5, 6, 7, 8]
+    assert "wall" in errors[1] and "out of bounds" in errors[2]
+
+
+def test_list_names_every_key():
+    status, lines = run(["list"])
+    assert status == 0 and [line.split()[0] for line in lines] == list(cli.ALGORITHMS)
+
+
+def test_solving_does_not_import_the_plotting_libraries():
+    code = ("import sys, cli; cli.main(['solve', '--maze', %r, '--start', '0,0', '--goal', '8,9', '--json']);"
+            "sys.exit('matplotlib' in sys.modules or 'numpy' in sys.modules)" % COMPLEX)
+    completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True)
+    assert completed.returncode == 0, completed.stderr
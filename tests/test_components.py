@@ -0,0 +1,50 @@
+import pytest
+
+from algorithms.registry import ALGORITHMS, create_algorithm
+from algorithms.bfs import BFS
+from maze_engine import Maze
+from helpers import random_case
+
+# Two rooms split by a wall column
+ROOMS = [[0, 0, 1, 0, 0],
+         [0, 0, 1, 0, 0],
+         [0, 0, 1, 0, 0]]
+
+
+def test_labels_and_sizes():
+    maze = Maze(ROOMS)
+    assert not maze.has_components
+    assert maze.component_size((0, 0)) == 6
+    assert maze.component_of((0, 2)) == -1 and maze.component_size((0, 2)) == 0
+    assert maze.connected((0, 0), (2, 1))
+    assert not maze.connected((0, 0), (0, 4))
+    assert maze.separated((0, 0), (0, 4))
+
+
+def test_labels_agree_with_bfs(rng):
+    for _ in range(100):
+        maze, start, goal = random_case(rng)
+        assert maze.connected(start, goal) == bool(BFS().solve(maze, start, goal)["path"])
+
+
+def test_separated_never_builds_the_labels():
+    maze = Maze(ROOMS)
+    assert not maze.separated((0, 0), (0, 4))
+    assert not maze.has_components
+
+
+@pytest.mark.parametrize("key", list(ALGORITHMS))
+def test_unreachable_goal_is_answered_without_searching(key):
+    maze = Maze(ROOMS)
+    maze.build_components()
+    res = create_algorithm(key).solve(maze, (0, 0), (2, 4))
+    assert res["path"] == [] and res["expanded_nodes"] == 0
+
+
+def test_edits_drop_the_labels():
+    maze = Maze(ROOMS)
+    assert not maze.connected((0, 0), (0, 4))
+    maze.clear_wall((1, 2))
+    assert not maze.has_components
+    assert maze.connected((0, 0), (0, 4))
+    assert BFS().solve(maze, (0, 0), (0, 4))["solution_depth"] == 6
@@ -0,0 +1,53 @@
+import pytest
+
+from maze_engine import Maze, WALL
+from utils import maze_generator, mzb_format
+
+PERFECT = ["backtracker", "kruskal", "wilson"]
+
+
+@pytest.mark.parametrize("kind", ["noise"] + PERFECT)
+def test_same_seed_same_maze(kind):
+    first = maze_generator.generate_cells(kind, 31, 41, 0.3, seed=7)
+    second = maze_generator.generate_cells(kind, 31, 41, 0.3, seed=7)
+    other = maze_generator.generate_cells(kind, 31, 41, 0.3, seed=8)
+    assert first == second and first[0] != other[0]
+
+
+@pytest.mark.parametrize("kind", ["noise"] + PERFECT)
+@pytest.mark.parametrize("size", [(3, 3), (4, 9), (20, 21), (33, 33)])
+def test_start_and_goal_are_connected(kind, size):
+    maze, start, goal = maze_generator.generate(kind, *size, density=0.45, seed=3)
+    assert maze.connected(start, goal)
+
+
+@pytest.mark.parametrize("kind", PERFECT)
+def test_perfect_mazes_are_trees(kind):
+    maze, _, _ = maze_generator.generate(kind, 41, 51, seed=5, connect=False)
+    free = [index for index in range(maze.size) if maze.cells[index] != WALL]
+    # One region, and exactly one route between any two cells: edges = cells - 1
+    assert len(maze.component_sizes) == 1
+    edges = sum(len(maze.get_neighbor_offsets(index)) for index in free) // 2
+    assert edges == len(free) - 1
+
+
+def test_written_mazes_load_back(tmp_path):
+    cells, start, goal = maze_generator.generate_cells("kruskal", 15, 17, seed=2)
+    maze_generator.write_maze(str(tmp_path / "maze.mzb"), cells, 15, 17, start, goal)
+    loaded, loaded_start, loaded_goal = mzb_format.load_mzb(str(tmp_path / "maze.mzb"))
+    assert bytes(loaded.cells) == bytes(cells) and (loaded_start, loaded_goal) == (start, goal)
+    loaded.close()
+    maze_generator.write_maze(str(tmp_path / "maze.txt"), cells, 15, 17)
+    lines = (tmp_path / "maze.txt").read_text().splitlines()
+    assert Maze([[1 if char == "#" else 0 for char in line] for line in lines]).cells == cells
+
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        maze_generator.generate_cells("spiral", 5, 5)
+    with pytest.raises(ValueError):
+        maze_generator.generate_cells("noise", 0, 5)
+    with pytest.raises(ValueError):
+        maze_generator.generate_cells("kruskal", 2, 9)
+    with pytest.raises(ValueError):
+        maze_generator.generate_cells("noise", 5, 5, start=(5, 0))
@@ -0,0 +1,37 @@
+import pytest
+
+from algorithms.bfs import BFS
+from algorithms.hpa import HPAStar
+from maze_engine import Maze
+from helpers import assert_valid_path, random_grid
+
+
+@pytest.mark.parametrize("cluster_size", [3, 4, 8])
+def test_finds_a_valid_path_whenever_bfs_does(rng, cluster_size):
+    for _ in range(40):
+        rows, cols = rng.randint(1, 24), rng.randint(1, 24)
+        grid = random_grid(rng, rows, cols, rng.choice((0.1, 0.3)))
+        start, goal = (rng.randrange(rows), rng.randrange(cols)), (rng.randrange(rows), rng.randrange(cols))
+        grid[start[0]][start[1]] = grid[goal[0]][goal[1]] = 0
+        maze = Maze(grid)
+        res = HPAStar(cluster_size).solve(maze, start, goal)
+        ref = BFS().solve(maze, start, goal)
+        assert bool(res["path"]) == bool(ref["path"])
+        if res["path"]:
+            assert_valid_path(maze, res["path"], start, goal)
+            assert res["solution_depth"] >= ref["solution_depth"]
+
+
+def test_abstraction_is_reused_and_refreshed_after_edits():
+    maze = Maze([[0] * 16 for _ in range(16)])
+    hpa = HPAStar(4)
+    hpa.solve(maze, (0, 0), (15, 15))
+    abstraction = hpa.abstraction
+    hpa.solve(maze, (15, 0), (0, 15))
+    assert hpa.abstraction is abstraction
+    # Wall off row 8 except one gap: the path must go through the gap
+    maze.set_cells([((8, y), 1) for y in range(16) if y != 13])
+    res = hpa.solve(maze, (0, 0), (15, 0))
+    assert_valid_path(maze, res["path"], (0, 0), (15, 0))
+    assert (8, 13) in [tuple(p) for p in res["path"]]
+    assert not res["is_optimal"]
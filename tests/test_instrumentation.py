@@ -0,0 +1,53 @@
+import pytest
+
+from algorithms.astar import AStar
+from algorithms.bfs import BFS
+from algorithms.registry import ALGORITHMS, create_algorithm
+from maze_engine import Maze
+
+PHASES = {"setup", "search", "reconstruction", "result"}
+
+
+def test_results_are_plain_by_default(small_maze):
+    res = AStar().solve(small_maze, (0, 0), (6, 9))
+    assert "phase_times" not in res and "peak_open_list" not in res
+
+
+@pytest.mark.parametrize("key", list(ALGORITHMS))
+def test_every_solver_reports_its_phases(small_maze, key):
+    res = create_algorithm(key).instrument().solve(small_maze, (0, 0), (6, 9))
+    assert set(res["phase_times"]) == PHASES
+    assert res["phase_times"]["search"] >= 0
+    assert "nodes_per_sec" in res and "peak_open_list" in res
+
+
+@pytest.mark.parametrize("cls", [BFS, AStar])
+@pytest.mark.parametrize("kernel", ["index", "node"])
+def test_hooks_see_every_expansion(small_maze, cls, kernel):
+    expanded, pushed = [], []
+    algorithm = cls(kernel=kernel).instrument(
+        enabled=False, on_expand=expanded.append,
+        on_push=lambda position, size, repush: pushed.append(position))
+    res = algorithm.solve(small_maze, (0, 0), (6, 9))
+    assert len(expanded) == res["expanded_nodes"]
+    assert expanded[0] == (0, 0) and expanded[-1] == (6, 9)
+    assert pushed
+
+
+@pytest.mark.parametrize("key", [key for key in ALGORITHMS if key != "wavefront"])
+def test_every_open_list_fires_the_hooks(small_maze, key):
+    expanded, pushed = [], []
+    algorithm = create_algorithm(key).instrument(
+        on_expand=expanded.append, on_push=lambda position, size, repush: pushed.append(size))
+    res = algorithm.solve(small_maze, (0, 0), (6, 9))
+    assert expanded and pushed
+    assert res["peak_open_list"] == max(pushed) and res["repushes"] is not None
+
+
+def test_profile_adds_peak_memory():
+    maze = Maze([[0] * 40 for _ in range(40)])
+    algorithm = AStar()
+    res = algorithm.profile(maze, (0, 0), (39, 39))
+    assert res["peak_memory"] > 0 and res["peak_open_list"] > 0
+    # profile() leaves the instrumentation as it was
+    assert not algorithm.instrumented
@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from algorithms.bfs import BFS
+from algorithms.jps import JumpPointSearch
+from maze_engine import Maze
+from helpers import assert_valid_path, random_case
+
+
+@pytest.mark.parametrize("options", [{}, {"heuristic_type": "euclidean"}, {"tie_breaking": "fifo"}])
+def test_paths_are_optimal_and_cell_by_cell(rng, options):
+    for _ in range(300):
+        maze, start, goal = random_case(rng, max_side=16)
+        res = JumpPointSearch(**options).solve(maze, start, goal)
+        ref = BFS().solve(maze, start, goal)
+        assert res["solution_depth"] == ref["solution_depth"]
+        if res["path"]:
+            assert_valid_path(maze, res["path"], start, goal)
+
+
+def test_open_grid_is_crossed_without_scanning_every_row():
+    maze = Maze([[0] * 300 for _ in range(300)])
+    res = JumpPointSearch().solve(maze, (0, 0), (299, 299))
+    assert res["solution_depth"] == 598
+    assert res["scanned_cells"] < 1000
+
+
+def test_one_instance_serves_concurrent_searches(rng):
+    cases = [random_case(rng, max_side=40, densities=(0.2,)) for _ in range(40)]
+    expected = [BFS().solve(*case)["solution_depth"] for case in cases]
+    jps = JumpPointSearch()
+    with ThreadPoolExecutor(8) as pool:
+        depths = list(pool.map(lambda case: jps.solve(*case)["solution_depth"], cases))
+    assert depths == expected
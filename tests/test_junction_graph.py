@@ -0,0 +1,65 @@
+import pytest
+
+from algorithms.bfs import BFS
+from algorithms.junction_graph import JunctionGraph, JunctionGraphSearch
+from maze_engine import Maze
+from utils import maze_generator
+from helpers import assert_valid_path, random_case
+
+
+def check_against_bfs(maze, start, goal):
+    res = JunctionGraphSearch().solve(maze, start, goal)
+    ref = BFS().solve(maze, start, goal)
+    assert res["solution_depth"] == ref["solution_depth"]
+    assert bool(res["path"]) == bool(ref["path"])
+    if res["path"]:
+        assert_valid_path(maze, res["path"], start, goal)
+    return res
+
+
+def test_random_mazes(rng):
+    for _ in range(400):
+        check_against_bfs(*random_case(rng, max_side=12, densities=(0.2, 0.35, 0.5)))
+
+
+@pytest.mark.parametrize("kind", ["backtracker", "kruskal", "wilson"])
+def test_perfect_and_braided_mazes(rng, kind):
+    maze, _, _ = maze_generator.generate(kind, 41, 41, seed=9)
+    cells = [maze.position(index) for index in range(maze.size) if maze.cells[index] != 1]
+    for _ in range(30):
+        check_against_bfs(maze, rng.choice(cells), rng.choice(cells))
+    # Knock out walls to create loops, then query again on the new version
+    maze.set_cells([((rng.randrange(1, 40), rng.randrange(1, 40)), 0) for _ in range(60)])
+    cells = [maze.position(index) for index in range(maze.size) if maze.cells[index] != 1]
+    for _ in range(30):
+        check_against_bfs(maze, rng.choice(cells), rng.choice(cells))
+
+
+def test_perfect_maze_queries_open_only_their_branches():
+    maze, _, _ = maze_generator.generate("backtracker", 201, 201, seed=2)
+    graph = JunctionGraph.for_maze(maze)
+    res = check_against_bfs(maze, (1, 1), (1, 5))
+    # A short query in a tree must not search the whole tree of junctions
+    assert res["graph_expanded"] < graph.node_count // 10
+
+
+def test_wall_start_and_endpoints_on_one_corridor():
+    maze = Maze([[0, 0, 0, 0, 0],
+                 [1, 1, 0, 1, 1],
+                 [0, 0, 0, 0, 0]])
+    check_against_bfs(maze, (0, 0), (0, 4))
+    check_against_bfs(maze, (0, 1), (0, 3))
+    check_against_bfs(maze, (1, 0), (2, 4))
+    check_against_bfs(maze, (2, 2), (2, 2))
+
+
+def test_graph_is_cached_per_maze_version():
+    maze = Maze([[0] * 6 for _ in range(6)])
+    assert JunctionGraph.cached(maze) is None
+    JunctionGraphSearch().solve(maze, (0, 0), (5, 5))
+    graph = JunctionGraph.cached(maze)
+    assert graph is not None and JunctionGraph.for_maze(maze) is graph
+    maze.set_cells([((x, 3), 1) for x in range(5)])
+    assert JunctionGraph.cached(maze) is None
+    assert check_against_bfs(maze, (0, 0), (0, 5))["solution_depth"] == 15
+    assert JunctionGraph.cached(maze) is not graph
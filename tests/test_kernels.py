@@ -0,0 +1,42 @@
+import pytest
+
+from algorithms.astar import AStar
+from algorithms.bfs import BFS
+from algorithms.dfs import DFS
+from algorithms.greedy import Greedy
+from helpers import assert_valid_path, random_case
+
+
+@pytest.mark.parametrize("cls", [BFS, DFS, AStar, Greedy])
+def test_index_and_node_kernels_agree(rng, cls):
+    for _ in range(150):
+        maze, start, goal = random_case(rng)
+        by_index = cls(kernel="index").solve(maze, start, goal)
+        by_node = cls(kernel="node").solve(maze, start, goal)
+        assert bool(by_index["path"]) == bool(by_node["path"])
+        for res in (by_index, by_node):
+            if res["path"]:
+                assert_valid_path(maze, res["path"], start, goal)
+                assert res["solution_depth"] == len(res["path"]) - 1
+        if cls in (BFS, AStar):
+            assert by_index["solution_depth"] == by_node["solution_depth"]
+
+
+def test_result_dictionary(small_maze):
+    res = BFS().solve(small_maze, (0, 0), (6, 9))
+    for key in ("algorithm", "path", "expanded_nodes", "solution_depth", "execution_time",
+                "is_optimal", "visited_list"):
+        assert key in res
+    assert res["is_optimal"] and res["solution_depth"] == len(res["path"]) - 1
+    assert (0, 0) in set(map(tuple, res["visited_list"]))
+
+
+def test_out_of_bounds_endpoints_fall_back_to_no_path(small_maze):
+    for cls in (BFS, DFS, AStar, Greedy):
+        res = cls().solve(small_maze, (0, 0), (50, 50))
+        assert res["path"] == []
+
+
+def test_unknown_kernel():
+    with pytest.raises(ValueError):
+        BFS(kernel="vector")
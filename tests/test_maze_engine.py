@@ -0,0 +1,73 @@
+import pytest
+
+from maze_engine import Maze, DIRECTIONS, UP, DOWN, LEFT, RIGHT
+from helpers import random_grid
+
+
+def brute_neighbors(grid, x, y):
+    rows, cols = len(grid), len(grid[0])
+    return [(x + dx, y + dy) for dx, dy in DIRECTIONS
+            if 0 <= x + dx < rows and 0 <= y + dy < cols and grid[x + dx][y + dy] != 1]
+
+
+def test_neighbor_masks_match_the_grid(rng):
+    for _ in range(50):
+        rows, cols = rng.randint(1, 12), rng.randint(1, 12)
+        grid = random_grid(rng, rows, cols, 0.35)
+        maze = Maze(grid)
+        for x in range(rows):
+            for y in range(cols):
+                assert maze.get_neighbors((x, y)) == brute_neighbors(grid, x, y)
+                index = maze.index((x, y))
+                assert [index + offset for offset in maze.get_neighbor_offsets(index)] == \
+                    [maze.index(position) for position in brute_neighbors(grid, x, y)]
+
+
+def test_mask_bits():
+    maze = Maze([[0, 0, 0],
+                 [0, 0, 1],
+                 [0, 0, 0]])
+    assert maze.neighbor_mask[maze.index((1, 1))] == UP | DOWN | LEFT
+    assert maze.neighbor_mask[maze.index((0, 0))] == DOWN | RIGHT
+
+
+def test_edits_keep_the_masks_in_sync(rng):
+    grid = random_grid(rng, 10, 10, 0.3)
+    maze = Maze(grid)
+    for _ in range(200):
+        x, y, value = rng.randrange(10), rng.randrange(10), rng.choice((0, 1))
+        maze.set_cells([((x, y), value)])
+        grid[x][y] = value
+    assert maze.neighbor_mask == Maze(grid).neighbor_mask
+
+
+def test_ragged_rows_are_padded_with_walls():
+    maze = Maze([[0, 0, 0], [0]])
+    assert (maze.rows, maze.cols) == (2, 3)
+    assert not maze.is_valid_move((1, 1)) and not maze.is_valid_move((1, 2))
+
+
+def test_from_cells_and_copy():
+    grid = [[0, 1, 0], [0, 0, 0]]
+    maze = Maze.from_cells(bytearray(b"\x00\x01\x00\x00\x00\x00"), 2, 3)
+    assert maze.neighbor_mask == Maze(grid).neighbor_mask
+    clone = maze.copy()
+    clone.set_wall((1, 1))
+    assert maze.is_valid_move((1, 1)) and not clone.is_valid_move((1, 1))
+
+
+def test_grid_is_a_read_only_view():
+    grid = [[0, 1], [0, 0]]
+    maze = Maze(grid)
+    assert maze.grid == ((0, 1), (0, 0))
+    with pytest.raises(TypeError):
+        maze.grid[1][1] = 1
+    maze.set_wall((1, 1))
+    assert maze.grid == ((0, 1), (0, 1))
+    # The caller's list is not touched by edits
+    assert grid == [[0, 1], [0, 0]]
+
+
+def test_out_of_bounds_edit():
+    with pytest.raises(IndexError):
+        Maze([[0]]).set_wall((1, 0))
@@ -0,0 +1,74 @@
+import pytest
+
+from algorithms.bfs import BFS
+from algorithms.ida_star import IDAStar
+from algorithms.registry import create_algorithm
+from algorithms.sma_star import SMAStar
+from maze_engine import Maze
+from helpers import assert_valid_path, random_case
+
+
+@pytest.mark.parametrize("max_memory", [None, 7, 100000])
+def test_ida_star_is_optimal_with_any_table(rng, max_memory):
+    for _ in range(150):
+        maze, start, goal = random_case(rng, max_side=10)
+        res = IDAStar(max_memory=max_memory).solve(maze, start, goal)
+        ref = BFS().solve(maze, start, goal)
+        assert res["solution_depth"] == ref["solution_depth"]
+        if res["path"]:
+            assert_valid_path(maze, res["path"], start, goal)
+
+
+def test_small_tables_forget_cells():
+    maze = Maze([[0] * 12 for _ in range(12)])
+    full = IDAStar().solve(maze, (0, 0), (11, 11))
+    tiny = IDAStar(max_memory=4).solve(maze, (0, 0), (11, 11))
+    assert full["solution_depth"] == tiny["solution_depth"] == 22
+    assert tiny["regenerated_nodes"] >= full["regenerated_nodes"]
+
+
+def test_registry_bounds_the_ida_star_table():
+    assert create_algorithm("ida-star").max_memory == 100000
+
+
+def test_sma_star_within_budget(rng):
+    for _ in range(100):
+        maze, start, goal = random_case(rng, max_side=10)
+        res = SMAStar(max_memory=40).solve(maze, start, goal)
+        ref = BFS().solve(maze, start, goal)
+        if res["path"]:
+            assert_valid_path(maze, res["path"], start, goal)
+            assert res["solution_depth"] == ref["solution_depth"]
+        assert res["peak_nodes"] <= 40
+
+
+def test_ida_star_needs_one_table_entry():
+    for max_memory in (0, -5):
+        with pytest.raises(ValueError):
+            IDAStar(max_memory=max_memory)
+    assert IDAStar(max_memory=1).solve(Maze([[0, 0], [0, 0]]), (0, 0), (1, 1))["solution_depth"] == 2
+
+
+def test_sma_star_searches_can_nest(rng):
+    ref = {"solution_depth": 0}
+    while ref["solution_depth"] < 8:
+        maze, start, goal = random_case(rng, 16, (0.25,))
+        ref = BFS().solve(maze, start, goal)
+    sma = SMAStar(max_memory=60)
+    nested = []
+
+    def on_expand(position):
+        if not nested:
+            nested.append(None)
+            nested[0] = sma.solve(maze, goal, start)
+
+    res = sma.instrument(False, on_expand=on_expand).solve(maze, start, goal)
+    assert res["solution_depth"] == ref["solution_depth"]
+    assert_valid_path(maze, res["path"], start, goal)
+    assert nested[0]["solution_depth"] == ref["solution_depth"]
+    assert_valid_path(maze, nested[0]["path"], goal, start)
+
+
+def test_sma_star_needs_two_nodes():
+    with pytest.raises(ValueError):
+        SMAStar(max_memory=1)
@@ -0,0 +1,56 @@
+import pytest
+
+from algorithms.astar import AStar
+from algorithms.bfs import BFS
+from maze_engine import Maze
+from query_engine import QueryEngine
+from helpers import assert_valid_path, random_grid
+
+
+def open_cells(maze):
+    return [maze.position(index) for index in range(maze.size) if maze.cells[index] != 1]
+
+
+@pytest.mark.parametrize("cls", [BFS, AStar])
+def test_nearest_pair_is_found(rng, cls):
+    for _ in range(60):
+        maze = Maze(random_grid(rng, 14, 14, 0.3))
+        cells = open_cells(maze)
+        if len(cells) < 6:
+            continue
+        starts, goals = rng.sample(cells, 3), rng.sample(cells, 3)
+        res = cls().solve_multi(maze, starts, goals)
+        engine = QueryEngine(maze)
+        distances = [engine.distance(start, goal) for start in starts for goal in goals]
+        distances = [distance for distance in distances if distance != -1]
+        if not distances:
+            assert res["path"] == [] and res["source"] is None
+            continue
+        assert res["solution_depth"] == min(distances)
+        assert res["source"] in starts and res["target"] in goals
+        assert_valid_path(maze, res["path"], res["source"], res["target"])
+
+
+@pytest.mark.parametrize("cls", [BFS, AStar])
+def test_ownership_map_gives_the_nearest_start(rng, cls):
+    maze = Maze(random_grid(rng, 20, 20, 0.2))
+    starts = rng.sample(open_cells(maze), 4)
+    res = cls().solve_multi(maze, starts, [], ownership=True)
+    fields = [QueryEngine(maze).distance_field(start)[0] for start in starts]
+    for index in range(maze.size):
+        nearest = [field[index] for field in fields if field[index] != -1]
+        if not nearest:
+            assert res["ownership"][index] == -1
+            continue
+        owner = res["ownership"][index]
+        assert res["distances"][index] == min(nearest) == fields[owner][index]
+
+
+def test_endpoint_validation():
+    maze = Maze([[0, 1], [0, 0]])
+    with pytest.raises(ValueError):
+        BFS().solve_multi(maze, [], [(1, 1)])
+    with pytest.raises(ValueError):
+        BFS().solve_multi(maze, [(0, 0)], [(5, 5)])
+    # A wall goal cannot be reached
+    assert BFS().solve_multi(maze, [(0, 0)], [(0, 1)])["path"] == []
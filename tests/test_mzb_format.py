@@ -0,0 +1,48 @@
+import pytest
+
+from maze_engine import Maze
+from utils import mzb_format
+from helpers import random_grid
+
+
+@pytest.mark.parametrize("cols", [1, 7, 8, 9, 33])
+def test_round_trip(tmp_path, rng, cols):
+    grid = random_grid(rng, 11, cols, 0.4)
+    filename = str(tmp_path / "maze.mzb")
+    header = mzb_format.save_mzb(filename, Maze(grid), start=(0, 0), goal=(10, cols - 1))
+    assert (header.rows, header.cols) == (11, cols)
+
+    maze, start, goal = mzb_format.load_mzb(filename)
+    assert (start, goal) == ((0, 0), (10, cols - 1))
+    assert bytes(maze.cells) == bytes(Maze(grid).cells)
+    assert maze.neighbor_mask == Maze(grid).neighbor_mask
+    assert maze.cells[maze.size - 1] == grid[-1][-1]
+    maze.close()
+
+
+def test_text_conversion_round_trip(tmp_path):
+    text = tmp_path / "maze.txt"
+    text.write_text("..#.\n#...\n..##\n")
+    mzb_format.text_to_mzb(str(text), str(tmp_path / "maze.mzb"))
+    mzb_format.mzb_to_text(str(tmp_path / "maze.mzb"), str(tmp_path / "back.txt"))
+    assert (tmp_path / "back.txt").read_text() == text.read_text()
+    _, start, goal = mzb_format.load_mzb(str(tmp_path / "maze.mzb"))
+    assert start is None and goal is None
+
+
+def test_corrupted_body_is_rejected(tmp_path):
+    filename = tmp_path / "maze.mzb"
+    mzb_format.save_mzb(str(filename), [[0, 1, 0], [0, 0, 0]])
+    data = bytearray(filename.read_bytes())
+    data[-1] ^= 0xFF
+    filename.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        mzb_format.load_mzb(str(filename))
+    filename.write_bytes(bytes(data[:-1]))
+    with pytest.raises(ValueError):
+        mzb_format.load_mzb(str(filename), verify=False)
+
+
+def test_weighted_mazes_stay_in_the_text_format(tmp_path):
+    with pytest.raises(ValueError):
+        mzb_format.save_mzb(str(tmp_path / "maze.mzb"), [[0, 5], [0, 0]])
@@ -0,0 +1,49 @@
+from algorithms.astar import AStar
+from algorithms.bfs import BFS
+from maze_engine import Maze
+from utils.path_cache import CachedSolver, PathCache
+
+
+def open_maze():
+    return Maze([[0] * 6 for _ in range(6)])
+
+
+def test_hits_and_distinct_configurations():
+    cache, maze = PathCache(), open_maze()
+    assert cache.solve(BFS(), maze, (0, 0), (5, 5))["cache"] == "miss"
+    assert cache.solve(BFS(), maze, (0, 0), (5, 5))["cache"] == "hit"
+    # Another algorithm or another setting is another entry
+    assert cache.solve(AStar(), maze, (0, 0), (5, 5))["cache"] == "miss"
+    assert cache.solve(AStar(tie_breaking="fifo"), maze, (0, 0), (5, 5))["cache"] == "miss"
+    # Equal contents give the same fingerprint
+    assert cache.solve(BFS(), open_maze(), (0, 0), (5, 5))["cache"] == "hit"
+
+
+def test_subpaths_of_optimal_paths():
+    cache, maze = PathCache(), open_maze()
+    path = cache.solve(BFS(), maze, (0, 0), (5, 5))["path"]
+    inner = cache.solve(BFS(), maze, path[2], path[7])
+    assert inner["cache"] == "subpath" and inner["path"] == path[2:8]
+    backwards = cache.solve(BFS(), maze, path[7], path[2])
+    assert backwards["cache"] == "subpath" and backwards["path"] == path[2:8][::-1]
+
+
+def test_edits_invalidate_entries():
+    cache, maze = PathCache(), open_maze()
+    first = cache.solve(BFS(), maze, (0, 0), (0, 5))
+    assert first["solution_depth"] == 5
+    maze.set_wall((0, 2))
+    assert len(cache) == 0
+    second = cache.solve(BFS(), maze, (0, 0), (0, 5))
+    assert second["cache"] == "miss" and second["solution_depth"] == 7
+    maze.clear_wall((0, 2))
+    assert cache.solve(BFS(), maze, (0, 0), (0, 5))["cache"] == "miss"
+
+
+def test_lru_bound_and_disk_tier(tmp_path):
+    cache, maze = PathCache(max_entries=2, directory=str(tmp_path)), open_maze()
+    for goal in ((5, 5), (4, 4), (3, 3)):
+        cache.solve(AStar(), maze, (5, 0), goal)
+    assert len(cache) == 2 and cache.stats["evictions"] == 1
+    fresh = CachedSolver(AStar(), PathCache(directory=str(tmp_path)))
+    assert fresh.solve(maze, (5, 0), (5, 5))["cache"] == "disk"
@@ -0,0 +1,58 @@
+from algorithms.bfs import BFS
+from maze_engine import Maze
+from query_engine import QueryEngine
+from helpers import assert_valid_path, random_grid
+
+
+def test_batch_matches_single_searches(rng):
+    grid = random_grid(rng, 25, 25, 0.25)
+    maze = Maze(grid)
+    open_cells = [(x, y) for x in range(25) for y in range(25) if grid[x][y] == 0]
+    goals = rng.sample(open_cells, 3)
+    queries = [(rng.choice(open_cells), rng.choice(goals)) for _ in range(60)]
+    results = BFS().solve_many(maze, queries)
+    for (start, goal), res in zip(queries, results):
+        ref = BFS().solve(maze, start, goal)
+        assert res["solution_depth"] == ref["solution_depth"]
+        if res["path"]:
+            assert_valid_path(maze, res["path"], start, goal)
+
+
+def test_one_field_per_goal_is_cached():
+    maze = Maze([[0] * 6 for _ in range(6)])
+    engine = QueryEngine(maze)
+    first = engine.solve_many([((0, 0), (5, 5)), ((3, 0), (5, 5))])
+    assert first[0]["expanded_nodes"] == 36 and first[1]["expanded_nodes"] == 0
+    again = engine.solve((0, 5), (5, 5))
+    assert again["cached_field"] and again["solution_depth"] == 5
+    assert engine.distance((0, 0), (5, 5)) == 10
+
+
+def test_edits_invalidate_the_fields():
+    maze = Maze([[0, 0, 0],
+                 [0, 1, 0],
+                 [0, 0, 0]])
+    engine = QueryEngine.for_maze(maze)
+    assert engine.distance((0, 1), (2, 1)) == 4
+    maze.clear_wall((1, 1))
+    assert engine.distance((0, 1), (2, 1)) == 2
+    maze.set_cells([((1, 0), 1), ((1, 1), 1), ((1, 2), 1)])
+    assert engine.path((0, 1), (2, 1)) == []
+
+
+def test_unreachable_and_out_of_bounds_queries():
+    maze = Maze([[0, 1, 0]])
+    engine = QueryEngine(maze)
+    assert engine.path((0, 0), (0, 2)) == []
+    assert engine.distance((5, 5), (0, 2)) == -1
+    assert engine.path((0, 0), (0, 1)) == []
+
+
+def test_start_on_a_wall_steps_into_the_field():
+    maze = Maze([[1, 0, 0], [0, 0, 0]])
+    ref = BFS().solve(maze, (0, 0), (1, 2))
+    res = BFS().solve_many(maze, [((0, 0), (1, 2)), ((0, 0), (0, 0))])
+    assert res[0]["solution_depth"] == ref["solution_depth"] == 3
+    assert_valid_path(maze, res[0]["path"], (0, 0), (1, 2))
+    assert res[1]["path"] == BFS().solve(maze, (0, 0), (0, 0))["path"] == [(0, 0)]
+    assert QueryEngine(maze).distance((0, 0), (1, 2)) == 3
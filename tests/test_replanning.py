@@ -0,0 +1,49 @@
+from algorithms.bfs import BFS
+from algorithms.dstar_lite import DStarLite
+from maze_engine import Maze
+from utils import mzb_format
+from helpers import assert_valid_path, random_grid
+
+
+def test_replans_after_edits_and_start_moves(rng):
+    for _ in range(20):
+        grid = random_grid(rng, 15, 15, 0.25)
+        grid[0][0] = grid[14][14] = 0
+        maze = Maze(grid)
+        planner = DStarLite()
+        start, goal = (0, 0), (14, 14)
+        for step in range(15):
+            res = planner.solve(maze, start, goal)
+            assert res["replanned"] == (step > 0)
+            ref = BFS().solve(maze, start, goal)
+            assert res["solution_depth"] == ref["solution_depth"]
+            if res["path"]:
+                assert_valid_path(maze, res["path"], start, goal)
+                if len(res["path"]) > 1:
+                    start = tuple(res["path"][1])
+            changes = [((rng.randrange(15), rng.randrange(15)), rng.choice((0, 1))) for _ in range(4)]
+            maze.set_cells([(cell, value) for cell, value in changes if cell not in (start, goal)])
+
+
+def test_listeners_see_each_batch_once():
+    maze = Maze([[0, 0], [0, 0]])
+    calls = []
+    maze.subscribe(lambda changed_maze, changed: calls.append(sorted(changed)))
+    version = maze.version
+    assert maze.set_cells([((0, 1), 1), ((1, 0), 1), ((1, 1), 0)]) == [1, 2]
+    assert calls == [[1, 2]] and maze.version == version + 1
+    # No change: no notification and no new version
+    assert not maze.set_wall((0, 1))
+    assert len(calls) == 1 and maze.version == version + 1
+
+
+def test_editing_a_mapped_maze_copies_its_cells(tmp_path):
+    filename = str(tmp_path / "maze.mzb")
+    mzb_format.save_mzb(filename, [[0, 0, 0], [0, 1, 0], [0, 0, 0]])
+    original = open(filename, "rb").read()
+    maze, _, _ = mzb_format.load_mzb(filename)
+    assert maze.clear_wall((1, 1))
+    assert isinstance(maze.cells, bytearray) and maze.is_valid_move((1, 1))
+    assert BFS().solve(maze, (0, 1), (2, 1))["solution_depth"] == 2
+    maze.close()
+    assert open(filename, "rb").read() == original
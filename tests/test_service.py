@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+import service
+from algorithms.bfs import BFS
+from service import ServiceError, SolverClient, SolverService
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMPLEX = os.path.join(ROOT, "inputs", "complex.txt")
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    """
+    A SolverService listening on a Unix socket, run in a background thread.
+    """
+    path = str(tmp_path / "maze.sock")
+    service = SolverService(workers=1)
+    ready = threading.Event()
+    state = {}
+
+    def run():
+        async def main():
+            state["loop"], state["task"] = asyncio.get_running_loop(), asyncio.current_task()
+            await service.serve_forever(path, ready=lambda server: ready.set())
+
+        try:
+            asyncio.run(main())
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert ready.wait(10)
+    yield path
+    state["loop"].call_soon_threadsafe(state["task"].cancel)
+    thread.join(10)
+    assert not os.path.exists(path)
+
+
+def test_load_solve_unload(socket_path):
+    with SolverClient(socket_path=socket_path, timeout=60) as client:
+        assert client.ping()["ok"]
+        client.load("complex", path=COMPLEX)
+        client.load("tiny", rows=["..#", "#..", "..."])
+        assert sorted(entry["maze"] for entry in client.mazes()) == ["complex", "tiny"]
+
+        result = client.solve("complex", (0, 0), (8, 9), algo="bfs")
+        assert result["found"] and result["path"][0] == [0, 0] and result["path"][-1] == [8, 9]
+        assert result["total_time"] >= result["solve_time"] >= 0
+        jps = client.solve("complex", (0, 0), (8, 9), algo="jps")
+        assert jps["solution_depth"] == result["solution_depth"]
+        assert client.solve("tiny", (0, 0), (2, 2), algo="astar")["solution_depth"] == 4
+
+        assert client.unload("tiny") is True
+        assert client.stats()["solved"] == 3
+
+
+def test_errors_keep_the_connection_usable(socket_path):
+    with SolverClient(socket_path=socket_path, timeout=60) as client:
+        client.load("tiny", grid=[[0, 0], [1, 0]])
+        for request in ({"op": "solve", "maze": "nope", "start": [0, 0], "goal": [1, 1]},
+                        {"op": "solve", "maze": "tiny", "start": [0, 0], "goal": [5, 5]},
+                        {"op": "solve", "maze": "tiny", "start": [0, 0], "goal": [1, 1], "algo": "nope"},
+                        {"op": "explode"}):
+            with pytest.raises(ServiceError):
+                client.request(**request)
+        assert client.solve("tiny", (0, 0), (1, 1), algo="bfs")["found"]
+
+
+class ExplodingSolver(BFS):
+    """
+    A solver that fails with an error the service does not expect.
+    """
+
+    def solve(self, maze, start, goal):
+        return 1 // 0
+
+
+def test_a_crashing_solver_still_gets_a_reply(socket_path, monkeypatch):
+    create = service.create_algorithm
+    monkeypatch.setattr(service, "create_algorithm",
+                        lambda key, **options: ExplodingSolver() if key == "explode" else create(key, **options))
+    with SolverClient(socket_path=socket_path, timeout=60) as client:
+        client.load("tiny", grid=[[0, 0], [1, 0]])
+        with pytest.raises(ServiceError, match="ZeroDivisionError"):
+            client.solve("tiny", (0, 0), (1, 1), algo="explode")
+        with pytest.raises(ServiceError, match="max_memory"):
+            client.solve("tiny", (0, 0), (1, 1), algo="ida-star", max_memory=0)
+        assert client.solve("tiny", (0, 0), (1, 1), algo="bfs")["found"]
+        assert client.stats()["errors"] == 2
+
+
+def test_pipelined_requests_echo_their_ids(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as raw:
+        raw.settimeout(60)
+        raw.connect(socket_path)
+        stream = raw.makefile("rwb")
+        stream.write(b'{"id": "a", "op": "ping"}\nnot json\n{"id": 7, "op": "ping"}\n')
+        stream.flush()
+        responses = [json.loads(stream.readline()) for _ in range(3)]
+    by_id = {response["id"]: response for response in responses}
+    assert by_id["a"]["ok"] and by_id[7]["ok"] and not by_id[None]["ok"]
+
+
+def test_handle_request_without_a_transport():
+    service = SolverService(workers=1)
+    try:
+        response = asyncio.run(service.handle_request({"id": 1, "op": "load", "maze": "m", "grid": [[0]]}))
+        assert response["ok"] and response["id"] == 1
+        response = asyncio.run(service.handle_request(["not", "an", "object"]))
+        assert not response["ok"] and service.stats["errors"] == 1
+    finally:
+        service.close()
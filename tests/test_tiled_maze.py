@@ -0,0 +1,61 @@
+import pytest
+
+from algorithms.registry import ALGORITHMS, create_algorithm
+from utils import maze_generator, mzb_format
+from utils.tiled_maze import TiledMaze, load_tiled
+
+OUT_OF_CORE = ["bfs", "dfs", "astar", "astar-euclidean", "greedy", "greedy-euclidean"]
+
+
+@pytest.fixture
+def mazes(tmp_path):
+    # A noise maze with a guaranteed path from corner to corner, spread over 7 x 6 tiles
+    maze, start, goal = maze_generator.generate("noise", 50, 45, density=0.3, seed=4)
+    filename = str(tmp_path / "maze.mzb")
+    mzb_format.save_mzb(filename, maze, start, goal)
+    tiled, start, goal = load_tiled(filename, tile_size=8, memory_budget=8 * 8 * 6)
+    yield maze, tiled, start, goal
+    tiled.close()
+
+
+@pytest.mark.parametrize("key", OUT_OF_CORE)
+def test_results_match_the_in_memory_maze(mazes, key):
+    maze, tiled, start, goal = mazes
+    expected = create_algorithm(key).solve(maze, start, goal)
+    res = create_algorithm(key).solve(tiled, start, goal)
+    assert res["path"] and [tuple(p) for p in res["path"]] == [tuple(p) for p in expected["path"]]
+    assert res["expanded_nodes"] == expected["expanded_nodes"]
+
+
+def test_tile_cache_stays_within_budget(tmp_path):
+    filename = str(tmp_path / "open.mzb")
+    mzb_format.save_mzb(filename, [[0] * 40 for _ in range(40)])
+    with TiledMaze(filename, tile_size=8, memory_budget=8 * 8 * 6) as tiled:
+        res = create_algorithm("bfs").solve(tiled, (0, 0), (39, 39))
+        stats = tiled.tile_stats()
+    assert res["solution_depth"] == 78
+    assert stats["cached_tiles"] <= stats["capacity"] == 6
+    assert stats["misses"] > 6 and stats["evictions"] == stats["misses"] - stats["cached_tiles"]
+
+
+@pytest.mark.parametrize("key", [key for key in ALGORITHMS if key not in OUT_OF_CORE])
+def test_in_memory_solvers_raise_a_type_error(mazes, key):
+    _, tiled, start, goal = mazes
+    with pytest.raises(TypeError, match="in-memory"):
+        create_algorithm(key).solve(tiled, start, goal)
+
+
+def test_batch_and_multi_source_searches(mazes):
+    maze, tiled, start, goal = mazes
+    bfs = create_algorithm("bfs")
+    path = bfs.solve_many(tiled, [(start, goal)])[0]["path"]
+    assert path and path == bfs.solve(maze, start, goal)["path"]
+    with pytest.raises(TypeError):
+        bfs.solve_multi(tiled, [start], [goal])
+
+
+def test_tile_size_must_be_byte_aligned(tmp_path):
+    filename = str(tmp_path / "maze.mzb")
+    mzb_format.save_mzb(filename, [[0, 0], [0, 0]])
+    with pytest.raises(ValueError):
+        TiledMaze(filename, tile_size=12)
@@ -0,0 +1,39 @@
+import pytest
+
+from algorithms.astar import AStar
+from algorithms.visited import VisitedCells
+from maze_engine import Maze
+from utils.input_handler import InputHandler
+
+
+def test_behaves_like_the_position_list():
+    visited = VisitedCells([0, 5, 7], 3, 4)
+    assert len(visited) == 3
+    assert list(visited) == [(0, 0), (1, 1), (1, 3)]
+    assert visited[1] == (1, 1) and visited[-1] == (1, 3) and visited[:2] == [(0, 0), (1, 1)]
+    assert (1, 3) in visited and (2, 2) not in visited and (9, 9) not in visited
+    assert visited == [(0, 0), (1, 1), (1, 3)]
+    assert visited == VisitedCells.from_positions([(0, 0), (1, 1), (1, 3)], 3, 4)
+    assert VisitedCells.from_bitmap(visited.bitmap(), 3, 4) == visited
+
+
+def test_index_kernel_results_carry_it(small_maze):
+    res = AStar().solve(small_maze, (0, 0), (6, 9))
+    assert isinstance(res["visited_list"], VisitedCells)
+    node_res = AStar(kernel="node").solve(small_maze, (0, 0), (6, 9))
+    assert set(res["visited_list"]) == set(node_res["visited_list"])
+
+
+def test_mask_and_raster(tmp_path):
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("matplotlib")
+    import matplotlib
+    matplotlib.use("Agg")
+
+    maze = Maze([[0] * 30 for _ in range(20)])
+    res = AStar(tie_breaking="fifo").solve(maze, (0, 0), (19, 29))
+    mask = res["visited_list"].mask()
+    assert mask.shape == (20, 30) and int(np.count_nonzero(mask)) == len(res["visited_list"])
+    target = tmp_path / "result.png"
+    InputHandler.visualize_result(maze, res["path"], res["visited_list"], save_to=str(target))
+    assert target.stat().st_size > 0
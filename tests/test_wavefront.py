@@ -0,0 +1,36 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from algorithms.bfs import BFS
+from algorithms.wavefront import WavefrontBFS
+from maze_engine import Maze
+from query_engine import QueryEngine
+from helpers import assert_valid_path, random_case
+
+
+def test_paths_match_bfs(rng):
+    for _ in range(200):
+        maze, start, goal = random_case(rng)
+        res = WavefrontBFS().solve(maze, start, goal)
+        ref = BFS().solve(maze, start, goal)
+        assert res["solution_depth"] == ref["solution_depth"]
+        if res["path"]:
+            assert_valid_path(maze, res["path"], start, goal)
+
+
+def test_full_distance_map_matches_a_reverse_bfs(rng):
+    maze, start, _ = random_case(rng, max_side=20)
+    distances = WavefrontBFS().distance_map(maze, start)
+    assert distances.shape == (maze.rows, maze.cols)
+    # Distances are symmetric, so the goal-rooted field of QueryEngine gives the same numbers
+    field = QueryEngine(maze).distance_field(start)[0]
+    assert distances.reshape(-1).tolist() == list(field)
+
+
+def test_stop_at_goal_labels_less():
+    maze = Maze([[0] * 20 for _ in range(20)])
+    near = WavefrontBFS().solve(maze, (0, 0), (0, 3))
+    full = WavefrontBFS(stop_at_goal=False).solve(maze, (0, 0), (0, 3))
+    assert near["solution_depth"] == full["solution_depth"] == 3
+    assert near["expanded_nodes"] < full["expanded_nodes"] == 400
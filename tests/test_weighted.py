@@ -0,0 +1,78 @@
+import heapq
+
+import pytest
+
+from algorithms.astar import AStar
+from algorithms.bfs import BFS
+from algorithms.dijkstra import Dijkstra
+from algorithms.registry import ALGORITHMS, create_algorithm
+from maze_engine import Maze
+from utils.analyzer import Analyzer
+from helpers import assert_valid_path
+
+
+def reference_cost(maze, start, goal):
+    """
+    Plain heapq Dijkstra over positions.
+    """
+    best = {start: 0}
+    queue = [(0, start)]
+    while queue:
+        cost, position = heapq.heappop(queue)
+        if position == goal:
+            return cost
+        if cost > best[position]:
+            continue
+        for neighbor in maze.get_neighbors(position):
+            new_cost = cost + maze.step_cost(neighbor)
+            if new_cost < best.get(neighbor, new_cost + 1):
+                best[neighbor] = new_cost
+                heapq.heappush(queue, (new_cost, neighbor))
+    return None
+
+
+def terrain_case(rng):
+    rows, cols = rng.randint(2, 14), rng.randint(2, 14)
+    grid = [[rng.choice((0, 0, 0, 1, 2, 5, 9)) for _ in range(cols)] for _ in range(rows)]
+    start, goal = (0, 0), (rows - 1, cols - 1)
+    grid[0][0] = grid[rows - 1][cols - 1] = 0
+    return Maze(grid), start, goal
+
+
+@pytest.mark.parametrize("heuristic_type", [None, "manhattan"])
+def test_dial_queue_finds_the_cheapest_path(rng, heuristic_type):
+    for _ in range(200):
+        maze, start, goal = terrain_case(rng)
+        res = Dijkstra(heuristic_type).solve(maze, start, goal)
+        expected = reference_cost(maze, start, goal)
+        if expected is None:
+            assert res["path"] == []
+            continue
+        assert_valid_path(maze, res["path"], start, goal)
+        assert res["path_cost"] == maze.path_cost(res["path"]) == expected
+        assert res["is_optimal"]
+
+
+def test_euclidean_is_refused():
+    with pytest.raises(ValueError):
+        Dijkstra("euclidean")
+
+
+# A cheap detour around an expensive straight corridor
+DETOUR = [[0, 9, 9, 0],
+          [0, 0, 0, 0]]
+
+
+@pytest.mark.parametrize("key", [key for key in ALGORITHMS if key not in ("dijkstra", "astar-dial", "ara-star")])
+def test_unit_cost_solvers_do_not_claim_optimality_on_terrain(key):
+    res = create_algorithm(key).solve(Maze(DETOUR), (0, 0), (0, 3))
+    assert not res["is_optimal"]
+
+
+def test_optimality_gap_uses_path_costs():
+    maze = Maze(DETOUR)
+    bfs, dial = Analyzer([BFS(), Dijkstra()], maze, (0, 0), (0, 3)).run_tests()
+    assert dial["optimality_gap"] == 0.0
+    assert bfs["optimality_gap"] == (maze.path_cost(bfs["path"]) - 5) / 5
+    # On a plain maze the unit-cost solvers are exact again
+    assert AStar().solve(Maze([[0, 0], [0, 0]]), (0, 0), (1, 1))["is_optimal"]
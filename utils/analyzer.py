@@ -1,29 +1,115 @@
-import matplotlib.pyplot as plt
-import numpy as np
+import os
 from algorithms.base import Colors
 
 
 class Analyzer:
-    def __init__(self, algorithms, maze, start, goal):
+    def __init__(self, algorithms, maze, start, goal, cache=None):
+        """
+        cache: optional utils.path_cache.PathCache. Combinations solved before (same maze
+            contents, endpoints and algorithm settings) are then served from it.
+        """
         self.algorithms = algorithms
         self.maze = maze
         self.start = start
         self.goal = goal
+        self.cache = cache
         self.results = []
 
-    def run_tests(self):
+    def run_tests(self, parallel=False, workers=None, profile=False):
         """
         Runs all algorithms on the maze and collects results.
+        The connected regions are labeled once up front (linear time), so when start and goal
+        are in different regions every algorithm reports "no path" immediately.
+            parallel: run the algorithms in a process pool of `workers` processes (default: one
+                per CPU). The grid is shared through shared memory and results keep the order
+                of self.algorithms.
+            profile: run every algorithm through its profile() (phase timers, peak open list,
+                re-pushes, nodes/sec and peak memory); cached results are not used then.
         """
-        for algo in self.algorithms:
-            res = algo.solve(self.maze, self.start, self.goal)
+        # Out-of-core mazes (utils.tiled_maze) have no flat buffers to label or share
+        in_memory = hasattr(self.maze, "neighbor_mask")
+        if in_memory:
+            self.maze.build_components()
+        results = [None] * len(self.algorithms)
+        if self.cache is not None and not profile:
+            results = [self.cache.get(algo, self.maze, self.start, self.goal) for algo in self.algorithms]
+        pending = [i for i, res in enumerate(results) if res is None]
+
+        if parallel and in_memory and len(pending) > 1 and not self.maze.separated(self.start, self.goal):
+            solved = Analyzer.run_batch(
+                [self.algorithms[i] for i in pending], [(self.maze, self.start, self.goal)],
+                workers=workers, profile=profile)[0]
+        elif profile:
+            solved = [self.algorithms[i].profile(self.maze, self.start, self.goal) for i in pending]
+        else:
+            solved = [self.algorithms[i].solve(self.maze, self.start, self.goal) for i in pending]
+
+        for i, res in zip(pending, solved):
+            if self.cache is not None:
+                self.cache.put(self.algorithms[i], self.maze, self.start, self.goal, res)
+                res = {**res, "cache": "miss"}
+            results[i] = res
+
+        for res in results:
             if res:
                 self.results.append(res)
+        self._add_optimality_gaps()
         return self.results
 
-    def plot_comparison(self):
+    def _add_optimality_gaps(self):
+        """
+        Store in every result how much more its path costs than the cheapest path of the
+        algorithms that guarantee optimality (0.05 = 5% more). Costs follow the maze terrain
+        (Maze.path_cost), so on a weighted maze only the cost-aware solvers are a reference.
+        None when there is no optimal reference or no path.
+        """
+        costs = [self._path_cost(res) if res['path'] else None for res in self.results]
+        optimal_costs = [cost for res, cost in zip(self.results, costs) if res['is_optimal'] and res['path']]
+        best = min(optimal_costs) if optimal_costs else None
+        for res, cost in zip(self.results, costs):
+            if best is None or not res['path']:
+                res['optimality_gap'] = None
+            else:
+                res['optimality_gap'] = (cost - best) / best if best else 0.0
+
+    def _path_cost(self, res):
+        """
+        Cost of the path of a result: "path_cost" when the solver reports it, else computed.
+        """
+        if res.get('path_cost') is not None:
+            return res['path_cost']
+        return self.maze.path_cost([tuple(position) for position in res['path']])
+
+    @staticmethod
+    def run_batch(algorithms, jobs, workers=None, profile=False):
+        """
+        Run every algorithm on every (maze, start, goal) job across a process pool.
+        Each maze is copied once into shared memory; the workers attach to it by name.
+        Returns one list of results per job (same order as jobs), each in the order of algorithms.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        from utils.shared_maze import SharedMaze, solve_shared
+
+        shared = []
+        try:
+            for maze, _, _ in jobs:
+                shared.append(SharedMaze(maze))
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [[pool.submit(solve_shared, shared_maze.descriptor, algo, start, goal, profile)
+                            for algo in algorithms]
+                           for shared_maze, (_, start, goal) in zip(shared, jobs)]
+                # Collected in submission order, whatever order the workers finish in
+                return [[future.result() for future in job_futures] for job_futures in futures]
+        finally:
+            for shared_maze in shared:
+                shared_maze.close()
+
+    def plot_comparison(self, save_to=None):
         """
         Generates a comparative bar chart of expanded nodes and solution depth for each algorithm.
+        With save_to the chart is written to that PNG file (and the profile figure, if any, next
+        to it as <name>_profile.png) instead of being shown.
         """
 
         if not self.results:
@@ -32,6 +118,10 @@ class Analyzer:
                 f"\n{Colors.BOLD}{Colors.YELLOW}[WARNING]{Colors.END} Neither algorithm found a solution.\n The graphic analysis was canceled.")
             return
 
+        # Plotting libraries are imported on demand, headless runs never load them
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         names = [res['algorithm'] for res in self.results]
         expanded = [res['expanded_nodes'] for res in self.results]
         depth = [res['solution_depth'] for res in self.results]
@@ -58,24 +148,102 @@ class Analyzer:
         ax2.legend(loc='upper right')
 
         plt.tight_layout()
-        plt.show()
 
-    def print_summary_table(self):
+        profile_fig = None
+        if any('phase_times' in res for res in self.results):
+            profile_fig = self._plot_profile(plt, np)
+
+        if save_to:
+            fig.savefig(save_to, dpi=100)
+            if profile_fig is not None:
+                profile_fig.savefig(os.path.splitext(save_to)[0] + "_profile.png", dpi=100)
+            plt.close('all')
+        else:
+            plt.show()
+
+    def _plot_profile(self, plt, np):
         """
-        Prints a summary table of results for all algorithms.
+        Second figure for instrumented runs: time per search phase (stacked) and nodes/sec.
+        """
+        profiled = [res for res in self.results if 'phase_times' in res]
+        names = [res['algorithm'] for res in profiled]
+        x = np.arange(len(names))
+
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+        bottom = np.zeros(len(profiled))
+        for phase, color in (('setup', 'lightgray'), ('search', 'skyblue'),
+                             ('reconstruction', 'orange'), ('result', 'salmon')):
+            values = np.array([(res['phase_times'][phase] or 0) * 1000 for res in profiled])
+            ax1.bar(x, values, 0.6, bottom=bottom, label=phase.capitalize(), color=color)
+            bottom += values
+        ax1.set_ylabel('Time (ms)')
+        ax1.set_title('Time per Search Phase')
+        ax1.set_xticks(x)
+        ax1.set_xticklabels(names, rotation=30, ha='right')
+        ax1.legend(loc='upper left')
+
+        speed = [res['nodes_per_sec'] or 0 for res in profiled]
+        ax2.bar(x, speed, 0.6, color='seagreen')
+        ax2.set_ylabel('Expanded nodes per second')
+        ax2.set_title('Search Throughput')
+        ax2.set_xticks(x)
+        ax2.set_xticklabels(names, rotation=30, ha='right')
+
+        plt.tight_layout()
+        return fig
+
+    def print_summary_table(self, out=None):
+        """
+        Prints a summary table of results for all algorithms (to out, a text stream, default stdout).
         """
         if not self.results:
             return
 
-        print("\n" + "="*90)
-        print(f"{Colors.BOLD}{'ALGORITHM':<25} | {'EXP. NODES':<12} | {'DEPTH':<10} | {'TIME (ms)':<12} | {'IS OPTIMAL?'}{Colors.END}")
-        print("-" * 90)
+        print("\n" + "="*116, file=out)
+        print(f"{Colors.BOLD}{'ALGORITHM':<25} | {'EXP. NODES':<12} | {'RE-EXP.':<10} | {'DEPTH':<10} | {'TIME (ms)':<12} | {'IS OPTIMAL?':<11} | {'GAP'}{Colors.END}", file=out)
+        print("-" * 116, file=out)
 
         for res in self.results:
             color = Colors.GREEN if res['is_optimal'] else Colors.YELLOW
             optim_text = "YES" if res['is_optimal'] else "NO"
             time_ms = res['execution_time'] * 1000
-            print(f"{color}{res['algorithm']:<25}{Colors.END} | {res['expanded_nodes']:<12} | "
-                  f"{res['solution_depth']:<10} | {time_ms:<12.4f} | {color}{optim_text}{Colors.END}")
+            # Only the searches that can reopen closed nodes report re-expansions
+            reexpansions = res.get('reexpansions', 0)
+            # Gap to the best optimal path of the run ("-" without a reference)
+            gap = res.get('optimality_gap')
+            gap_text = f"{gap:.1%}" if gap is not None else "-"
+            print(f"{color}{res['algorithm']:<25}{Colors.END} | {res['expanded_nodes']:<12} | {reexpansions:<10} | "
+                  f"{res['solution_depth']:<10} | {time_ms:<12.4f} | {color}{optim_text:<11}{Colors.END} | {gap_text}", file=out)
+
+        print("=" * 116 + "\n", file=out)
+
+        if any('phase_times' in res for res in self.results):
+            self.print_profile_table(out)
+
+    def print_profile_table(self, out=None):
+        """
+        Prints the instrumentation metrics of the profiled results (see SearchAlgorithm.instrument)
+        to out (default stdout).
+        """
+        def number(value, fmt):
+            return "-" if value is None else format(value, fmt)
+
+        print("=" * 116, file=out)
+        print(f"{Colors.BOLD}{'ALGORITHM':<25} | {'SETUP':<7} | {'SEARCH':<8} | {'RECON.':<7} | {'RESULT':<7} | "
+              f"{'PEAK OPEN':<9} | {'RE-PUSH':<7} | {'NODES/SEC':<10} | {'PEAK MEM (KB)'}{Colors.END}", file=out)
+        print(f"{'':<25} | {'(ms)':<7} | {'(ms)':<8} | {'(ms)':<7} | {'(ms)':<7} |", file=out)
+        print("-" * 116, file=out)
+
+        for res in self.results:
+            phases = res.get('phase_times')
+            if phases is None:
+                continue
+            peak_memory = res.get('peak_memory')
+            setup = phases['setup'] * 1000 if phases['setup'] is not None else None
+            print(f"{res['algorithm']:<25} | {number(setup, '.3f'):<7} | {phases['search'] * 1000:<8.3f} | "
+                  f"{phases['reconstruction'] * 1000:<7.3f} | {phases['result'] * 1000:<7.3f} | "
+                  f"{number(res['peak_open_list'], 'd'):<9} | {number(res['repushes'], 'd'):<7} | "
+                  f"{number(res['nodes_per_sec'], ',.0f'):<10} | "
+                  f"{number(peak_memory / 1024 if peak_memory is not None else None, ',.1f')}", file=out)
 
-        print("=" * 90 + "\n")
+        print("=" * 116 + "\n", file=out)
@@ -1,7 +1,11 @@
-import matplotlib.pyplot as plt
-import numpy as np
 import random
 from algorithms.base import Colors
+from maze_engine import Maze, WALL, cell_text, text_cell
+from utils import maze_generator
+
+
+# matplotlib and NumPy are imported inside the visualization methods only, so loading mazes
+# and printing results (e.g. the headless command line) does not pay their import time.
 
 
 class InputHandler:
@@ -9,16 +13,37 @@ class InputHandler:
     def load_from_file(filename):
         """
             Read maze grid from a text file. Each line in the file represents a row in the maze.
-            Walls are represented by '#' and paths by '.'.
-            1 is used for walls and 0 for paths in the returned grid.
+            Walls are represented by '#', paths by '.' and terrain by its step cost (digits 2-9).
+            1 is used for walls, 0 for paths and 2-9 for terrain in the returned grid.
         """
         grid = []
         with open(filename, 'r') as f:
             for line in f:
-                # 1 for wall, 0 for path
-                grid.append([1 if char == '#' else 0 for char in line.strip()])
+                grid.append([text_cell(char) for char in line.strip()])
         return grid
 
+    @staticmethod
+    def load_maze(filename):
+        """
+            Load a maze file as a Maze, together with the start and goal stored in it (or None).
+            .mzb files are memory-mapped (see utils.mzb_format); text files are streamed row by
+            row into the flat cell buffer, without building the nested grid list.
+        """
+        from utils import mzb_format
+
+        if filename.endswith('.mzb'):
+            return mzb_format.load_mzb(filename)
+
+        cells = bytearray()
+        rows, cols = 0, None
+        for row in mzb_format.iter_text_rows(filename):
+            if cols is None:
+                cols = len(row)
+            # Same padding/truncation as Maze: missing cells are walls
+            cells += row[:cols] + b'\x01' * (cols - len(row))
+            rows += 1
+        return Maze.from_cells(cells, rows, cols or 0), None, None
+
     @staticmethod
     def get_manual_input():
         """
@@ -31,7 +56,7 @@ class InputHandler:
                 input(f"{Colors.BOLD}>> Enter number of columns:{Colors.END} "))
 
             print(
-                f"{Colors.BOLD}Enter the grid (use '.' for path and '#' for walls):{Colors.END}")
+                f"{Colors.BOLD}Enter the grid (use '.' for path, '#' for walls and 2-9 for terrain costs):{Colors.END}")
             grid = []
             for i in range(rows):
                 row_str = input(
@@ -41,7 +66,7 @@ class InputHandler:
                         f"{Colors.RED}{Colors.BOLD}[Error]{Colors.END} Row must have exactly {cols} characters.")
                     row_str = input(
                         f"{Colors.BOLD}>> Row {i}:{Colors.END} ").strip()
-                grid.append([1 if char == '#' else 0 for char in row_str])
+                grid.append([text_cell(char) for char in row_str])
 
             start_x = int(input(f"{Colors.BOLD}>> X Start:{Colors.END} "))
             start_y = int(input(f"{Colors.BOLD}>> Y Start:{Colors.END} "))
@@ -62,7 +87,7 @@ class InputHandler:
         rows = len(grid)
         cols = len(grid[0])
         if 0 <= x < rows and 0 <= y < cols:
-            if grid[x][y] == 0:
+            if grid[x][y] != WALL:
                 return True
             else:
                 print(
@@ -73,83 +98,183 @@ class InputHandler:
         return False
 
     @staticmethod
-    def generate_random_maze(rows, cols, obstacle_prob=0.25):
+    def generate_random_maze(rows, cols, obstacle_prob=0.25, seed=None, kind="noise"):
         """
-        Generate a random maze grid of given dimensions. Each cell has a probability of being an obstacle (wall).
+        Generate a random maze grid of given dimensions. With the default "noise" generator each
+        cell has a probability of being an obstacle (wall); "backtracker", "kruskal" and "wilson"
+        build perfect mazes (see utils.maze_generator). With a seed the same maze is generated
+        every time.
         """
-        grid = [[1 if random.random() < obstacle_prob else 0 for _ in range(cols)]
-                for _ in range(rows)]
-        return grid
+        cells = maze_generator.generate_cells(kind, rows, cols, obstacle_prob, seed, connect=False)[0]
+        return [list(cells[x * cols:(x + 1) * cols]) for x in range(rows)]
 
     @staticmethod
     def get_free_points(grid, count=5):
         """
-        Return a list of free (path) points in the grid.
+        Return up to count random free (path) points of a grid or Maze.
+        Cells are sampled at random until enough free ones are found, so a large mostly open
+        maze is never scanned; only a maze that is almost all walls falls back to a full scan.
         """
-        free_points = []
-        for r, row in enumerate(grid):
-            for c, value in enumerate(row):
-                if value == 0:
-                    free_points.append((r, c))
+        if isinstance(grid, Maze):
+            rows, cols = grid.rows, grid.cols
+            is_free = lambda r, c: grid.cells[r * cols + c] != WALL
+        else:
+            rows, cols = len(grid), len(grid[0]) if grid else 0
+            is_free = lambda r, c: grid[r][c] != WALL
+        if not rows or not cols:
+            return []
 
-        # Return a random sample of free points if there are enough
-        import random
-        return random.sample(free_points, min(len(free_points), count))
+        points = set()
+        attempts = 20 * count + 100
+        while len(points) < count and attempts:
+            attempts -= 1
+            r, c = random.randrange(rows), random.randrange(cols)
+            if is_free(r, c):
+                points.add((r, c))
+        if len(points) < count:
+            free_points = [(r, c) for r in range(rows) for c in range(cols) if is_free(r, c)]
+            return random.sample(free_points, min(len(free_points), count))
+        return list(points)
 
     @staticmethod
     def print_grid_to_terminal(grid):
         """
             Print the maze grid to the terminal (as a preview).
         """
-        print(f"\n{Colors.BOLD}Maze Preview ( . = Path, # = Wall):\n{Colors.END}")
+        print(f"\n{Colors.BOLD}Maze Preview ( . = Path, # = Wall, 2-9 = Terrain cost):\n{Colors.END}")
         header = "   " + "".join([str(i % 10) for i in range(len(grid[0]))])
         print(header)
         for i, row in enumerate(grid):
-            row_str = "".join(['.' if cell == 0 else '#' for cell in row])
+            row_str = "".join([cell_text(cell) for cell in row])
             print(f"{i:<3}{row_str}")
 
     @staticmethod
-    def visualize_input(grid, start, goal):
+    def visualize_input(grid, start, goal, save_to=None):
         """
             Display the maze grid with start and goal positions marked.
+            With save_to the figure is written to that PNG file instead of being shown.
         """
-        temp_grid = [row[:] for row in grid]
+        import matplotlib.pyplot as plt
+
         sx, sy = start
         gx, gy = goal
 
         plt.figure(figsize=(6, 6))
-        plt.imshow(grid, cmap='binary')  # 0=white (path), 1=black (wall)
+        plt.imshow(InputHandler._base_image(InputHandler._cell_array(grid)), interpolation='nearest')
         plt.plot(sy, sx, 'go', label='Start')
         plt.plot(gy, gx, 'ro', label='Goal')
         plt.title("View Input Maze")
         plt.legend()
-        plt.show()
+        InputHandler._show_or_save(plt, save_to)
 
     @staticmethod
-    def visualize_result(grid, path, expanded_nodes_list, title="Rezultat Căutare"):
+    def visualize_result(grid, path, expanded_nodes_list, title="Rezultat Căutare", save_to=None):
         """
-            Display the maze, the path found, and the expanded nodes.           
+            Display the maze, the path found, and the expanded nodes.
+            Walls, explored cells and the path are painted into one RGB image (a single imshow),
+            so the cost does not grow with the number of explored cells. grid can be a nested
+            list or a Maze; expanded_nodes_list a list of positions or a VisitedCells.
+            With save_to the figure is written to that PNG file instead of being shown.
         """
+        import matplotlib.pyplot as plt
+        from matplotlib.patches import Patch
+        import numpy as np
 
-        plt.figure(figsize=(8, 8))
-        display_grid = np.array(grid)
+        cells = InputHandler._cell_array(grid)
+        rows, cols = cells.shape
+        image = InputHandler._base_image(cells)
+        handles = []
 
-        plt.imshow(display_grid, cmap='binary')
-
-        if expanded_nodes_list:
-            ex_x, ex_y = zip(*expanded_nodes_list)
-            plt.scatter(ex_y, ex_x, c='lime', s=15,
-                        label='Explored', alpha=0.5)
+        if expanded_nodes_list is not None and len(expanded_nodes_list):
+            if hasattr(expanded_nodes_list, 'mask'):
+                explored = expanded_nodes_list.mask()
+            else:
+                explored = np.zeros((rows, cols), dtype=bool)
+                positions = np.array(list(expanded_nodes_list), dtype=np.int64).reshape(-1, 2)
+                explored[positions[:, 0], positions[:, 1]] = True
+            # Lime at half opacity, over the maze background
+            image[explored] = image[explored] * 0.5 + np.array([0.0, 0.5, 0.0], dtype=np.float32)
+            handles.append(Patch(color=(0.5, 1.0, 0.5), label='Explored'))
 
         if path and len(path) > 0:
-            px, py = zip(*path)
-            plt.plot(py, px, color='red', linewidth=3, label='The path found')
-        else:
+            positions = np.array(path, dtype=np.int64)
+            image[positions[:, 0], positions[:, 1]] = (1.0, 0.0, 0.0)
+            handles.append(Patch(color='red', label='The path found'))
+
+        plt.figure(figsize=(8, 8))
+        plt.imshow(image, interpolation='nearest')
+
+        if not path:
             # Show "PATH NOT FOUND" message in the center of the maze
-            plt.text(len(grid[0])//2, len(grid)//2, "PATH NOT FOUND",
+            plt.text(cols // 2, rows // 2, "PATH NOT FOUND",
                      color="red", fontsize=20, fontweight="bold",
                      ha="center", va="center", bbox=dict(facecolor='white', alpha=0.7))
 
         plt.title(title)
-        plt.legend()
-        plt.show()
+        if handles:
+            plt.legend(handles=handles)
+        InputHandler._show_or_save(plt, save_to)
+
+    @staticmethod
+    def visualize_distance_map(distance_map, path=None, title="Distance Map", save_to=None):
+        """
+            Display a distance map (steps from the start, -1 for walls/unreached) as a heatmap.
+            With save_to the figure is written to that PNG file instead of being shown.
+        """
+        import matplotlib.pyplot as plt
+        import numpy as np
+        plt.figure(figsize=(8, 8))
+        masked = np.ma.masked_less(np.asarray(distance_map), 0)
+
+        cmap = plt.get_cmap('viridis').copy()
+        cmap.set_bad(color='black')
+        plt.imshow(masked, cmap=cmap, interpolation='nearest')
+        plt.colorbar(label='Steps from start')
+
+        if path:
+            px, py = zip(*path)
+            plt.plot(py, px, color='red', linewidth=2, label='The path found')
+            plt.legend()
+
+        plt.title(title)
+        InputHandler._show_or_save(plt, save_to)
+
+    @staticmethod
+    def _cell_array(grid):
+        """
+            (rows, cols) uint8 array of a nested grid list or of a Maze (read from its flat cells).
+        """
+        import numpy as np
+
+        if hasattr(grid, 'cells'):
+            return np.frombuffer(bytes(grid.cells), dtype=np.uint8).reshape(grid.rows, grid.cols)
+        return np.array(grid, dtype=np.uint8).reshape(len(grid), -1)
+
+    @staticmethod
+    def _base_image(cells):
+        """
+            (rows, cols, 3) RGB image of the maze: paths white, walls black, terrain from wheat
+            (cost 2) to brown (cost 9).
+        """
+        import numpy as np
+
+        image = np.ones(cells.shape + (3,), dtype=np.float32)
+        image[cells == WALL] = 0.0
+        terrain = cells > WALL
+        if terrain.any():
+            shade = ((np.minimum(cells[terrain], 9) - 2) / 7.0).astype(np.float32)[:, None]
+            light = np.array([0.96, 0.87, 0.70], dtype=np.float32)
+            dark = np.array([0.55, 0.35, 0.17], dtype=np.float32)
+            image[terrain] = light + (dark - light) * shade
+        return image
+
+    @staticmethod
+    def _show_or_save(plt, save_to):
+        """
+            Show the current figure (blocking), or write it to a PNG file and close it.
+        """
+        if save_to:
+            plt.savefig(save_to, dpi=100, bbox_inches='tight')
+            plt.close()
+        else:
+            plt.show()
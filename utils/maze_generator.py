@@ -0,0 +1,277 @@
+"""
+Seeded maze generators that scale to 10000 x 10000 cells.
+
+    noise        walls drawn independently with probability `density` (NumPy, in chunks)
+    backtracker  perfect maze from a randomized depth-first search (long winding corridors)
+    kruskal      perfect maze from randomized Kruskal (many short dead ends)
+    wilson       perfect maze from Wilson's loop-erased random walks (uniform spanning tree,
+                 the slowest of the three)
+
+A perfect maze has exactly one path between any two of its rooms: rooms sit on the odd
+coordinates, and the cells between two rooms are walls unless the generator carved them.
+Every generator fills the flat cell buffer of maze_engine.Maze directly (no nested lists,
+no recursion), and the same seed always gives the same maze. The result can be written as a
+text or .mzb file without building the Maze at all.
+"""
+from array import array
+import random
+from maze_engine import Maze, PATH, WALL
+
+GENERATORS = ("noise", "backtracker", "kruskal", "wilson")
+
+# Cells drawn per NumPy call by the noise generator (bounds the temporary float array)
+NOISE_CHUNK = 1 << 20
+# Shuffled walls read per NumPy -> Python conversion by Kruskal
+KRUSKAL_CHUNK = 1 << 16
+
+_CELLS_TO_TEXT = bytes.maketrans(bytes((PATH, WALL)), b".#")
+
+
+def noise_cells(rows, cols, density=0.25, seed=None):
+    """
+    rows * cols cell buffer where every cell is a wall with probability density.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    size = rows * cols
+    cells = bytearray(size)
+    view = np.frombuffer(cells, dtype=np.uint8)
+    for begin in range(0, size, NOISE_CHUNK):
+        end = min(begin + NOISE_CHUNK, size)
+        view[begin:end] = rng.random(end - begin) < density
+    return cells
+
+
+def _room_grid(rows, cols):
+    """
+    All-wall buffer with every room (odd x, odd y) opened. Returns (cells, room rows, room cols).
+    """
+    height, width = (rows - 1) // 2, (cols - 1) // 2
+    if height < 1 or width < 1:
+        raise ValueError(f"A perfect maze needs at least 3x3 cells, got {rows}x{cols}")
+    cells = bytearray(b'\x01') * (rows * cols)
+    for i in range(height):
+        begin = (2 * i + 1) * cols + 1
+        cells[begin:begin + 2 * width:2] = bytes(width)
+    return cells, height, width
+
+
+def _carve(cells, cols, width, room, other):
+    """
+    Open the wall cell between two adjacent rooms.
+    """
+    i, j = divmod(room, width)
+    k, l = divmod(other, width)
+    cells[(i + k + 1) * cols + j + l + 1] = PATH
+
+
+def backtracker_cells(rows, cols, seed=None):
+    """
+    Perfect maze grown by a randomized depth-first search (explicit stack, no recursion).
+    """
+    cells, height, width = _room_grid(rows, cols)
+    rng = random.Random(seed)
+    rooms = height * width
+    visited = bytearray(rooms)
+    first = rng.randrange(rooms)
+    visited[first] = 1
+    stack = array('i', [first])
+
+    while stack:
+        room = stack[-1]
+        j = room % width
+        options = []
+        if room >= width and not visited[room - width]:
+            options.append(room - width)
+        if room + width < rooms and not visited[room + width]:
+            options.append(room + width)
+        if j > 0 and not visited[room - 1]:
+            options.append(room - 1)
+        if j < width - 1 and not visited[room + 1]:
+            options.append(room + 1)
+        if not options:
+            stack.pop()
+            continue
+        other = options[rng.randrange(len(options))]
+        visited[other] = 1
+        _carve(cells, cols, width, room, other)
+        stack.append(other)
+    return cells
+
+
+def kruskal_cells(rows, cols, seed=None):
+    """
+    Perfect maze from randomized Kruskal: the walls between rooms are visited in a random order
+    (NumPy shuffle) and removed when they separate two different trees (union-find).
+    """
+    import numpy as np
+
+    cells, height, width = _room_grid(rows, cols)
+    rooms = height * width
+    parent = array('i', range(rooms))
+
+    def find(room):
+        # Path halving
+        while parent[room] != room:
+            parent[room] = parent[parent[room]]
+            room = parent[room]
+        return room
+
+    # Wall e < rooms joins room e and its right neighbor, wall rooms + e room e and the one below
+    walls = np.arange(2 * rooms, dtype=np.uint32)
+    np.random.default_rng(seed).shuffle(walls)
+    joined = 0
+    for begin in range(0, 2 * rooms, KRUSKAL_CHUNK):
+        for wall in walls[begin:begin + KRUSKAL_CHUNK].tolist():
+            if wall < rooms:
+                if wall % width == width - 1:
+                    continue
+                room, other = wall, wall + 1
+            else:
+                room = wall - rooms
+                other = room + width
+                if other >= rooms:
+                    continue
+            root, other_root = find(room), find(other)
+            if root != other_root:
+                parent[root] = other_root
+                _carve(cells, cols, width, room, other)
+                joined += 1
+        if joined == rooms - 1:
+            break
+    return cells
+
+
+def wilson_cells(rows, cols, seed=None):
+    """
+    Perfect maze from Wilson's algorithm: from every room outside the tree, a random walk runs
+    until it hits the tree; the walk remembers only the last direction taken from each room, so
+    retracing it follows the loop-erased path, which is added to the tree. Every spanning tree
+    is equally likely.
+    """
+    cells, height, width = _room_grid(rows, cols)
+    rng = random.Random(seed)
+    rooms = height * width
+    in_tree = bytearray(rooms)
+    direction = bytearray(rooms)
+    moves = (-width, width, -1, 1)
+    in_tree[rng.randrange(rooms)] = 1
+
+    for first in range(rooms):
+        if in_tree[first]:
+            continue
+        room = first
+        while not in_tree[room]:
+            while True:
+                move = rng.getrandbits(2)
+                if move == 0:
+                    if room >= width:
+                        break
+                elif move == 1:
+                    if room + width < rooms:
+                        break
+                elif move == 2:
+                    if room % width:
+                        break
+                elif room % width != width - 1:
+                    break
+            direction[room] = move
+            room += moves[move]
+
+        room = first
+        while not in_tree[room]:
+            in_tree[room] = 1
+            other = room + moves[direction[room]]
+            _carve(cells, cols, width, room, other)
+            room = other
+    return cells
+
+
+def _carve_path(cells, cols, start, goal, rng):
+    """
+    Open a random monotone staircase of cells from start to goal (noise mazes).
+    """
+    x, y = start
+    gx, gy = goal
+    cells[x * cols + y] = PATH
+    while (x, y) != (gx, gy):
+        if y == gy or (x != gx and rng.random() < 0.5):
+            x += 1 if gx > x else -1
+        else:
+            y += 1 if gy > y else -1
+        cells[x * cols + y] = PATH
+
+
+def _attach_to_room(cells, rows, cols, position):
+    """
+    Open a cell of a perfect maze and the few cells leading from it to the nearest room.
+    """
+    x, y = position
+    room_x = min(max(x - 1 + x % 2, 1), rows - 2 if rows % 2 else rows - 3)
+    room_y = min(max(y - 1 + y % 2, 1), cols - 2 if cols % 2 else cols - 3)
+    for i in range(min(x, room_x), max(x, room_x) + 1):
+        cells[i * cols + y] = PATH
+    for j in range(min(y, room_y), max(y, room_y) + 1):
+        cells[room_x * cols + j] = PATH
+
+
+def generate_cells(kind, rows, cols, density=0.25, seed=None, start=None, goal=None, connect=True):
+    """
+    Generate a maze as a flat cell buffer. Returns (cells, start, goal).
+        start / goal default to the opposite corners (noise) or to the first and last rooms
+            (perfect mazes).
+        connect: make sure a path joins start and goal. Noise mazes get a random staircase of
+            free cells between them; in a perfect maze every room is already connected, so an
+            endpoint that is not a room is joined to the nearest one.
+    """
+    if kind not in GENERATORS:
+        raise ValueError(f"Unknown generator '{kind}', expected one of {', '.join(GENERATORS)}")
+    if rows < 1 or cols < 1:
+        raise ValueError(f"A maze needs at least one cell, got {rows}x{cols}")
+
+    if kind == "noise":
+        cells = noise_cells(rows, cols, density, seed)
+        start = tuple(start) if start is not None else (0, 0)
+        goal = tuple(goal) if goal is not None else (rows - 1, cols - 1)
+    else:
+        generator = {"backtracker": backtracker_cells, "kruskal": kruskal_cells, "wilson": wilson_cells}[kind]
+        cells = generator(rows, cols, seed)
+        last_x = rows - 2 if rows % 2 else rows - 3
+        last_y = cols - 2 if cols % 2 else cols - 3
+        start = tuple(start) if start is not None else (1, 1)
+        goal = tuple(goal) if goal is not None else (last_x, last_y)
+
+    for label, (x, y) in (("start", start), ("goal", goal)):
+        if not (0 <= x < rows and 0 <= y < cols):
+            raise ValueError(f"{label} {(x, y)} is out of bounds ({rows}x{cols})")
+
+    if connect:
+        if kind == "noise":
+            _carve_path(cells, cols, start, goal, random.Random(seed))
+        else:
+            _attach_to_room(cells, rows, cols, start)
+            _attach_to_room(cells, rows, cols, goal)
+    return cells, start, goal
+
+
+def generate(kind="noise", rows=101, cols=101, density=0.25, seed=None, start=None, goal=None, connect=True):
+    """
+    Generate a Maze (see generate_cells). Returns (maze, start, goal), like InputHandler.load_maze.
+    """
+    cells, start, goal = generate_cells(kind, rows, cols, density, seed, start, goal, connect)
+    return Maze.from_cells(cells, rows, cols), start, goal
+
+
+def write_maze(filename, cells, rows, cols, start=None, goal=None):
+    """
+    Write a generated cell buffer as a .mzb file (with start and goal) or as a '#'/'.' text file.
+    """
+    if filename.endswith(".mzb"):
+        from utils import mzb_format
+        rows_iter = (cells[x * cols:(x + 1) * cols] for x in range(rows))
+        return mzb_format.write_rows(filename, rows_iter, cols, start, goal)
+    with open(filename, "wb") as f:
+        for x in range(rows):
+            f.write(bytes(cells[x * cols:(x + 1) * cols]).translate(_CELLS_TO_TEXT) + b"\n")
+    return None
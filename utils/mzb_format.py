@@ -0,0 +1,237 @@
+"""
+The .mzb binary maze format: a fixed header followed by a 1-bit-per-cell body.
+
+    Header (little-endian, 36 bytes):
+        magic     4s   b"MZB1"
+        version   H    1
+        flags     H    bit 0: start is set, bit 1: goal is set
+        rows      I
+        cols      I
+        start     ii   (x, y), (-1, -1) when not set
+        goal      ii   (x, y), (-1, -1) when not set
+        checksum  I    zlib.crc32 of the body
+    Body: one row after the other, each row packed MSB-first into (cols + 7) // 8 bytes,
+        1 = wall, 0 = path. Rows are byte-aligned so a single row (or tile) can be read directly.
+        One bit per cell leaves no room for terrain costs: weighted mazes (cell values 2-9)
+        cannot be written and stay in the text format.
+
+Text mazes are converted row by row, so neither direction ever holds the whole file as
+Python objects, and a loaded maze reads its cells straight from a memory-mapped file.
+"""
+from collections import namedtuple
+import mmap
+import os
+import struct
+import zlib
+from maze_engine import Maze, PATH, WALL, TEXT_TO_CELL
+
+MAGIC = b"MZB1"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIiiiiI")
+FLAG_START, FLAG_GOAL = 1, 2
+
+MZBHeader = namedtuple("MZBHeader", "rows cols start goal checksum")
+
+# Text <-> cell value tables (the text side is read with maze_engine.TEXT_TO_CELL)
+_BITS_TO_TEXT = bytes.maketrans(b"01", b".#")
+_BITS_TO_CELLS = bytes.maketrans(b"01", b"\x00\x01")
+_CELLS_TO_BITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def row_bytes(cols):
+    return (cols + 7) // 8
+
+
+def pack_row(cells, cols):
+    """
+    Pack one row of 0/1 cell values (bytes-like, padded with walls up to cols) into bits.
+    """
+    cells = bytes(cells[:cols]) + b"\x01" * (cols - len(cells))
+    if cells.translate(None, bytes((PATH, WALL))):
+        raise ValueError("The .mzb format only stores walls and paths, not terrain costs (cell values 2-9)")
+    width = row_bytes(cols) * 8
+    bits = int(cells.translate(_CELLS_TO_BITS) or b"0", 2) << (width - cols)
+    return bits.to_bytes(width // 8, "big")
+
+
+def unpack_row(data, cols):
+    """
+    Unpack one packed row into bytes of 0/1 cell values.
+    """
+    bits = format(int.from_bytes(data, "big"), f"0{len(data) * 8}b")[:cols]
+    return bits.encode().translate(_BITS_TO_CELLS)
+
+
+def _pack_header(rows, cols, start, goal, checksum):
+    flags = (FLAG_START if start is not None else 0) | (FLAG_GOAL if goal is not None else 0)
+    sx, sy = start if start is not None else (-1, -1)
+    gx, gy = goal if goal is not None else (-1, -1)
+    return HEADER.pack(MAGIC, VERSION, flags, rows, cols, sx, sy, gx, gy, checksum)
+
+
+def read_header(source):
+    """
+    Read the header of a .mzb file (file name or bytes-like beginning of the file).
+    """
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        data = bytes(source[:HEADER.size])
+    else:
+        with open(source, "rb") as f:
+            data = f.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError("Not a .mzb file: header is truncated")
+
+    magic, version, flags, rows, cols, sx, sy, gx, gy, checksum = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError("Not a .mzb file: bad magic number")
+    if version != VERSION:
+        raise ValueError(f"Unsupported .mzb version {version}")
+    start = (sx, sy) if flags & FLAG_START else None
+    goal = (gx, gy) if flags & FLAG_GOAL else None
+    return MZBHeader(rows, cols, start, goal, checksum)
+
+
+def iter_text_rows(filename):
+    """
+    Stream a text maze ('#' wall, '.' path, 2-9 terrain cost) as bytes rows of cell values,
+    one line at a time.
+    """
+    with open(filename, "rb") as f:
+        for line in f:
+            yield line.strip().translate(TEXT_TO_CELL)
+
+
+def write_rows(filename, rows_iter, cols=None, start=None, goal=None):
+    """
+    Write a .mzb file from an iterable of rows of 0/1 cell values.
+    cols defaults to the length of the first row (like Maze); rows are streamed to disk and
+    the header is written last, once the row count and checksum are known.
+    A row that cannot be packed (terrain costs) raises ValueError and no file is left behind.
+    """
+    rows = 0
+    checksum = 0
+    with open(filename, "wb") as f:
+        f.write(b"\0" * HEADER.size)
+        try:
+            for row in rows_iter:
+                if cols is None:
+                    cols = len(row)
+                packed = pack_row(row, cols)
+                checksum = zlib.crc32(packed, checksum)
+                f.write(packed)
+                rows += 1
+        except ValueError:
+            f.close()
+            os.remove(filename)
+            raise
+        f.seek(0)
+        f.write(_pack_header(rows, cols or 0, start, goal, checksum))
+    return MZBHeader(rows, cols or 0, start, goal, checksum)
+
+
+def save_mzb(filename, maze, start=None, goal=None):
+    """
+    Write a Maze (or a nested grid list) as a .mzb file.
+    """
+    if not isinstance(maze, Maze):
+        maze = Maze(maze)
+    cols = maze.cols
+    rows_iter = (bytes(maze.cells[x * cols:(x + 1) * cols]) for x in range(maze.rows))
+    return write_rows(filename, rows_iter, cols, start, goal)
+
+
+def text_to_mzb(text_filename, mzb_filename, start=None, goal=None):
+    """
+    Convert a '#'/'.' text maze into a .mzb file (streaming).
+    """
+    return write_rows(mzb_filename, iter_text_rows(text_filename), start=start, goal=goal)
+
+
+def mzb_to_text(mzb_filename, text_filename):
+    """
+    Convert a .mzb file back into the '#'/'.' text format (streaming).
+    """
+    with open(mzb_filename, "rb") as src, open(text_filename, "w") as dst:
+        header = read_header(mzb_filename)
+        src.seek(HEADER.size)
+        width = row_bytes(header.cols)
+        for _ in range(header.rows):
+            cells = unpack_row(src.read(width), header.cols)
+            dst.write(cells.translate(_CELLS_TO_BITS).translate(_BITS_TO_TEXT).decode() + "\n")
+
+
+class PackedCells:
+    """
+    Read-only view of the packed body of a .mzb file, indexed like Maze.cells.
+        cells[i] is the value (0/1) of flat cell i and cells[a:b] returns the values as bytes,
+        unpacking only the rows that are touched.
+    """
+
+    def __init__(self, buffer, rows, cols, offset=HEADER.size):
+        self.buffer = buffer
+        self.rows = rows
+        self.cols = cols
+        self.offset = offset
+        self.width = row_bytes(cols)
+
+    def __len__(self):
+        return self.rows * self.cols
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._slice(index)
+        if index < 0:
+            index += len(self)
+        x, y = divmod(index, self.cols)
+        byte = self.buffer[self.offset + x * self.width + (y >> 3)]
+        return (byte >> (7 - (y & 7))) & 1
+
+    def __bytes__(self):
+        return self._slice(slice(None))
+
+    def close(self):
+        """
+        Close the underlying memory mapping (when the buffer is one).
+        """
+        if hasattr(self.buffer, "close"):
+            self.buffer.close()
+
+    def row(self, x):
+        """
+        Return the cell values of one row as bytes.
+        """
+        begin = self.offset + x * self.width
+        return unpack_row(self.buffer[begin:begin + self.width], self.cols)
+
+    def _slice(self, key):
+        begin, end, step = key.indices(len(self))
+        if begin >= end:
+            return b""
+        first_row, last_row = begin // self.cols, (end - 1) // self.cols
+        data = b"".join(self.row(x) for x in range(first_row, last_row + 1))
+        base = first_row * self.cols
+        return data[begin - base:end - base:step]
+
+
+def load_mzb(filename, verify=True):
+    """
+    Memory-map a .mzb file and return (maze, start, goal).
+    The maze reads its cells from the mapping (no unpacked copy of the grid is made);
+    only the per-cell neighbor mask the solvers need is built in memory. The mapping is
+    released by maze.close(), or replaced by an in-memory copy on the first edit.
+    """
+    with open(filename, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        header = read_header(buffer)
+        body_size = header.rows * row_bytes(header.cols)
+        if len(buffer) < HEADER.size + body_size:
+            raise ValueError("Corrupted .mzb file: body is truncated")
+        if verify and zlib.crc32(buffer[HEADER.size:HEADER.size + body_size]) != header.checksum:
+            raise ValueError("Corrupted .mzb file: checksum mismatch")
+    except ValueError:
+        buffer.close()
+        raise
+
+    cells = PackedCells(buffer, header.rows, header.cols)
+    return Maze.from_cells(cells, header.rows, header.cols), header.start, header.goal
@@ -0,0 +1,202 @@
+from collections import OrderedDict
+import hashlib
+import os
+import pickle
+import time
+import weakref
+from algorithms.base import SearchAlgorithm
+
+
+def algorithm_config(algorithm):
+    """
+    Identify an algorithm configuration: its class and public scalar settings
+    (heuristic_type, kernel, tie_breaking, ...). Private search state is ignored.
+    """
+    settings = tuple(sorted(
+        (name, value) for name, value in vars(algorithm).items()
+        if not name.startswith('_') and (value is None or isinstance(value, (bool, int, float, str)))))
+    return (type(algorithm).__module__, type(algorithm).__qualname__, settings)
+
+
+class PathCache:
+    """
+    LRU cache of search results keyed by (maze fingerprint, algorithm config, start, goal).
+        The fingerprint is the content hash kept up to date by Maze.set_cells, so an edited maze
+        can never be served a stale result; entries of the old contents are dropped as soon as
+        the edit is notified. Besides exact hits, any piece of a cached optimal path is itself a
+        shortest path, so a query whose endpoints both lie on such a path is answered without
+        any search ("subpath" hits).
+        With a directory, entries are also written there (pickle) and survive the process.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, directory=None):
+        """
+        max_entries / max_bytes: bounds of the in-memory tier (the byte size of an entry is an
+            estimate based on its path and visited list lengths).
+        directory: optional on-disk tier, created if missing.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # key -> (result, estimated size, {position: index on the path} for optimal paths)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # Mazes we hold entries for, with the fingerprint those entries were made with
+        self._watched = weakref.WeakKeyDictionary()
+        self.stats = {"hits": 0, "subpath_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, algorithm, maze, start, goal):
+        return (maze.fingerprint, algorithm_config(algorithm), tuple(start), tuple(goal))
+
+    def solve(self, algorithm, maze, start, goal):
+        """
+        Return the cached result of algorithm.solve(maze, start, goal), running it on a miss.
+        Every returned result has a "cache" key: "hit", "disk", "subpath" or "miss".
+        """
+        result = self.get(algorithm, maze, start, goal)
+        if result is None:
+            result = algorithm.solve(maze, start, goal)
+            self.put(algorithm, maze, start, goal, result)
+            result = {**result, "cache": "miss"}
+        return result
+
+    def get(self, algorithm, maze, start, goal):
+        """
+        Look a query up in memory, then on disk, then among the cached optimal paths.
+        Returns None on a miss. execution_time of a returned result is the lookup time.
+        """
+        start_time = time.perf_counter()
+        key = self.key(algorithm, maze, start, goal)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return self._served(entry[0], "hit", start_time)
+
+        if self.directory:
+            result = self._load(key)
+            if result is not None:
+                self._store(key, result, maze)
+                self.stats["disk_hits"] += 1
+                return self._served(result, "disk", start_time)
+
+        path = self._find_subpath(key, maze, start, goal)
+        if path is not None:
+            self.stats["subpath_hits"] += 1
+            return {
+                "algorithm": algorithm.name,
+                "path": path,
+                "expanded_nodes": 0,
+                "solution_depth": len(path) - 1,
+                "execution_time": time.perf_counter() - start_time,
+                "is_optimal": True,
+                "visited_list": [],
+                "cache": "subpath"
+            }
+
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, algorithm, maze, start, goal, result):
+        key = self.key(algorithm, maze, start, goal)
+        self._store(key, result, maze)
+        if self.directory:
+            with open(self._file_name(key), 'wb') as f:
+                pickle.dump((key, result), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def clear(self):
+        """
+        Empty the in-memory tier (the on-disk tier is left as is).
+        """
+        self._entries.clear()
+        self._bytes = 0
+
+    def _served(self, result, source, start_time):
+        return {**result, "execution_time": time.perf_counter() - start_time, "cache": source}
+
+    def _store(self, key, result, maze):
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        path = result["path"]
+        # Only optimal paths can answer other queries: index their cells
+        positions = {position: i for i, position in enumerate(path)} if result["is_optimal"] and path else None
+        size = self._estimate_size(result)
+        self._entries[key] = (result, size, positions)
+        self._bytes += size
+
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._bytes -= self._entries.popitem(last=False)[1][1]
+            self.stats["evictions"] += 1
+
+        if maze not in self._watched:
+            maze.subscribe(self._on_maze_change)
+        self._watched[maze] = key[0]
+
+    def _find_subpath(self, key, maze, start, goal):
+        """
+        Cut the query out of a cached optimal path of the same maze and algorithm, if one
+        passes through both endpoints. Paths are walked backwards only when the reversed goal
+        is a free cell (a path may start on a wall but can never enter one).
+        """
+        fingerprint, config, start, goal = key
+        for (entry_fingerprint, entry_config, _, _), (result, _, positions) in self._entries.items():
+            if positions is None or entry_fingerprint != fingerprint or entry_config != config:
+                continue
+            i, j = positions.get(start), positions.get(goal)
+            if i is None or j is None:
+                continue
+            path = result["path"]
+            if i <= j:
+                return path[i:j + 1]
+            if maze.is_valid_move(goal):
+                return path[j:i + 1][::-1]
+        return None
+
+    def _on_maze_change(self, maze, changed):
+        # Entries of the previous contents can never be hit again (the fingerprint changed)
+        old_fingerprint = self._watched.get(maze)
+        for key in [key for key in self._entries if key[0] == old_fingerprint]:
+            self._bytes -= self._entries.pop(key)[1]
+
+    def _estimate_size(self, result):
+        size = 512 + 64 * (len(result["path"]) + len(result["visited_list"]))
+        distance_map = result.get("distance_map")
+        if distance_map is not None:
+            size += getattr(distance_map, "nbytes", 0)
+        return size
+
+    def _file_name(self, key):
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.directory, digest + ".pkl")
+
+    def _load(self, key):
+        try:
+            with open(self._file_name(key), 'rb') as f:
+                stored_key, result = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return result if stored_key == key else None
+
+
+class CachedSolver(SearchAlgorithm):
+    """
+    Wraps an algorithm so that every solve() goes through a PathCache.
+    """
+
+    def __init__(self, algorithm, cache=None):
+        super().__init__(algorithm.kernel)
+        self.algorithm = algorithm
+        self.cache = cache if cache is not None else PathCache()
+
+    @property
+    def name(self):
+        return self.algorithm.name
+
+    def solve(self, maze, start, goal):
+        return self.cache.solve(self.algorithm, maze, start, goal)
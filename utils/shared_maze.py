@@ -0,0 +1,90 @@
+from multiprocessing import shared_memory
+from maze_engine import Maze
+
+
+class SharedMaze:
+    """
+    Publishes the flat cell buffer of a maze in shared memory.
+        Worker processes attach to it by name (see attach_maze) instead of receiving a pickled
+        copy of the grid with every task. Use it as a context manager, or call close() when
+        the workers are done, so the segment is released.
+    """
+
+    def __init__(self, maze):
+        self.rows = maze.rows
+        self.cols = maze.cols
+        self._shm = shared_memory.SharedMemory(create=True, size=max(maze.size, 1))
+        self._shm.buf[:maze.size] = bytes(maze.cells)
+        self.name = self._shm.name
+
+    @property
+    def descriptor(self):
+        """
+        The small picklable handle sent to the workers: (segment name, rows, cols).
+        """
+        return (self.name, self.rows, self.cols)
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Mazes already attached by this (worker) process, by segment name
+_attached = {}
+
+
+def attach_maze(descriptor):
+    """
+    Return a Maze reading its cells directly from the shared segment (no copy of the grid).
+    The maze is built once per process and reused by every later task on the same segment.
+    """
+    name, rows, cols = descriptor
+    if name not in _attached:
+        # Pool workers share the resource tracker of the process that created the segment,
+        # so the creator's close() remains the only unlink.
+        shm = shared_memory.SharedMemory(name=name)
+        maze = Maze.from_cells(shm.buf[:rows * cols], rows, cols)
+        _attached[name] = (shm, maze)
+    return _attached[name][1]
+
+
+def solve_shared(descriptor, algorithm, start, goal, profile=False):
+    """
+    Worker task: run one algorithm on a shared maze. The execution time is measured inside
+    the worker by the algorithm itself, so it does not include any inter-process overhead.
+    With profile, the algorithm's profile() is used instead of solve().
+    """
+    if profile:
+        return algorithm.profile(attach_maze(descriptor), start, goal)
+    return algorithm.solve(attach_maze(descriptor), start, goal)
+
+
+def detach_maze(name):
+    """
+    Forget a maze attached by attach_maze and unmap its segment in this process.
+    If a result still references the cells, the mapping is released once it is collected.
+    """
+    shm, maze = _attached.pop(name, (None, None))
+    if shm is None:
+        return
+    cells, maze.cells = maze.cells, None
+    try:
+        cells.release()
+        shm.close()
+    except BufferError:
+        pass
+
+
+def detach_stale(live_names):
+    """
+    Detach every maze whose segment is not in live_names (for long-lived workers, so mazes
+    unloaded by the parent do not stay mapped).
+    """
+    for name in [name for name in _attached if name not in live_names]:
+        detach_maze(name)
@@ -0,0 +1,207 @@
+"""
+Out-of-core mazes: a .mzb file read in square tiles through an LRU tile cache.
+
+TiledMaze offers the Maze contract the node kernels of BFS, DFS, A* and Greedy rely on
+(rows, cols, is_valid_move, get_neighbors, index, position, ...) without ever holding the
+whole grid: only the tiles a search touches are read from disk and unpacked, and the least
+recently used ones are dropped once the memory budget is reached. A 100000 x 100000 maze is
+1.25 GB on disk and needs no more memory than the budget plus what the search itself stores.
+
+The solvers that work on the flat cell buffers (JPS, wavefront, HPA*, ...) need an in-memory
+Maze and raise a TypeError on a TiledMaze (base.SearchAlgorithm._require_in_memory);
+base.SearchAlgorithm._use_index_kernel sends the others to their node kernel. The best
+search order for the cache is a local one: A* and Greedy default to the "high_g" tie-breaking,
+which keeps extending the newest (deepest) node among equal f values, so the frontier stays in
+a few tiles instead of spreading over a whole f-contour.
+"""
+from collections import OrderedDict
+import hashlib
+import os
+from maze_engine import DIRECTIONS, WALL
+from utils import mzb_format
+
+DEFAULT_TILE_SIZE = 256
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+# Below this many cached tiles the four neighbors of a tile corner would evict each other
+MIN_TILES = 4
+
+
+class TiledMaze:
+    """
+    Read-only maze backed by a .mzb file.
+        tile_size: side of a tile in cells (a multiple of 8, so tiles start on a byte boundary)
+        memory_budget: bytes of unpacked tiles kept in the LRU cache (one byte per cell)
+    Tile hits/misses/evictions and the file reads are counted in `stats` (see tile_stats()).
+    """
+
+    def __init__(self, filename, tile_size=DEFAULT_TILE_SIZE, memory_budget=DEFAULT_MEMORY_BUDGET):
+        if tile_size <= 0 or tile_size % 8:
+            raise ValueError(f"tile_size must be a positive multiple of 8, got {tile_size}")
+        self.filename = filename
+        self._file = open(filename, "rb", buffering=0)
+        try:
+            header = mzb_format.read_header(self._file.read(mzb_format.HEADER.size))
+            self._file.seek(0, os.SEEK_END)
+            body_size = header.rows * mzb_format.row_bytes(header.cols)
+            if self._file.tell() < mzb_format.HEADER.size + body_size:
+                raise ValueError("Corrupted .mzb file: body is truncated")
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+
+        self.rows = header.rows
+        self.cols = header.cols
+        self.size = self.rows * self.cols
+        self.start = header.start
+        self.goal = header.goal
+        self.checksum = header.checksum
+        self.tile_size = tile_size
+        self.capacity = max(MIN_TILES, memory_budget // (tile_size * tile_size))
+        self._row_stride = mzb_format.row_bytes(self.cols)
+        self._tiles = OrderedDict()
+        # Last tile used: consecutive lookups in the same tile skip the LRU bookkeeping
+        self._last_key = None
+        self._last_tile = None
+        # A .mzb file holds no terrain and the maze is never edited
+        self.max_cost = 1
+        self.weighted = False
+        self.version = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "reads": 0, "bytes_read": 0}
+
+    def close(self):
+        self._file.close()
+        self._tiles.clear()
+        self._last_key = self._last_tile = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _tile(self, tx, ty):
+        """
+        Return the unpacked cells of tile (tx, ty): tile_size rows of tile_size bytes, padded
+        with walls past the last row and column.
+        """
+        key = (tx, ty)
+        if key == self._last_key:
+            self.stats["hits"] += 1
+            return self._last_tile
+
+        tile = self._tiles.get(key)
+        if tile is None:
+            self.stats["misses"] += 1
+            tile = self._load_tile(tx, ty)
+            self._tiles[key] = tile
+            if len(self._tiles) > self.capacity:
+                self._tiles.popitem(last=False)
+                self.stats["evictions"] += 1
+        else:
+            self.stats["hits"] += 1
+            self._tiles.move_to_end(key)
+        self._last_key, self._last_tile = key, tile
+        return tile
+
+    def _load_tile(self, tx, ty):
+        size = self.tile_size
+        first_row, first_col = tx * size, ty * size
+        height = min(size, self.rows - first_row)
+        width = min(size, self.cols - first_col)
+        chunk = mzb_format.row_bytes(width)
+        offset = mzb_format.HEADER.size + first_row * self._row_stride + first_col // 8
+        padding = b"\x01" * (size - width)
+
+        if chunk == self._row_stride:
+            # The tile spans whole rows: one read for all of them
+            data = self._read(offset, chunk * height)
+            rows = [data[i * chunk:(i + 1) * chunk] for i in range(height)]
+        else:
+            rows = [self._read(offset + i * self._row_stride, chunk) for i in range(height)]
+        tile = bytearray(b"".join(mzb_format.unpack_row(row, width) + padding for row in rows))
+        tile += b"\x01" * (size * (size - height))
+        return tile
+
+    def _read(self, offset, length):
+        self._file.seek(offset)
+        data = self._file.read(length)
+        self.stats["reads"] += 1
+        self.stats["bytes_read"] += len(data)
+        return data
+
+    def tile_stats(self):
+        """
+        Counters of the tile cache and the file I/O, plus the hit rate and the cached tiles.
+        """
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {**self.stats, "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "cached_tiles": len(self._tiles), "capacity": self.capacity}
+
+    def reset_stats(self):
+        for name in self.stats:
+            self.stats[name] = 0
+
+    def cell(self, position):
+        """
+        Value of a cell (0 = path, 1 = wall).
+        """
+        x, y = position
+        size = self.tile_size
+        return self._tile(x // size, y // size)[(x % size) * size + y % size]
+
+    def index(self, position):
+        return position[0] * self.cols + position[1]
+
+    def position(self, index):
+        return divmod(index, self.cols)
+
+    def is_valid_move(self, position):
+        """
+        Check if a position is within matrix bounds and not a wall.
+        """
+        x, y = position
+        if not (0 <= x < self.rows and 0 <= y < self.cols):
+            return False
+        size = self.tile_size
+        return self._tile(x // size, y // size)[(x % size) * size + y % size] != WALL
+
+    def get_neighbors(self, position):
+        """
+        Return a list of valid neighboring positions. (Up, Down, Left, Right)
+        """
+        x, y = position
+        return [(x + dx, y + dy) for dx, dy in DIRECTIONS if self.is_valid_move((x + dx, y + dy))]
+
+    def step_cost(self, position):
+        return 1
+
+    def path_cost(self, path):
+        return max(len(path) - 1, 0)
+
+    @property
+    def fingerprint(self):
+        """
+        64-bit hash of the maze contents, derived from the size and the CRC-32 of the body
+        stored in the header (the body is never read as a whole).
+        """
+        digest = hashlib.blake2b(f"{self.rows}x{self.cols}:{self.checksum}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    def separated(self, start, goal):
+        # No component labels: they would need the whole grid in memory
+        return False
+
+    def subscribe(self, callback):
+        # Read-only: there are no edits to report
+        pass
+
+    def unsubscribe(self, callback):
+        pass
+
+
+def load_tiled(filename, tile_size=DEFAULT_TILE_SIZE, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Open a .mzb file as a TiledMaze. Returns (maze, start, goal) like InputHandler.load_maze.
+    """
+    maze = TiledMaze(filename, tile_size, memory_budget)
+    return maze, maze.start, maze.goal